@@ -0,0 +1,66 @@
+"""Benchmark sca.anomaly.detect_anomalies against pandas group-by transforms.
+
+data/SCA.csv is tiled up to each row count (SKUs suffixed per copy). The
+baseline computes the same robust z-scores one column at a time, with
+``groupby(...).transform('median')`` for the group medians and again for the
+MADs (mean absolute deviation where the MAD is 0). The script checks that
+both flag the same number of values.
+
+    python benchmarks/bench_anomaly.py --rows 100000 1000000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bench_cleaning import tile  # noqa: E402
+from sca.anomaly import GROUPS, MAD_SCALE, MEAN_AD_SCALE, THRESHOLD, detect_anomalies  # noqa: E402
+
+
+def transform_flags(df):
+    flagged = 0
+    for by, columns in GROUPS.items():
+        for col in columns:
+            grouped = df[col].groupby(df[by], observed=True)
+            deviation = df[col] - grouped.transform('median')
+            absolute = deviation.abs().groupby(df[by], observed=True)
+            mad = absolute.transform('median')
+            scale = (MAD_SCALE * mad).where(mad > 0, MEAN_AD_SCALE * absolute.transform('mean'))
+            z = (deviation / scale).where(deviation != 0, 0.0)
+            flagged += int((z.abs() > THRESHOLD).sum())
+    return flagged
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--source', default='data/SCA.csv')
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000])
+    args = parser.parse_args()
+
+    base = pd.read_csv(args.source)
+    print(f"{'rows':>10} {'transform s':>12} {'grouped s':>10} {'speedup':>8} {'flagged':>8}")
+    for rows in args.rows:
+        df = tile(base, rows)
+        # Perturb the tiled copies so groups aren't exact repeats of the source
+        rng = np.random.default_rng(0)
+        df['Shipping_times'] = df['Shipping_times'] * rng.lognormal(0, 0.3, rows)
+        start = time.perf_counter()
+        expected = transform_flags(df)
+        transformed = time.perf_counter() - start
+        start = time.perf_counter()
+        flagged = detect_anomalies(df)
+        grouped = time.perf_counter() - start
+
+        assert len(flagged) == expected, (len(flagged), expected)
+        print(f"{rows:>10} {transformed:>12.3f} {grouped:>10.3f} {transformed / grouped:>7.1f}x {len(flagged):>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""Benchmark sca.cleaning.clean against the original Data_cleaning.ipynb cells.
+
+The raw data/supply_chain.csv is tiled up to the requested row count (SKUs are
+suffixed per copy so rows stay distinct), both pipelines run on it, their
+outputs are checked for equality and rows/sec is reported.
+
+    python benchmarks/bench_cleaning.py --rows 1000 100000 1000000
+"""
+
+import argparse
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from sca.cleaning import clean  # noqa: E402
+
+
+def legacy_clean(data):
+    # The notebook cells, as they were
+    threshold = len(data) * 0.5
+    data = data.dropna(thresh=threshold, axis=1)
+
+    for col in data.columns:
+        if data[col].dtype in ['float64', 'int64']:
+            data[col] = data[col].fillna(data[col].median())
+        else:
+            data[col] = data[col].fillna(data[col].mode()[0])
+
+    for col in data.select_dtypes(include='object').columns:
+        try:
+            data[col] = pd.to_datetime(data[col])
+        except:  # noqa: E722
+            data[col] = data[col].astype(str).str.strip()
+
+    data = data.drop_duplicates()
+
+    for _ in range(2):  # The trimming cell appears twice in the notebook
+        data.columns = data.columns.str.strip().str.replace(' ', '_').str.replace('[^A-Za-z0-9_]+', '', regex=True)
+        for col in data.select_dtypes(include='object').columns:
+            data[col] = data[col].str.strip().str.replace('[^A-Za-z0-9 ,.-]+', '', regex=True)
+
+    numeric_cols = data.select_dtypes(include=['int64', 'float64']).columns
+    for col in numeric_cols:
+        q1 = data[col].quantile(0.25)
+        q3 = data[col].quantile(0.75)
+        iqr = q3 - q1
+        lower_bound = q1 - 1.5 * iqr
+        upper_bound = q3 + 1.5 * iqr
+        data[col] = np.where(data[col] < lower_bound, lower_bound,
+                             np.where(data[col] > upper_bound, upper_bound, data[col]))
+    return data
+
+
+def tile(raw, rows):
+    copies = -(-rows // len(raw))
+    frames = []
+    for i in range(copies):
+        part = raw.copy()
+        part['SKU'] = part['SKU'] + f'-{i}'
+        frames.append(part)
+    return pd.concat(frames, ignore_index=True).iloc[:rows]
+
+
+def timed(func, data, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(data.copy())
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--source', default='data/supply_chain.csv')
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000, 100_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--skip-legacy', action='store_true', help='Only time the vectorized pipeline')
+    args = parser.parse_args()
+
+    raw = pd.read_csv(args.source)
+    print(f"{'rows':>10} {'notebook rows/s':>16} {'clean() rows/s':>16} {'speedup':>8}")
+    for rows in args.rows:
+        data = tile(raw, rows)
+        new, new_time = timed(clean, data, args.repeat)
+        if args.skip_legacy:
+            print(f"{rows:>10} {'-':>16} {rows / new_time:>16,.0f} {'-':>8}")
+            continue
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            old, old_time = timed(legacy_clean, data, args.repeat)
+        pd.testing.assert_frame_equal(new, old, check_dtype=False)
+        print(f"{rows:>10} {rows / old_time:>16,.0f} {rows / new_time:>16,.0f} {old_time / new_time:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
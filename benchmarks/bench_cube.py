@@ -0,0 +1,70 @@
+"""Benchmark roll-ups from sca.cube.Cube against a fresh group-by per table.
+
+data/SCA.csv is tiled up to each row count (SKUs suffixed per copy) and
+written through the columnar cache, so key columns load as categoricals like
+they do in SCA.py. For each count the script reports the one-off cube build
+time, the time to answer every cube-covered summary table with pandas
+``groupby`` and with the cube, and the mean time per cube roll-up. It also
+checks that both give the same tables.
+
+    python benchmarks/bench_cube.py --rows 100000 1000000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bench_cleaning import tile  # noqa: E402
+from sca.aggregate import SUMMARY_SPECS  # noqa: E402
+from sca.cube import Cube  # noqa: E402
+from sca.store import read_cache, write_cache  # noqa: E402
+
+
+def groupby_summary(df, name):
+    keys, spec = SUMMARY_SPECS[name]
+    sizes = {col: how for col, how in spec.items() if how == 'size'}
+    grouped = df.groupby(keys, observed=True)
+    if sizes:
+        return grouped.size().reset_index(name=next(iter(sizes)))
+    return grouped.agg(spec).reset_index()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--source', default='data/SCA.csv')
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000])
+    args = parser.parse_args()
+
+    base = pd.read_csv(args.source)
+    print(f"{'rows':>10} {'tables':>7} {'build s':>8} {'groupby s':>10} {'cube s':>8} {'per table us':>13}")
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            df = read_cache(write_cache(tile(base, rows), os.path.join(tmp, 'cache')))
+            start = time.perf_counter()
+            cube = Cube.build(df)
+            build = time.perf_counter() - start
+            names = [name for name in SUMMARY_SPECS if cube.covers(name)]
+
+            start = time.perf_counter()
+            expected = {name: groupby_summary(df, name) for name in names}
+            grouped = time.perf_counter() - start
+            start = time.perf_counter()
+            tables = {name: cube.summary(name) for name in names}
+            rolled = time.perf_counter() - start
+
+            for name in names:
+                pd.testing.assert_frame_equal(tables[name], expected[name], check_exact=False, rtol=1e-9,
+                                              check_dtype=False, check_categorical=False)
+            print(f"{rows:>10} {len(names):>7} {build:>8.3f} {grouped:>10.3f} {rolled:>8.4f} "
+                  f"{rolled / len(names) * 1e6:>13.0f}")
+
+
+if __name__ == '__main__':
+    main()
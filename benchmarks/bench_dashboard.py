@@ -0,0 +1,57 @@
+"""Benchmark dashboard generation: shared payload vs. per-figure inline data.
+
+data/SCA.csv is tiled up to each row count (SKUs suffixed per copy). For both
+modes the script reports the HTML build time, the file size, and the time to
+parse the embedded JSON back, as a stand-in for the browser's parse cost.
+
+    python benchmarks/bench_dashboard.py --rows 100 10000 100000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bench_cleaning import tile  # noqa: E402
+from sca.dashboard import dashboard_figures, embedded_json, render_dashboard  # noqa: E402
+
+
+def build(df, shared):
+    start = time.perf_counter()
+    figures, payload = dashboard_figures(df, shared=shared)
+    html = render_dashboard(figures, payload)
+    return html, time.perf_counter() - start, embedded_json(figures, payload)
+
+
+def parse_time(blobs):
+    start = time.perf_counter()
+    for blob in blobs:
+        json.loads(blob)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--source', default='data/SCA.csv')
+    parser.add_argument('--rows', type=int, nargs='+', default=[100, 10_000, 100_000])
+    args = parser.parse_args()
+
+    base = pd.read_csv(args.source)
+    print(f"{'rows':>8} {'mode':>7} {'build s':>9} {'size KB':>10} {'parse s':>9}")
+    for rows in args.rows:
+        df = tile(base, rows)
+        for shared in (False, True):
+            html, seconds, blobs = build(df, shared)
+            mode = 'shared' if shared else 'inline'
+            size = len(html.encode('utf-8')) / 1024
+            print(f"{rows:>8} {mode:>7} {seconds:>9.3f} {size:>10,.0f} {parse_time(blobs):>9.3f}")
+
+
+if __name__ == '__main__':
+    main()
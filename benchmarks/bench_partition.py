@@ -0,0 +1,62 @@
+"""Benchmark partitioned summaries against the single-process Aggregator.
+
+data/SCA.csv is tiled up to each row count (SKUs suffixed per copy) and
+written through the columnar cache, so key columns load as categoricals like
+they do in SCA.py. For each worker count the script reports the wall time of
+all summary tables plus inventory turnover (worker start-up included), and
+checks that the tables are identical to the single-process ones.
+
+    python benchmarks/bench_partition.py --rows 1000000 --workers 1 2 4 8
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bench_cleaning import tile  # noqa: E402
+from sca.aggregate import summaries  # noqa: E402
+from sca.analysis import inventory_turnover  # noqa: E402
+from sca.partition import TURNOVER, ProcessBackend, check_equal, partitioned_summaries  # noqa: E402
+from sca.store import read_cache, write_cache  # noqa: E402
+
+
+def single(df):
+    tables = summaries(df)
+    tables[TURNOVER] = inventory_turnover(df)
+    return tables
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--source', default='data/SCA.csv')
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    base = pd.read_csv(args.source)
+    print(f"{'rows':>10} {'workers':>8} {'seconds':>9} {'speedup':>8}")
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            df = read_cache(write_cache(tile(base, rows), os.path.join(tmp, 'cache')))
+            start = time.perf_counter()
+            expected = single(df)
+            baseline = time.perf_counter() - start
+            print(f"{rows:>10} {'single':>8} {baseline:>9.3f} {1:>8.2f}")
+            for workers in sorted(set(args.workers)):
+                with ProcessBackend(workers) as backend:
+                    start = time.perf_counter()
+                    tables = partitioned_summaries(df, backend=backend)
+                    seconds = time.perf_counter() - start
+                check_equal(expected, tables)
+                print(f"{rows:>10} {workers:>8} {seconds:>9.3f} {baseline / seconds:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
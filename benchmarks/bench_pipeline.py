@@ -0,0 +1,214 @@
+"""Time every stage of the pipeline on synthetic data and record the results as JSON.
+
+For each row count a raw CSV is generated with ``sca.synthetic`` (the
+supply_chain.csv schema and distributions, with optional SKU/supplier skew).
+The script then times each stage on it, in order:
+
+    generate            write the raw CSV
+    raw_load            pd.read_csv of the raw CSV
+    clean.<step>        each Data_cleaning step of sca.cleaning.clean
+    store               write data/SCA.csv and load it through the columnar cache
+    aggregate.<section> every table of one SCA.py section, on a fresh Analysis
+    figures.<section>   building that section's figures from its tables
+    dashboard           generating the dashboard HTML
+
+Each stage records its wall time and peak resident memory (sampled from
+/proc/self/statm, or the process high-water mark where that is missing). The
+results, with the commit and library versions, go to a JSON file. ``--compare``
+prints the time ratios against an earlier results file.
+
+    python benchmarks/bench_pipeline.py --rows 1000 100000 1000000
+    python benchmarks/bench_pipeline.py --rows 10000000 --sku-skew 1.1 --skus 100000
+    python benchmarks/bench_pipeline.py --compare benchmarks/results/pipeline-abc1234.json
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from sca import cleaning  # noqa: E402
+from sca.analysis import SECTIONS, Analysis  # noqa: E402
+from sca.dashboard import build_dashboard  # noqa: E402
+from sca.decimate import POINT_BUDGET  # noqa: E402
+from sca.figures import build  # noqa: E402
+from sca.store import load_dataset  # noqa: E402
+from sca.synthetic import Profile, write_csv  # noqa: E402
+from sca.trace import current_rss  # noqa: E402
+
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+CLEANING_STEPS = ['drop_sparse_columns', 'fill_missing', 'fix_types', 'drop_duplicates',
+                  'normalize_column_names', 'normalize_text', 'clip_outliers']
+
+
+# --- Memory ---
+
+def max_rss():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class PeakRSS:
+    """Samples the resident set size on a thread while a stage runs."""
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+
+    def _sample(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, current_rss() or 0)
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self.peak = current_rss() or 0
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, current_rss() or 0)
+        if not self.peak:   # no /proc: fall back to the process high-water mark
+            self.peak = max_rss() or 0
+
+
+# --- Stages ---
+
+class Run:
+    def __init__(self, rows):
+        self.rows = rows
+        self.stages = []
+
+    def stage(self, name, func, *args):
+        rss_before = current_rss()
+        with PeakRSS() as rss:
+            start = time.perf_counter()
+            result = func(*args)
+            seconds = time.perf_counter() - start
+        self.stages.append({
+            'stage': name,
+            'seconds': round(seconds, 6),
+            'peak_rss_mb': round(rss.peak / 2 ** 20, 1),
+            'rss_before_mb': None if rss_before is None else round(rss_before / 2 ** 20, 1),
+        })
+        print(f"{self.rows:>10} {name:<32} {seconds:>9.3f}s {rss.peak / 2 ** 20:>9.0f} MB", flush=True)
+        return result
+
+
+def run_pipeline(rows, tmp, profile, options):
+    run = Run(rows)
+    raw_path = os.path.join(tmp, 'supply_chain.csv')
+    run.stage('generate', lambda: write_csv(raw_path, rows, profile=profile, **options))
+    data = run.stage('raw_load', pd.read_csv, raw_path)
+    for step in CLEANING_STEPS:
+        func = (lambda d: d.drop_duplicates()) if step == 'drop_duplicates' else getattr(cleaning, step)
+        data = run.stage(f'clean.{step}', func, data)
+
+    path = os.path.join(tmp, 'SCA.csv')
+
+    def store(data):
+        data.to_csv(path, index=False)
+        return load_dataset(path)
+
+    df = run.stage('store', store, data)
+    del data
+
+    for section, spec in SECTIONS.items():
+        run.stage(f'aggregate.{section}', lambda: Analysis(df, POINT_BUDGET).tables(spec['tables']))
+    analysis = Analysis(df, POINT_BUDGET)
+    for section, spec in SECTIONS.items():
+        tables = analysis.tables(spec['tables'])
+        run.stage(f'figures.{section}', lambda: [build(name, tables) for name in spec['figures']])
+    run.stage('dashboard', build_dashboard, df)
+    return {'rows': rows, 'stages': run.stages}
+
+
+# --- Results ---
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, baseline):
+    old = {(run['rows'], s['stage']): s for run in baseline['runs'] for s in run['stages']}
+    print(f"\nvs {baseline.get('commit')} ({baseline.get('timestamp')})")
+    print(f"{'rows':>10} {'stage':<32} {'before s':>9} {'after s':>9} {'ratio':>7} {'peak MB':>15}")
+    for run in current['runs']:
+        for s in run['stages']:
+            before = old.get((run['rows'], s['stage']))
+            if before is None:
+                continue
+            ratio = s['seconds'] / before['seconds'] if before['seconds'] else float('nan')
+            print(f"{run['rows']:>10} {s['stage']:<32} {before['seconds']:>9.3f} {s['seconds']:>9.3f} "
+                  f"{ratio:>6.2f}x {before['peak_rss_mb']:>7.0f}->{s['peak_rss_mb']:<6.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000, 100_000])
+    parser.add_argument('--source', default=os.path.join(ROOT, 'data', 'supply_chain.csv'))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--sku-skew', type=float, default=0.0)
+    parser.add_argument('--skus', type=int, default=None)
+    parser.add_argument('--supplier-skew', type=float, default=0.0)
+    parser.add_argument('--missing', type=float, default=0.0)
+    parser.add_argument('--out', help='results file (default: benchmarks/results/pipeline-<commit>.json)')
+    parser.add_argument('--compare', help='earlier results file to compare against')
+    args = parser.parse_args()
+
+    profile = Profile.from_csv(args.source)
+    options = {'seed': args.seed, 'sku_skew': args.sku_skew, 'skus': args.skus,
+               'supplier_skew': args.supplier_skew, 'missing': args.missing}
+    commit = git_commit()
+    results = {
+        'commit': commit,
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'options': options,
+        'runs': [],
+    }
+    print(f"{'rows':>10} {'stage':<32} {'seconds':>10} {'peak RSS':>12}")
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            results['runs'].append(run_pipeline(rows, tmp, profile, options))
+    results['max_rss_mb'] = round((max_rss() or 0) / 2 ** 20, 1)
+
+    out = args.out or os.path.join(RESULTS_DIR, f"pipeline-{commit or 'local'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"results written to {out}")
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            compare(results, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""Benchmark sca.rank against full sorts for the defect and turnover rankings.
+
+data/SCA.csv is tiled up to each row count (SKUs suffixed per copy). The metric
+columns get a little noise so the tiled copies don't all tie. For each count
+the script times the SCA.py sort-then-head/tail queries and the partial-selection
+ones, and checks that they return the same rows.
+
+    python benchmarks/bench_rank.py --rows 100000 1000000 10000000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bench_cleaning import tile  # noqa: E402
+from sca.analysis import turnover_ratios  # noqa: E402
+from sca.rank import extremes, top_k  # noqa: E402
+
+
+def sorted_defects(df, k):
+    defect_sorted = df[['SKU', 'Defect_rates']].sort_values(by='Defect_rates', ascending=False)
+    return pd.concat([defect_sorted.head(k), defect_sorted.tail(k)])
+
+
+def sorted_leaders(summary, k):
+    ranked = summary.sort_values(by=['Product_type', 'Inventory_Turnover_Ratio'], ascending=[True, False])
+    return ranked.groupby('Product_type', observed=True).head(k)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--source', default='data/SCA.csv')
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('-k', type=int, default=5)
+    args = parser.parse_args()
+
+    base = pd.read_csv(args.source)
+    rng = np.random.default_rng(0)
+    print(f"{'rows':>10} {'query':>10} {'sort s':>8} {'select s':>9} {'speedup':>8}")
+    for rows in args.rows:
+        df = tile(base, rows)
+        df['Defect_rates'] += rng.random(rows) * 1e-6
+        df['Number_of_products_sold'] += rng.random(rows) * 1e-3
+        summary = turnover_ratios(df)
+        queries = [
+            ('defects', sorted_defects, lambda d, k: extremes(d, 'Defect_rates', k, columns=['SKU', 'Defect_rates']),
+             df),
+            ('turnover', sorted_leaders, lambda s, k: top_k(s, 'Inventory_Turnover_Ratio', k, by='Product_type'),
+             summary),
+        ]
+        for name, slow, fast, frame in queries:
+            expected, slow_s = timed(slow, frame, args.k)
+            result, fast_s = timed(fast, frame, args.k)
+            pd.testing.assert_frame_equal(result, expected)
+            print(f"{rows:>10} {name:>10} {slow_s:>8.3f} {fast_s:>9.3f} {slow_s / fast_s:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""Benchmark sca.routing.optimize_routes against a pandas cross join.
+
+data/SCA.csv is tiled up to each SKU count (SKUs suffixed per copy) and
+written through the columnar cache, as SCA.py loads it. The cross join pairs
+every SKU with every observed (carrier, mode, route) option and merges in the
+option means. It drops the slower pairs and keeps the cheapest pair per SKU
+with ``idxmin``. It is the straightforward DataFrame version of the same
+optimization, and the script checks that both give the same total savings.
+
+    python benchmarks/bench_routing.py --rows 10000 100000 1000000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bench_cleaning import tile  # noqa: E402
+from sca.routing import OPTION_KEYS, option_stats, optimize_routes, savings_total  # noqa: E402
+from sca.store import read_cache, write_cache  # noqa: E402
+
+
+def cross_join_savings(df):
+    stats = option_stats(df, min_count=1)
+    current = df[['SKU'] + OPTION_KEYS + ['Shipping_costs', 'Costs', 'Shipping_times']].astype(
+        {key: str for key in OPTION_KEYS})
+    stats = stats.astype({key: str for key in OPTION_KEYS})
+    current = current.merge(stats.rename(columns={'Shipping_costs': 'ship_now', 'Costs': 'cost_now',
+                                                  'Shipping_times': 'days_now', 'SKUs': 'n_now'}), on=OPTION_KEYS)
+    # Every SKU with every option observed at least twice
+    options = stats[stats['SKUs'] >= 2].rename(columns={key: f'to_{key}' for key in OPTION_KEYS})
+    pairs = current.merge(options, how='cross')
+    # _x: the SKU's own values, _y: the option's means
+    pairs = pairs[pairs['Shipping_times_y'] <= pairs['Shipping_times_x']]
+    pairs['cost'] = (pairs['Shipping_costs_x'] * pairs['Shipping_costs_y'] / pairs['ship_now']
+                     + pairs['Costs_x'] * pairs['Costs_y'] / pairs['cost_now'])
+    best = pairs.loc[pairs.groupby('SKU', observed=True)['cost'].idxmin(), ['SKU', 'cost']]
+    now = current.set_index('SKU')['Shipping_costs'] + current.set_index('SKU')['Costs']
+    best = best.set_index('SKU')['cost'].reindex(now.index).fillna(np.inf)
+    return (now - np.minimum(now, best)).sum()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--source', default='data/SCA.csv')
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    base = pd.read_csv(args.source)
+    print(f"{'rows':>10} {'options':>8} {'cross join s':>13} {'argmin s':>9} {'speedup':>8} {'savings %':>10}")
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            df = read_cache(write_cache(tile(base, rows), os.path.join(tmp, 'cache')))
+            start = time.perf_counter()
+            expected = cross_join_savings(df)
+            joined = time.perf_counter() - start
+            start = time.perf_counter()
+            total = savings_total(optimize_routes(df))
+            vectorized = time.perf_counter() - start
+
+            assert np.isclose(total['savings'], expected, rtol=1e-9), (total['savings'], expected)
+            print(f"{rows:>10} {len(option_stats(df)):>8} {joined:>13.3f} {vectorized:>9.3f} "
+                  f"{joined / vectorized:>7.1f}x {total['savings_pct']:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
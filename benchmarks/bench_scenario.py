@@ -0,0 +1,86 @@
+"""Benchmark sca.scenario.ScenarioEngine against a loop of DataFrame copies.
+
+data/SCA.csv is tiled up to each SKU count (SKUs suffixed per copy). A grid
+of scenarios over price, order quantity, lead time, carrier and mode is
+evaluated by the engine in one call. The same scenarios are also run one at
+a time, each on its own modified copy of the frame, the way a notebook would
+do it. The loop only runs ``--loop`` scenarios, and its time is scaled up to
+the whole grid. The script checks that both give the same totals for those
+scenarios.
+
+    python benchmarks/bench_scenario.py --skus 10000 100000 --scenarios 1000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bench_cleaning import tile  # noqa: E402
+from sca.scenario import ScenarioEngine, scenario_grid  # noqa: E402
+
+
+def scenarios_for(engine, count):
+    grid = scenario_grid(price=np.linspace(0.8, 1.2, 9), order_qty=[0.5, 1.0, 1.5, 2.0],
+                         lead_time=[0.5, 1.0, 1.5], carrier=[None] + engine.carriers,
+                         mode=[None] + engine.modes)
+    return grid.sample(n=min(count, len(grid)), random_state=0).reset_index(drop=True)
+
+
+def loop_totals(df, scenario, carrier_means, mode_means, elasticity=1.0):
+    # One scenario on a modified copy, column by column as in SCA.py
+    data = df.copy()
+    price = scenario['price']
+    units = data['Number_of_products_sold'] * price ** -elasticity
+    data['Revenue_generated'] = data['Revenue_generated'] * price * units / data['Number_of_products_sold']
+    data['Number_of_products_sold'] = units
+    if not pd.isna(scenario['carrier']):
+        current = data['Shipping_carriers'].map(carrier_means).astype(float)
+        data['Shipping_costs'] = data['Shipping_costs'] * carrier_means[scenario['carrier']] / current
+    if not pd.isna(scenario['mode']):
+        current = data['Transportation_modes'].map(mode_means).astype(float)
+        data['Costs'] = data['Costs'] * mode_means[scenario['mode']] / current
+    data['Stock_levels'] = data['Stock_levels'] + data['Order_quantities'] * (scenario['order_qty'] - 1)
+    return (data['Revenue_generated'].sum(),
+            (data['Shipping_costs'] + data['Costs'] + data['Manufacturing_costs']).sum())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--source', default='data/SCA.csv')
+    parser.add_argument('--skus', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--scenarios', type=int, default=1000)
+    parser.add_argument('--loop', type=int, default=20, help='scenarios to time with the DataFrame loop')
+    args = parser.parse_args()
+
+    base = pd.read_csv(args.source)
+    print(f"{'skus':>10} {'scenarios':>10} {'chunk':>6} {'loop s':>9} {'engine s':>9} {'speedup':>8}")
+    for skus in args.skus:
+        df = tile(base, skus)
+        engine = ScenarioEngine(df)
+        grid = scenarios_for(engine, args.scenarios)
+        start = time.perf_counter()
+        totals = engine.run(grid)
+        vectorized = time.perf_counter() - start
+
+        carrier_means = dict(zip(engine.carriers, engine.carrier_cost))
+        mode_means = dict(zip(engine.modes, engine.mode_cost))
+        sample = grid.head(args.loop)
+        start = time.perf_counter()
+        expected = [loop_totals(df, row, carrier_means, mode_means) for row in sample.to_dict('records')]
+        looped = (time.perf_counter() - start) * len(grid) / len(sample)
+
+        expected = np.array(expected)
+        np.testing.assert_allclose(totals[['revenue', 'total_cost']].to_numpy()[:len(sample)], expected, rtol=1e-9)
+        print(f"{skus:>10} {len(grid):>10} {engine.chunk_size():>6} {looped:>9.2f} {vectorized:>9.3f} "
+              f"{looped / vectorized:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""Benchmark sca.scorecard.SupplierScorecard against recomputing the windowed group-by.
+
+data/SCA.csv is tiled up to each row count (SKUs suffixed per copy) and
+replayed in row order as a stream of supplier records. The scorecard takes
+one O(1) update per record and is read every ``--refresh`` records. The
+baseline recomputes the same scorecard at each refresh from scratch: the last
+``--window`` records per supplier of everything received so far, then the
+supplier_summary aggregation. The baseline is only timed at a few refresh
+points and its cost is averaged. The script checks that both agree on the
+final scorecard.
+
+    python benchmarks/bench_scorecard.py --rows 100000 1000000 --window 1000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bench_cleaning import tile  # noqa: E402
+from sca.scorecard import KEY, METRICS, SupplierScorecard  # noqa: E402
+
+
+def groupby_scorecard(df, window):
+    recent = df.groupby(KEY, observed=True).tail(window)
+    return recent.groupby(KEY, observed=True).agg(METRICS).reset_index()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--source', default='data/SCA.csv')
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--window', type=int, default=1000, help='records per supplier')
+    parser.add_argument('--refresh', type=int, default=100, help='records between scorecard reads')
+    parser.add_argument('--samples', type=int, default=5, help='refresh points to time the group-by at')
+    args = parser.parse_args()
+
+    base = pd.read_csv(args.source)
+    print(f"{'rows':>10} {'update us':>10} {'read us':>8} {'stream s':>9} {'group-by ms':>12} {'group-by total s':>17}")
+    for rows in args.rows:
+        df = tile(base, rows)
+        suppliers = df[KEY].astype(str).tolist()
+        values = df[list(METRICS)].to_numpy(dtype=np.float64).tolist()
+
+        card = SupplierScorecard(window=args.window)
+        reads = 0
+        start = time.perf_counter()
+        for i, (supplier, row) in enumerate(zip(suppliers, values), 1):
+            card.update(supplier, row)
+            if i % args.refresh == 0:
+                card.scorecard()
+                reads += 1
+        streamed = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(1000):
+            card._card = None
+            card.scorecard()
+        read = (time.perf_counter() - start) / 1000
+
+        points = np.linspace(rows // args.samples, rows, args.samples).astype(int)
+        start = time.perf_counter()
+        for end in points:
+            expected = groupby_scorecard(df.iloc[:end], args.window)
+        grouped = (time.perf_counter() - start) / len(points)
+
+        final = card.scorecard()
+        for col in METRICS:
+            np.testing.assert_allclose(final[col].to_numpy(), expected[col].to_numpy(dtype=np.float64), rtol=1e-9)
+        update = (streamed - reads * read) / rows
+        print(f"{rows:>10} {update * 1e6:>10.2f} {read * 1e6:>8.0f} {streamed:>9.2f} {grouped * 1e3:>12.1f} "
+              f"{grouped * reads:>17.1f}")
+
+
+if __name__ == '__main__':
+    main()
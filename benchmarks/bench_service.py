@@ -0,0 +1,134 @@
+"""Load-test the sca.service query service and report latency percentiles.
+
+Starts ``python -m sca.service`` on a free local port (or uses ``--url``), then
+sends a mix of summary, turnover and ranking requests over a pool of
+keep-alive connections. It runs two phases: ``cold`` sends every distinct
+request once, so each one is computed, and ``warm`` repeats the mix, so
+requests are served from the response cache. For each phase it reports
+p50/p90/p99/max latency and requests per second.
+
+    python benchmarks/bench_service.py --requests 5000 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+from urllib.request import urlopen
+
+import numpy as np
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+SUMMARIES = ['supplier_summary', 'shipping_summary', 'transport_defects', 'revenue_by_demo', 'sales_by_demo_product']
+FILTERS = ['', 'Transportation_modes=Air', 'Transportation_modes=Road,Rail', 'Location=Mumbai',
+           'Product_type=haircare', 'Routes=Route+A&Shipping_carriers=Carrier+B']
+RANKINGS = ['metric=Defect_rates&k=3', 'metric=Defect_rates&k=5&by=Supplier_name',
+            'metric=Revenue_generated&k=10&by=Product_type', 'metric=Defect_rates&order=extremes']
+
+
+def targets():
+    """Every distinct request of the mix."""
+    out = [f'/summary/{name}?{flt}' for name in SUMMARIES for flt in FILTERS]
+    out += [f'/turnover?{flt}&limit=20' for flt in FILTERS]
+    out += [f'/rank?{rank}&{flt}' for rank in RANKINGS for flt in FILTERS]
+    return out
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_service(source, workers):
+    port = free_port()
+    proc = subprocess.Popen([sys.executable, '-m', 'sca.service', '--source', source, '--port', str(port),
+                             '--workers', str(workers)], cwd=ROOT)
+    url = f'http://127.0.0.1:{port}'
+    deadline = time.time() + 120
+    while time.time() < deadline:
+        try:
+            urlopen(url + '/health', timeout=1).read()
+            return proc, url
+        except OSError:
+            if proc.poll() is not None:
+                raise RuntimeError('sca.service exited during start-up')
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError('sca.service did not start in time')
+
+
+async def fetch(reader, writer, host, target):
+    writer.write(f'GET {target} HTTP/1.1\r\nHost: {host}\r\n\r\n'.encode('latin-1'))
+    await writer.drain()
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    length = next(int(line.split(':', 1)[1]) for line in lines if line.lower().startswith('content-length'))
+    await reader.readexactly(length)
+    return int(lines[0].split(' ')[1])
+
+
+async def run_phase(url, requests, concurrency):
+    """Send ``requests`` over ``concurrency`` keep-alive connections; returns (latencies, errors, seconds)."""
+    parts = urlsplit(url)
+    queue = asyncio.Queue()
+    for target in requests:
+        queue.put_nowait(target)
+    latencies, errors = [], 0
+
+    async def client():
+        nonlocal errors
+        reader, writer = await asyncio.open_connection(parts.hostname, parts.port)
+        try:
+            while not queue.empty():
+                target = queue.get_nowait()
+                start = time.perf_counter()
+                status = await fetch(reader, writer, parts.netloc, target)
+                latencies.append(time.perf_counter() - start)
+                errors += status != 200
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return np.array(latencies), errors, time.perf_counter() - start
+
+
+def report(phase, latencies, errors, seconds):
+    p50, p90, p99 = np.percentile(latencies, [50, 90, 99]) * 1000
+    print(f"{phase:>6} {len(latencies):>9} {errors:>7} {p50:>8.2f} {p90:>8.2f} {p99:>8.2f} "
+          f"{latencies.max() * 1000:>8.2f} {len(latencies) / seconds:>9.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', help='existing service (default: start one)')
+    parser.add_argument('--source', default='data/SCA.csv')
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--workers', type=int, default=4, help='query threads of the started service')
+    args = parser.parse_args()
+
+    proc, url = (None, args.url) if args.url else start_service(args.source, args.workers)
+    try:
+        mix = targets()
+        warm = [random.Random(0).choice(mix) for _ in range(args.requests)]
+        print(f"{'phase':>6} {'requests':>9} {'errors':>7} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} "
+              f"{'max ms':>8} {'req/s':>9}")
+        report('cold', *asyncio.run(run_phase(url, mix, min(args.concurrency, len(mix)))))
+        report('warm', *asyncio.run(run_phase(url, warm, args.concurrency)))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1 @@
+"""Reusable building blocks for the supply-chain analysis (SCA.py, SCA_Dashboard.ipynb)."""
@@ -0,0 +1,370 @@
+"""Single-pass aggregation engine for the supply-chain summaries.
+
+``df.groupby`` re-factorizes its key columns on every call. ``Aggregator``
+factorizes each key column once, keeps the integer codes, and computes every
+summary from those shared codes with ``np.bincount``. The summary methods
+return the same tables as the matching ``groupby`` calls in SCA.py.
+"""
+
+import numpy as np
+import pandas as pd
+
+from sca.trace import span
+
+# Above this many possible key combinations the codes are compressed with
+# np.unique instead of a dense presence table
+_DENSE_LIMIT = 1 << 22
+_MAX_SPAN = 1 << 62
+
+# Float sums are accumulated per block of this many input rows and the block
+# totals added in block order. The result then depends only on the row order,
+# not on how rows are split across workers (see sca/partition.py).
+BLOCK_ROWS = 1 << 16
+
+
+def _as_keys(keys):
+    if isinstance(keys, str):
+        return (keys,)
+    return tuple(keys)
+
+
+def _unravel(prefix, levels, observed):
+    # Unravel mixed-radix group ids back into one column per key
+    columns = []
+    remaining = observed
+    for uniques in reversed(levels):
+        size = len(uniques)
+        columns.append((uniques.name, uniques.array.take(remaining % size)))
+        remaining = remaining // size
+    if prefix is not None:
+        columns.extend((name, prefix[name].array.take(remaining)) for name in reversed(prefix.columns))
+    return pd.DataFrame(dict(reversed(columns)))
+
+
+class _Groups:
+    """Dense group ids for one combination of key columns."""
+
+    def __init__(self, ids, rows, observed, levels, prefix):
+        self.ids = ids              # group id per kept row
+        self.rows = rows            # kept row positions, None when every row is kept
+        self.observed = observed    # mixed-radix id of each group over ``levels``
+        self.levels = levels        # uniques of the keys folded into those ids
+        self.prefix = prefix        # key frame of leading keys compressed before that, or None
+        self.ngroups = len(observed)
+        self._key_frame = None
+
+    @property
+    def key_frame(self):
+        """One row per group, sorted like groupby(sort=True)."""
+        if self._key_frame is None:
+            self._key_frame = _unravel(self.prefix, self.levels, self.observed)
+        return self._key_frame
+
+
+def _block_totals(ids, values, bounds, ngroups):
+    # (block, group, total) per block and group present in it, blocks ascending
+    nblocks = len(bounds) - 1
+    if nblocks * ngroups <= 8 * len(ids):
+        blocks, groups, totals = [], [], []
+        for block, (lo, hi) in enumerate(zip(bounds[:-1], bounds[1:])):
+            present = np.flatnonzero(np.bincount(ids[lo:hi], minlength=ngroups))
+            blocks.append(np.full(len(present), block))
+            groups.append(present)
+            totals.append(np.bincount(ids[lo:hi], weights=values[lo:hi], minlength=ngroups)[present])
+        return np.concatenate(blocks), np.concatenate(groups), np.concatenate(totals)
+    # Too many groups for a dense array per block: sort (block, group) pairs instead
+    block = np.repeat(np.arange(nblocks), np.diff(bounds))
+    pairs, inverse = np.unique(block * ngroups + ids, return_inverse=True)
+    return pairs // ngroups, pairs % ngroups, np.bincount(inverse, weights=values)
+
+
+def fold_blocks(block, group, total, ngroups):
+    """Add per-block group totals (blocks ascending) into one total per group, block by block."""
+    sums = np.zeros(ngroups)
+    edges = np.flatnonzero(np.diff(block)) + 1
+    for lo, hi in zip(np.append(0, edges), np.append(edges, len(block))):
+        sums[group[lo:hi]] += total[lo:hi]
+    return sums
+
+
+class SummaryMethods:
+    """The named summary tables of SCA.py and the dashboard.
+
+    Subclasses provide ``agg(keys, spec)`` and ``value_counts(col, name)``.
+    """
+
+    def summary(self, name):
+        """Compute one of the tables in ``SUMMARY_SPECS``."""
+        keys, spec = SUMMARY_SPECS[name]
+        return self.agg(keys, spec)
+
+    def product_summary(self):
+        return self.summary('product_summary')
+
+    def sales_by_product_type(self):
+        return self.summary('sales_by_product_type')
+
+    def revenue_by_demo(self):
+        return self.summary('revenue_by_demo')
+
+    def sales_by_demo_product(self):
+        return self.summary('sales_by_demo_product')
+
+    def supplier_by_demo(self):
+        return self.summary('supplier_by_demo')
+
+    def supplier_demo_product(self):
+        return self.summary('supplier_demo_product')
+
+    def product_type_dist(self):
+        return self.value_counts('Product_type', 'Count')
+
+    def supplier_summary(self):
+        return self.summary('supplier_summary')
+
+    def shipping_summary(self):
+        return self.summary('shipping_summary')
+
+    def transport_defects(self):
+        return self.summary('transport_defects')
+
+    def product_type_defects(self):
+        return self.summary('product_type_defects')
+
+    def sku_revenue(self):
+        return self.summary('sku_revenue')
+
+    def sku_orders(self):
+        return self.summary('sku_orders')
+
+    def transport_costs(self):
+        return self.summary('transport_costs')
+
+    def transport_mode_costs(self):
+        return self.summary('transport_mode_costs')
+
+    def carrier_costs(self):
+        return self.summary('carrier_costs')
+
+    def supplier_demand(self):
+        return self.summary('supplier_demand').sort_values('Number_of_products_sold', ascending=False)
+
+    def supplier_defects(self):
+        return self.summary('supplier_defects').sort_values('Defect_rates', ascending=False)
+
+    def carrier_defects(self):
+        return self.summary('carrier_defects')
+
+
+class Aggregator(SummaryMethods):
+    """Factorize-once group-by over a DataFrame.
+
+    Rows with a missing key are dropped, as ``groupby`` does by default.
+    Sums and means skip missing values. ``codes`` optionally supplies
+    ``{col: (codes, uniques)}`` factorized elsewhere, e.g. over a larger frame
+    this one is a slice of.
+    """
+
+    def __init__(self, df, codes=None):
+        self.df = df
+        self._codes = dict(codes or {})
+        self._groups = {}
+        self._values = {}
+
+    # --- Shared codes ---
+
+    def codes(self, col):
+        """Return ``(codes, uniques)`` for a key column, factorizing it only once."""
+        if col not in self._codes:
+            codes, uniques = pd.factorize(self.df[col], sort=True)
+            self._codes[col] = (codes.astype(np.int64, copy=False), pd.Index(uniques, name=col))
+        return self._codes[col]
+
+    def groups(self, keys):
+        keys = _as_keys(keys)
+        if keys not in self._groups:
+            self._groups[keys] = self._build_groups(keys)
+        return self._groups[keys]
+
+    def _build_groups(self, keys):
+        n = len(self.df)
+        combined = np.zeros(n, dtype=np.int64)
+        valid = np.ones(n, dtype=bool)
+        span = 1
+        prefix = None   # key frame of leading keys already compressed to dense ids
+        levels = []     # uniques of the keys folded into the mixed-radix id since then
+        for col in keys:
+            codes, uniques = self.codes(col)
+            valid &= codes >= 0
+            if span > _MAX_SPAN // max(len(uniques), 1):
+                # Compress before the mixed-radix id could overflow int64
+                observed, inverse = np.unique(combined[valid], return_inverse=True)
+                prefix = _unravel(prefix, levels, observed)
+                combined = np.zeros(n, dtype=np.int64)
+                combined[valid] = inverse
+                span, levels = len(observed), []
+            combined = combined * len(uniques) + codes
+            span *= len(uniques)
+            levels.append(uniques)
+
+        rows = None if valid.all() else np.flatnonzero(valid)
+        kept = combined if rows is None else combined[rows]
+
+        if span <= _DENSE_LIMIT:
+            present = np.bincount(kept, minlength=span) > 0
+            observed = np.flatnonzero(present)
+            ids = (np.cumsum(present) - 1)[kept]
+        else:
+            observed, ids = np.unique(kept, return_inverse=True)
+
+        return _Groups(ids.astype(np.int64, copy=False), rows, observed, levels, prefix)
+
+    # --- Shared values ---
+
+    def _column(self, col):
+        # Value column with missing entries zeroed, plus its not-null mask
+        if col not in self._values:
+            series = self.df[col]
+            is_int = pd.api.types.is_integer_dtype(series.dtype) or pd.api.types.is_bool_dtype(series.dtype)
+            values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            mask = ~np.isnan(values)
+            if mask.all():
+                mask = None
+            else:
+                values = np.where(mask, values, 0.0)
+            self._values[col] = (values, mask, is_int)
+        return self._values[col]
+
+    # --- Reductions ---
+
+    def size(self, keys):
+        g = self.groups(keys)
+        return np.bincount(g.ids, minlength=g.ngroups)
+
+    def _block_bounds(self, g):
+        # Kept-row offsets where each BLOCK_ROWS block of input rows starts
+        starts = np.arange(0, len(self.df), BLOCK_ROWS)
+        if g.rows is not None:
+            starts = np.searchsorted(g.rows, starts)
+        return np.append(starts, len(g.ids))
+
+    def _float_sum(self, g, values):
+        bounds = self._block_bounds(g)
+        if len(bounds) <= 2:
+            return np.bincount(g.ids, weights=values, minlength=g.ngroups)
+        return fold_blocks(*_block_totals(g.ids, values, bounds, g.ngroups), g.ngroups)
+
+    def block_sums(self, keys, col):
+        """Sparse per-block sums: ``(block, group, total)`` for every block a group has rows in.
+
+        ``fold_blocks`` over them reproduces ``sum(keys, col)`` exactly.
+        """
+        g = self.groups(keys)
+        values, _, _ = self._column(col)
+        if g.rows is not None:
+            values = values[g.rows]
+        return _block_totals(g.ids, values, self._block_bounds(g), g.ngroups)
+
+    def sum(self, keys, col):
+        g = self.groups(keys)
+        values, _, is_int = self._column(col)
+        if g.rows is not None:
+            values = values[g.rows]
+        if is_int:
+            # Integer totals are exact in any order
+            return np.rint(np.bincount(g.ids, weights=values, minlength=g.ngroups)).astype(np.int64)
+        return self._float_sum(g, values)
+
+    def count(self, keys, col):
+        g = self.groups(keys)
+        _, mask, _ = self._column(col)
+        if mask is None:
+            return self.size(keys)
+        if g.rows is not None:
+            mask = mask[g.rows]
+        return np.bincount(g.ids, weights=mask, minlength=g.ngroups).astype(np.int64)
+
+    def mean(self, keys, col):
+        g = self.groups(keys)
+        values, _, _ = self._column(col)
+        if g.rows is not None:
+            values = values[g.rows]
+        totals = self._float_sum(g, values)
+        counts = self.count(keys, col)
+        out = np.full(g.ngroups, np.nan)
+        np.divide(totals, counts, out=out, where=counts > 0)
+        return out
+
+    def agg(self, keys, spec):
+        """Equivalent of ``df.groupby(keys).agg(spec).reset_index()`` for sum/mean/size/count."""
+        with span('aggregate.agg', rows_in=len(self.df), keys=list(_as_keys(keys))) as s:
+            g = self.groups(keys)
+            result = g.key_frame.copy()
+            for col, how in spec.items():
+                result[col] = self.size(keys) if how == 'size' else getattr(self, how)(keys, col)
+            s.rows_out = len(result)
+        return result
+
+    def size_frame(self, keys, name='size'):
+        """Equivalent of ``df.groupby(keys).size().reset_index(name=name)``."""
+        result = self.groups(keys).key_frame.copy()
+        result[name] = self.size(keys)
+        return result
+
+    def value_counts(self, col, name='count'):
+        """Equivalent of ``df[col].value_counts().reset_index()``."""
+        result = self.size_frame(col, name)
+        return result.sort_values(name, ascending=False, kind='stable').reset_index(drop=True)
+
+
+# Group keys and {column: reduction} of every plain group-by summary. A 'size'
+# entry names the output column holding the group row count.
+SUMMARY_SPECS = {
+    'product_summary': (['Product_type', 'SKU'], {
+        'Revenue_generated': 'sum',
+        'Number_of_products_sold': 'sum',
+        'Price': 'mean'
+    }),
+    'sales_by_product_type': ('Product_type', {'Number_of_products_sold': 'sum'}),
+    'revenue_by_demo': ('Customer_demographics', {'Revenue_generated': 'sum'}),
+    'sales_by_demo_product': (['Product_type', 'Customer_demographics'], {'Number_of_products_sold': 'sum'}),
+    'supplier_by_demo': (['Supplier_name', 'Customer_demographics'], {'Count': 'size'}),
+    'supplier_demo_product': (['Supplier_name', 'Customer_demographics', 'Product_type'], {'Product_Count': 'size'}),
+    'supplier_summary': ('Supplier_name', {
+        'Lead_time': 'mean',
+        'Production_volumes': 'sum',
+        'Manufacturing_costs': 'mean',
+        'Defect_rates': 'mean'
+    }),
+    'shipping_summary': ('Shipping_carriers', {
+        'Shipping_times': 'sum',
+        'Shipping_costs': 'sum',
+        'Costs': 'sum'  # Transportation costs
+    }),
+    'transport_defects': ('Transportation_modes', {'Defect_rates': 'mean'}),
+    'product_type_defects': ('Product_type', {'Defect_rates': 'mean'}),
+    'sku_revenue': (['SKU', 'Product_type'], {'Revenue_generated': 'sum'}),
+    'sku_orders': (['SKU', 'Product_type'], {'Number_of_products_sold': 'sum'}),
+    'transport_costs': ('Transportation_modes', {'Shipping_costs': 'sum'}),
+    'transport_mode_costs': ('Transportation_modes', {'Costs': 'sum'}),
+    'carrier_costs': ('Shipping_carriers', {'Shipping_costs': 'mean'}),
+    'supplier_demand': ('Supplier_name', {'Number_of_products_sold': 'sum'}),
+    'supplier_defects': ('Supplier_name', {'Defect_rates': 'mean'}),
+    'carrier_defects': ('Shipping_carriers', {'Defect_rates': 'mean'}),
+}
+
+
+SUMMARIES = [
+    'product_summary', 'sales_by_product_type', 'revenue_by_demo',
+    'sales_by_demo_product', 'supplier_by_demo', 'supplier_demo_product',
+    'product_type_dist', 'supplier_summary', 'shipping_summary',
+    'transport_defects', 'product_type_defects', 'sku_revenue', 'sku_orders',
+    'transport_costs', 'transport_mode_costs', 'carrier_costs', 'supplier_demand', 'supplier_defects',
+    'carrier_defects',
+]
+
+
+def summaries(df, names=None):
+    """Compute the named summary tables (all by default) over shared key codes."""
+    agg = Aggregator(df)
+    return {name: getattr(agg, name)() for name in (names or SUMMARIES)}
@@ -0,0 +1,452 @@
+"""Lazy, memoized access to every table and figure of the supply-chain analysis.
+
+SCA.py computes all of its sections top to bottom. ``Analysis`` exposes the
+same results one at a time: each table is a cached property computed on first
+access from the tables it depends on. Asking for ``supplier_summary`` alone
+runs one ``Aggregator`` group-by and nothing else. Tables keyed on categorical
+columns that are requested together (``tables``, ``section``) roll up from one
+``sca.cube.Cube`` over just their keys and metrics, and once the full ``cube``
+has been built (the service and dashboard slice it) every such table rolls up
+from it. Figures are built on request and cached too.
+
+With a ``ResultCache`` (``sca.results``) tables and figures are also persisted
+on disk, keyed on the data fingerprint, so a repeat run over an unchanged
+data/SCA.csv reads them back instead of recomputing.
+
+At import this module loads only ``sca.results`` and ``sca.trace``, which need
+nothing beyond the standard library. pandas-backed helpers load with the first
+table, and Plotly loads with the first figure.
+
+    analysis = Analysis.from_csv('data/SCA.csv', cache=True)
+    analysis.supplier_summary
+    analysis.section('quality')
+    analysis.figure('supplier_bar').show()
+"""
+
+import threading
+from functools import cached_property
+
+from sca.results import ResultCache, file_fingerprint, frame_fingerprint
+from sca.trace import rows_of, span
+
+# Tables and figures of each SCA.py section, in report order
+SECTIONS = {
+    'product': {
+        'tables': ['product_summary', 'sales_by_product_type', 'rev_prod_points', 'revenue_price_points'],
+        'figures': ['sales_pie', 'rev_prod', 'revenue_price'],
+    },
+    'demographics': {
+        'tables': ['revenue_by_demo', 'sales_by_demo_product', 'supplier_by_demo', 'supplier_demo_product'],
+        'figures': ['revenue_pie', 'sales_demo', 'supplier_demo', 'supplier_preference'],
+    },
+    'inventory': {
+        'tables': ['product_type_dist', 'inventory_summary'],
+        'figures': ['product_type_pie'],
+    },
+    'supplier': {
+        'tables': ['supplier_summary'],
+        'figures': ['supplier_lead_defects', 'supplier_bar'],
+    },
+    'shipping': {
+        'tables': ['shipping_summary'],
+        'figures': ['shipping_costs'],
+    },
+    'sku': {
+        'tables': ['revenue_line', 'stock_line', 'order_line'],
+        'figures': ['rev_chart', 'stock_chart', 'order_chart'],
+    },
+    'cost': {
+        'tables': ['shipping_summary', 'transport_mode_costs', 'route_savings', 'inventory_turnover_summary',
+                   'turnover_leaders'],
+        'figures': ['shipping_cost_chart', 'transportation_cost_chart', 'inventory_turnover'],
+    },
+    'quality': {
+        'tables': ['quality_summary', 'transport_defects', 'product_type_defects', 'combined_defective',
+                   'anomalies'],
+        'figures': ['transport_pie', 'product_type_defects_pie', 'defective_bar'],
+    },
+}
+
+# Rows per group in the leader tables
+LEADERS = 5
+
+
+def defect_extremes(df, n=3):
+    """The ``n`` most and ``n`` least defective SKUs, most defective first."""
+    from sca.rank import extremes
+
+    return extremes(df, 'Defect_rates', n, columns=['SKU', 'Defect_rates'])
+
+
+def turnover_ratios(df):
+    """Per-SKU inventory turnover in row order."""
+    summary = df[['SKU', 'Product_type', 'Number_of_products_sold', 'Stock_levels']].copy()
+    summary['Inventory_Turnover_Ratio'] = summary['Number_of_products_sold'] / summary['Stock_levels']
+    return summary
+
+
+def inventory_turnover(df):
+    """Per-SKU inventory turnover, sorted by Product_type then ratio descending."""
+    return turnover_ratios(df).sort_values(by=['Product_type', 'Inventory_Turnover_Ratio'], ascending=[True, False])
+
+
+class locked_property(cached_property):
+    """``cached_property`` computed once under the instance's ``_lock``, even when threads ask together."""
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        if self.attrname not in instance.__dict__:
+            with instance._lock:
+                if self.attrname not in instance.__dict__:
+                    instance.__dict__[self.attrname] = self.compute(instance)
+        return instance.__dict__[self.attrname]
+
+    def compute(self, instance):
+        return self.func(instance)
+
+
+class cached_table(locked_property):
+    """``locked_property`` that also goes through the instance's on-disk cache, if any."""
+
+    def compute(self, instance):
+        with span(f'table.{self.attrname}') as s:
+            value = instance._cached('table', self.attrname, lambda: self.func(instance))
+            s.rows_out = rows_of(value)
+        return value
+
+
+class Analysis:
+    """Every SCA.py table as a memoized property over one cleaned DataFrame.
+
+    ``budget`` caps the points of the per-SKU scatter and line tables (see
+    ``sca.decimate``); ``None`` uses ``POINT_BUDGET``. ``cache`` is an optional
+    ``ResultCache``; ``fingerprint`` identifies the data in its keys and
+    defaults to a hash of ``df``. Tables keyed only on categorical columns roll
+    up from ``cube`` once it is built, or from a smaller cube when ``tables``
+    computes several together. With a ``backend`` (see ``sca.partition``) the
+    group-by tables and inventory turnover are computed over row shards instead;
+    ``close()`` (or a ``with`` block) shuts down its worker processes.
+
+    Cleaning clips every numeric column to its IQR fences, so ``anomalies``
+    scores ``unclipped`` when given: the same rows before clipping, as a frame
+    (``clean(raw, clip=False)``) or the path of the raw supply_chain.csv. On
+    ``df`` alone it only finds values that are extreme within their group yet
+    inside the fences.
+    """
+
+    def __init__(self, df, budget=None, cache=None, fingerprint=None, backend=None, unclipped=None):
+        self.df = df
+        self.budget = budget
+        self.cache = cache
+        self.backend = backend
+        self._unclipped = unclipped
+        # Held while a table (or the cube, ...) is first computed, so concurrent
+        # readers such as the service's query threads compute it only once
+        self._lock = threading.RLock()
+        if fingerprint is not None:
+            self.fingerprint = fingerprint
+        self._figures = {}
+        self._batch = ()        # names ``tables`` is computing, and the cube it built for them
+        self._batch_cube = None
+
+    @classmethod
+    def from_csv(cls, path='data/SCA.csv', cache=None, **options):
+        """Load the cleaned dataset (through the columnar cache) and wrap it.
+
+        ``cache=True`` uses a ``ResultCache`` next to the CSV (data/SCA.results/),
+        keyed on the CSV's size and modification time.
+        """
+        from sca.store import load_dataset
+
+        if cache is True:
+            cache = ResultCache.for_source(path)
+        if cache is not None:
+            options.setdefault('fingerprint', file_fingerprint(path))
+        return cls(load_dataset(path), cache=cache, **options)
+
+    def close(self):
+        """Shut down the backend's worker processes, if it keeps any."""
+        backend = getattr(self.__dict__.get('agg'), 'backend', self.backend)
+        if hasattr(backend, 'close'):
+            backend.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @locked_property
+    def fingerprint(self):
+        return frame_fingerprint(self.df)
+
+    @locked_property
+    def unclipped(self):
+        """The cleaned rows before IQR clipping (``df`` itself if none were given)."""
+        if self._unclipped is None:
+            return self.df
+        if isinstance(self._unclipped, str):
+            import pandas as pd
+
+            from sca.cleaning import clean
+
+            # The cleaned CSV was written without the index drop_duplicates leaves behind
+            return clean(pd.read_csv(self._unclipped), clip=False).reset_index(drop=True)
+        return self._unclipped
+
+    def _cached(self, kind, name, compute):
+        if self.cache is None:
+            return compute()
+        params = {'budget': self.budget}
+        if name == 'anomalies' and self._unclipped is not None:
+            params['unclipped'] = (file_fingerprint(self._unclipped) if isinstance(self._unclipped, str)
+                                   else frame_fingerprint(self._unclipped))
+        key = self.cache.key(self.fingerprint, kind, name, params)
+        return self.cache.get_or_compute(key, compute)
+
+    @locked_property
+    def agg(self):
+        if self.backend is not None:
+            from sca.partition import PartitionedAggregator
+
+            return PartitionedAggregator(self.df, self.backend)
+        from sca.aggregate import Aggregator
+
+        return Aggregator(self.df)
+
+    @locked_property
+    def cube(self):
+        """``sca.cube.Cube`` over the categorical columns, built (or read from the cache) once.
+
+        ``None`` when the cube would exceed ``sca.cube.MAX_BYTES`` (too many
+        level combinations); the tables then group the rows instead.
+        """
+        from sca.cube import Cube
+
+        agg = self.agg if self.backend is None else None
+        if not Cube.fits(self.df, agg=agg):
+            return None
+        return self._cached('cube', 'cube', lambda: Cube.build(self.df, agg=agg))
+
+    def _rollup_cube(self, name):
+        # The full cube if it was built, else one over the summaries of the current
+        # ``tables`` batch; a one-off table gets None and groups the rows instead
+        cube = self.__dict__.get('cube')
+        if cube is not None or name not in self._batch:
+            return cube
+        if self._batch_cube is None:
+            from sca.cube import Cube, summary_layout
+
+            pending = [other for other in self._batch if other not in self.__dict__]
+            dims, metrics, covered = summary_layout(pending, self.df.columns)
+            self._batch_cube = False
+            if len(covered) > 1 and Cube.fits(self.df, dims, metrics, agg=self.agg):
+                self._batch_cube = Cube.build(self.df, dims, metrics, agg=self.agg)
+        return self._batch_cube or None
+
+    def _summary(self, name):
+        # Partitioned runs keep grouping the row shards
+        cube = self._rollup_cube(name) if self.backend is None else None
+        if cube is not None and cube.covers(name):
+            return getattr(cube, name)()
+        return getattr(self.agg, name)()
+
+    def _budget(self):
+        from sca.decimate import POINT_BUDGET
+
+        return POINT_BUDGET if self.budget is None else self.budget
+
+    def _line(self, metric):
+        from sca.decimate import decimate_lines
+
+        return decimate_lines(self.df[['SKU', 'Product_type', metric]], metric, by='Product_type',
+                              budget=self._budget())
+
+    # --- Product Performance ---
+
+    @cached_table
+    def product_summary(self):
+        return self.agg.product_summary()
+
+    @cached_table
+    def sales_by_product_type(self):
+        return self._summary('sales_by_product_type')
+
+    @cached_table
+    def rev_prod_points(self):
+        from sca.decimate import bin_scatter
+
+        return bin_scatter(self.product_summary, 'Number_of_products_sold', 'Revenue_generated',
+                           color='Product_type', size='Price', size_how='mean', budget=self._budget())
+
+    @cached_table
+    def revenue_price_points(self):
+        from sca.decimate import bin_scatter
+
+        return bin_scatter(self.df, 'Price', 'Revenue_generated', color='Product_type',
+                           size='Number_of_products_sold', budget=self._budget())
+
+    # --- Customer Demographics ---
+
+    @cached_table
+    def revenue_by_demo(self):
+        return self._summary('revenue_by_demo')
+
+    @cached_table
+    def sales_by_demo_product(self):
+        return self._summary('sales_by_demo_product')
+
+    @cached_table
+    def supplier_by_demo(self):
+        return self._summary('supplier_by_demo')
+
+    @cached_table
+    def supplier_demo_product(self):
+        # Descending count within each demographic facet
+        return self._summary('supplier_demo_product').sort_values(
+            by=['Customer_demographics', 'Product_Count'], ascending=[True, False])
+
+    # --- Stock and Inventory ---
+
+    @cached_table
+    def product_type_dist(self):
+        return self._summary('product_type_dist')
+
+    @cached_table
+    def inventory_summary(self):
+        summary = self.df[['SKU', 'Stock_levels', 'Availability', 'Order_quantities']].copy()
+        summary.insert(3, 'Stock_Availability_Diff', summary['Stock_levels'] - summary['Availability'])
+        return summary
+
+    # --- Supplier ---
+
+    @cached_table
+    def supplier_summary(self):
+        return self._summary('supplier_summary')
+
+    # --- Shipping and Logistics ---
+
+    @cached_table
+    def shipping_summary(self):
+        return self._summary('shipping_summary')
+
+    # --- SKU ---
+
+    @cached_table
+    def revenue_line(self):
+        return self._line('Revenue_generated')
+
+    @cached_table
+    def stock_line(self):
+        return self._line('Stock_levels')
+
+    @cached_table
+    def order_line(self):
+        return self._line('Order_quantities')
+
+    # --- Cost ---
+
+    @cached_table
+    def transport_mode_costs(self):
+        return self._summary('transport_mode_costs')
+
+    @cached_table
+    def route_plan(self):
+        # Cheapest feasible (carrier, mode, route) per SKU, no slower than today; the
+        # optimizer builds its own small cube over the option keys, not the shared one
+        from sca.routing import optimize_routes
+
+        return optimize_routes(self.df)
+
+    @cached_table
+    def route_savings(self):
+        from sca.routing import route_savings
+
+        return route_savings(self.route_plan)
+
+    @cached_table
+    def inventory_turnover_summary(self):
+        if self.backend is not None:
+            return self.agg.inventory_turnover()
+        return inventory_turnover(self.df)
+
+    @cached_table
+    def turnover_leaders(self):
+        # Top SKUs of each product type, without sorting the whole turnover table
+        from sca.rank import top_k
+
+        return top_k(turnover_ratios(self.df), 'Inventory_Turnover_Ratio', LEADERS, by='Product_type')
+
+    # --- Quality Control ---
+
+    @cached_table
+    def quality_summary(self):
+        return self.df[['SKU', 'Inspection_results', 'Defect_rates']]
+
+    @cached_table
+    def transport_defects(self):
+        return self._summary('transport_defects')
+
+    @cached_table
+    def product_type_defects(self):
+        return self._summary('product_type_defects')
+
+    @cached_table
+    def combined_defective(self):
+        return defect_extremes(self.df)
+
+    @cached_table
+    def anomalies(self):
+        # Values far from their supplier / carrier / product type median (robust z-score)
+        from sca.anomaly import detect_anomalies
+
+        return detect_anomalies(self.unclipped)
+
+    # --- Access by name ---
+
+    def table(self, name):
+        """One table by name; computes it (and only what it depends on) on first use."""
+        if name not in TABLES:
+            raise KeyError(f"unknown table {name!r}")
+        return getattr(self, name)
+
+    def tables(self, names=None):
+        """Several tables by name; the categorical summaries among them share one cube pass."""
+        names = list(names or TABLES)
+        with self._lock:
+            self._batch, self._batch_cube = names, None
+            try:
+                return {name: self.table(name) for name in names}
+            finally:
+                self._batch, self._batch_cube = (), None
+
+    def top(self, metric, k=LEADERS, by=None, largest=True, columns=None):
+        """The ``k`` best rows of ``df`` by ``metric``, overall or per ``by`` group (see ``sca.rank``)."""
+        from sca.rank import top_k
+
+        return top_k(self.df, metric, k, by=by, largest=largest, columns=columns)
+
+    def section(self, name):
+        """The tables of one section (see ``SECTIONS``)."""
+        return self.tables(SECTIONS[name]['tables'])
+
+    def figure(self, name):
+        """Build (once) and return one figure from ``sca.figures``; imports Plotly on first use."""
+        if name not in self._figures:
+            import plotly.io as pio
+
+            from sca.figures import FIGURES, build
+
+            _, needs = FIGURES[name]
+            # Figures are cached as Plotly JSON; parsing it back is much cheaper than rebuilding
+            spec = self._cached('figure', name, lambda: build(name, self.tables(needs)).to_json())
+            self._figures[name] = pio.from_json(spec)
+        return self._figures[name]
+
+    def figures(self, section=None):
+        names = SECTIONS[section]['figures'] if section else [n for s in SECTIONS.values() for n in s['figures']]
+        return {name: self.figure(name) for name in names}
+
+
+TABLES = list(dict.fromkeys(name for section in SECTIONS.values() for name in section['tables']))
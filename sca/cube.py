@@ -0,0 +1,246 @@
+"""Materialized OLAP cube over the low-cardinality columns.
+
+Most tables in SCA.py and the dashboard are "metric X by dimension A (x B)".
+``Cube`` answers all of them from one pass over the rows. It holds a dense
+N-d array with one cell per combination of the ``CATEGORICAL_COLUMNS`` values
+(3 x 4 x 5 x 5 x 3 x 4 x 3 x 3 = 32,400 cells for data/SCA.csv). Each cell
+stores the row count and, for every numeric metric, its sum, sum of squares
+and non-null count. A roll-up just sums the array over the other axes, so
+it costs the same however many rows went into the cube. The cell count is
+the product of the level counts, though, so high-cardinality data can need
+more than ``MAX_BYTES``. ``Cube.fits`` checks first, and callers group the
+rows with ``Aggregator`` instead.
+
+The cube serves the same named summaries as ``Aggregator`` whenever their keys
+are cube dimensions. Integer sums and counts match exactly. Float sums agree
+to rounding, because cells are added in a different order than rows.
+
+    cube = Cube.build(df)
+    cube.revenue_by_demo()
+    cube.agg(['Product_type', 'Customer_demographics'], {'Number_of_products_sold': 'sum'})
+    cube.slice(Transportation_modes='Air').agg('Supplier_name', {'Defect_rates': 'std'})
+"""
+
+import numpy as np
+import pandas as pd
+
+from sca.aggregate import SUMMARY_SPECS, Aggregator, SummaryMethods, _as_keys
+from sca.schema import CATEGORICAL_COLUMNS, NUMERIC_COLUMNS
+from sca.trace import span
+
+# Refuse to materialize a cube larger than this: a count array plus a sum,
+# sum-of-squares and count array per metric, 8 bytes per cell each
+MAX_BYTES = 256 << 20
+
+
+def cube_nbytes(shape, n_metrics):
+    """Bytes of a cube with ``shape`` cells and ``n_metrics`` metrics."""
+    return int(np.prod(shape, dtype=np.float64)) * (3 * n_metrics + 1) * 8
+
+
+def covers(name, dims, metrics):
+    """Whether the named summary (see ``SUMMARY_SPECS``) only needs ``dims`` as keys and ``metrics``."""
+    if name == 'product_type_dist':
+        return 'Product_type' in dims
+    if name not in SUMMARY_SPECS:
+        return False
+    keys, spec = SUMMARY_SPECS[name]
+    return (set(_as_keys(keys)) <= set(dims)
+            and all(how == 'size' or col in metrics for col, how in spec.items()))
+
+
+def summary_layout(names, columns=None):
+    """``(dims, metrics, covered)``: the smallest cube layout serving the named summaries it can.
+
+    ``covered`` lists the names whose keys are all categorical columns (in
+    ``columns``, if given); ``dims`` and ``metrics`` are their keys and metrics.
+    """
+    dims_all = [col for col in CATEGORICAL_COLUMNS if columns is None or col in columns]
+    metrics_all = [col for col in NUMERIC_COLUMNS if columns is None or col in columns]
+    covered = [name for name in names if covers(name, dims_all, metrics_all)]
+    dims, metrics = set(), set()
+    for name in covered:
+        if name == 'product_type_dist':
+            dims.add('Product_type')
+            continue
+        keys, spec = SUMMARY_SPECS[name]
+        dims.update(_as_keys(keys))
+        metrics.update(col for col, how in spec.items() if how != 'size')
+    return [col for col in dims_all if col in dims], [col for col in metrics_all if col in metrics], covered
+
+
+class Cube(SummaryMethods):
+    """Dense count/sum/sum-of-squares cube; build it with ``Cube.build``.
+
+    ``levels`` holds the sorted uniques of each dimension (one axis each).
+    ``count`` is the row count per cell. ``sums``, ``sumsq`` and ``counts``
+    have one leading axis per metric, in ``metrics`` order.
+    """
+
+    def __init__(self, dims, levels, metrics, int_metrics, count, sums, sumsq, counts):
+        self.dims = list(dims)
+        self.levels = list(levels)
+        self.metrics = list(metrics)
+        self.int_metrics = set(int_metrics)
+        self.count = count
+        self.sums = sums
+        self.sumsq = sumsq
+        self.counts = counts
+
+    @staticmethod
+    def _layout(df, dims, metrics, agg):
+        if dims is None:
+            dims = [col for col in CATEGORICAL_COLUMNS if col in df.columns]
+        if metrics is None:
+            metrics = [col for col in NUMERIC_COLUMNS if col in df.columns and col not in dims]
+        agg = agg if agg is not None else Aggregator(df)
+        levels = [agg.codes(dim)[1] for dim in dims]
+        # A dimension with missing values gets one more level (the last) for them
+        shape = tuple(len(uniques) + bool((agg.codes(dim)[0] < 0).any()) for dim, uniques in zip(dims, levels))
+        return dims, metrics, agg, levels, shape
+
+    @classmethod
+    def fits(cls, df, dims=None, metrics=None, agg=None, max_bytes=MAX_BYTES):
+        """Whether ``build`` with the same arguments stays within ``max_bytes``."""
+        dims, metrics, _, _, shape = cls._layout(df, dims, metrics, agg)
+        return cube_nbytes(shape, len(metrics)) <= max_bytes
+
+    @classmethod
+    def build(cls, df, dims=None, metrics=None, agg=None, max_bytes=MAX_BYTES):
+        """Aggregate ``df`` into a cube over ``dims`` (default: the categorical columns present).
+
+        ``metrics`` defaults to every numeric column present. ``agg`` lets the
+        cube share the key codes of an existing ``Aggregator`` over ``df``.
+        Missing dimension values get a level of their own, so a roll-up drops a
+        row only when one of the keys it groups by is missing, as ``groupby`` does.
+        A cube over ``max_bytes`` raises ``ValueError`` (check with ``fits``).
+        """
+        dims, metrics, agg, levels, shape = cls._layout(df, dims, metrics, agg)
+        ncells = int(np.prod(shape, dtype=np.float64))
+        nbytes = cube_nbytes(shape, len(metrics))
+        if nbytes > max_bytes:
+            raise ValueError(f"a cube over {dims} would have {ncells} cells and take {nbytes / 2**20:.0f} MiB "
+                             f"(limit {max_bytes / 2**20:.0f} MiB)")
+
+        with span('cube.build', rows_in=len(df), cells=ncells, metrics=len(metrics)):
+            cell = np.zeros(len(df), dtype=np.int64)
+            for dim, size in zip(dims, shape):
+                codes = agg.codes(dim)[0]
+                cell = cell * size + np.where(codes >= 0, codes, size - 1)
+
+            count = np.bincount(cell, minlength=ncells)
+            sums = np.empty((len(metrics), ncells))
+            sumsq = np.empty((len(metrics), ncells))
+            counts = np.empty((len(metrics), ncells), dtype=np.int64)
+            int_metrics = []
+            for j, col in enumerate(metrics):
+                values, mask, is_int = agg._column(col)
+                sums[j] = np.bincount(cell, weights=values, minlength=ncells)
+                sumsq[j] = np.bincount(cell, weights=values * values, minlength=ncells)
+                counts[j] = count if mask is None else np.bincount(cell, weights=mask, minlength=ncells)
+                if is_int:
+                    int_metrics.append(col)
+
+            return cls(dims, levels, metrics, int_metrics, count.reshape(shape),
+                       sums.reshape((len(metrics),) + shape), sumsq.reshape((len(metrics),) + shape),
+                       counts.reshape((len(metrics),) + shape))
+
+    @property
+    def shape(self):
+        return self.count.shape
+
+    @property
+    def nbytes(self):
+        return self.count.nbytes + self.sums.nbytes + self.sumsq.nbytes + self.counts.nbytes
+
+    def covers(self, name):
+        """Whether the named summary (see ``SUMMARY_SPECS``) can be answered from the cube."""
+        return covers(name, self.dims, self.metrics)
+
+    # --- Slice and roll-up ---
+
+    def _axes(self, keys):
+        missing = [key for key in keys if key not in self.dims]
+        if missing:
+            raise KeyError(f"not cube dimensions: {missing}")
+        return [self.dims.index(key) for key in keys]
+
+    def _rollup(self, array, axes):
+        # Sum out every other dimension, then order the kept axes like ``axes``
+        lead = array.ndim - len(self.dims)
+        other = tuple(lead + i for i in range(len(self.dims)) if i not in axes)
+        reduced = array.sum(axis=other)
+        kept = sorted(axes)
+        reduced = np.moveaxis(reduced, [lead + kept.index(axis) for axis in axes], range(lead, lead + len(axes)))
+        # Drop the missing-value level of the kept dimensions
+        return reduced[(slice(None),) * lead + tuple(slice(len(self.levels[axis])) for axis in axes)]
+
+    def slice(self, **selection):
+        """Sub-cube keeping only the given values, e.g. ``slice(Routes=['Route A', 'Route B'])``."""
+        index = [slice(None)] * len(self.dims)
+        levels = list(self.levels)
+        for dim, values in selection.items():
+            axis = self._axes([dim])[0]
+            values = [values] if np.ndim(values) == 0 else list(values)
+            positions = levels[axis].get_indexer(values)
+            if (positions < 0).any():
+                raise KeyError(f"{dim} has no value(s) {[v for v, p in zip(values, positions) if p < 0]}")
+            index[axis] = positions
+            levels[axis] = levels[axis][positions]
+        cube = self
+        for axis, take in enumerate(index):
+            if not isinstance(take, slice):
+                cube = Cube(cube.dims, levels, cube.metrics, cube.int_metrics,
+                            cube.count.take(take, axis=axis), cube.sums.take(take, axis=axis + 1),
+                            cube.sumsq.take(take, axis=axis + 1), cube.counts.take(take, axis=axis + 1))
+        return cube
+
+    def agg(self, keys, spec):
+        """Equivalent of ``df.groupby(keys).agg(spec).reset_index()`` from the cube.
+
+        Reductions: size, count, sum, mean, var and std (``ddof=1``, like pandas).
+        Only combinations with at least one row are returned, in sorted key order.
+        """
+        keys = _as_keys(keys)
+        axes = self._axes(keys)
+        count = self._rollup(self.count, axes)
+        present = np.nonzero(count)
+        result = pd.DataFrame({key: self.levels[axis].array.take(codes)
+                               for key, axis, codes in zip(keys, axes, present)})
+        for col, how in spec.items():
+            if how == 'size':
+                result[col] = count[present]
+            else:
+                result[col] = self._reduce(col, how, axes, present)
+        return result
+
+    def _reduce(self, col, how, axes, present):
+        if col not in self.metrics:
+            raise KeyError(f"{col!r} is not a cube metric")
+        j = self.metrics.index(col)
+        n = self._rollup(self.counts[j], axes)[present]
+        if how == 'count':
+            return n
+        total = self._rollup(self.sums[j], axes)[present]
+        if how == 'sum':
+            return np.rint(total).astype(np.int64) if col in self.int_metrics else total
+        out = np.full(len(n), np.nan)
+        if how == 'mean':
+            np.divide(total, n, out=out, where=n > 0)
+            return out
+        if how in ('var', 'std'):
+            squares = self._rollup(self.sumsq[j], axes)[present]
+            np.divide(squares - total * total / np.maximum(n, 1), n - 1, out=out, where=n > 1)
+            # Cancellation can leave tiny negative variances for constant groups
+            np.maximum(out, 0, out=out, where=n > 1)
+            return np.sqrt(out) if how == 'std' else out
+        raise ValueError(f"unsupported reduction {how!r}")
+
+    def size_frame(self, keys, name='size'):
+        """Equivalent of ``df.groupby(keys).size().reset_index(name=name)``."""
+        return self.agg(keys, {name: 'size'})
+
+    def value_counts(self, col, name='count'):
+        """Equivalent of ``df[col].value_counts().reset_index()``."""
+        result = self.size_frame(col, name)
+        return result.sort_values(name, ascending=False, kind='stable').reset_index(drop=True)
@@ -0,0 +1,264 @@
+"""Build SCA_Dashboard.html with one shared data payload.
+
+The notebook used to embed ``json.dumps(figN.to_dict())`` for all 14 figures,
+so every per-SKU chart carried its own copy of the data as Python lists. Here
+the per-SKU table is serialized once as base64 typed arrays (text columns as
+integer codes plus a category list). The per-SKU traces hold ``{"$ref":
+column}`` placeholders with a ``$where`` filter, and a small script in the page
+resolves them against the payload. The layout template, identical in all 14
+figures, is stored once in the payload too. Summary charts have only a few
+points each, so their data is still embedded as plain figure JSON.
+"""
+
+import base64
+import json
+import os
+
+import numpy as np
+
+from sca.aggregate import Aggregator
+from sca.cube import Cube
+from sca.results import frame_fingerprint
+from sca.schema import COLOR_MAP
+from sca.store import encode_column
+from sca.trace import span, traced
+
+TEMPLATE_PATH = os.path.join(os.path.dirname(__file__), 'templates', 'dashboard.html')
+
+
+def np_serializer(obj):
+    """JSON fallback for NumPy values left in figure dicts."""
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def plain(obj):
+    """Expand plotly's base64 ``bdata`` arrays into lists.
+
+    The page loads plotly.js 1.x (plotly-latest), which predates that encoding.
+    """
+    if isinstance(obj, dict):
+        if 'bdata' in obj and 'dtype' in obj:
+            values = np.frombuffer(base64.b64decode(obj['bdata']), dtype=obj['dtype'])
+            if 'shape' in obj:
+                values = values.reshape([int(dim) for dim in str(obj['shape']).split(',')])
+            return values.tolist()
+        return {key: plain(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [plain(value) for value in obj]
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    return obj
+
+
+# --- Payload ---
+
+def encode_array(values):
+    # JavaScript has no 64-bit integer typed array in Plotly's reach; widen to float64
+    if values.dtype.kind in 'iu' and values.dtype.itemsize == 8:
+        values = values.astype(np.float64)
+    if values.dtype.kind == 'b':
+        values = values.astype(np.uint8)
+    values = np.ascontiguousarray(values, dtype=values.dtype.newbyteorder('<'))
+    dtype = f'{values.dtype.kind}{values.dtype.itemsize}'
+    return {'dtype': dtype, 'data': base64.b64encode(values.tobytes()).decode('ascii')}
+
+
+def encode_table(frame):
+    """Columnar payload for one table: typed arrays, text as codes plus categories."""
+    table = {}
+    for col in frame.columns:
+        values, categories = encode_column(frame[col])
+        entry = encode_array(values)
+        if categories is not None:
+            entry['categories'] = categories
+        table[col] = entry
+    return table
+
+
+def sku_table(agg):
+    """One row per (SKU, Product_type) with every per-SKU measure the dashboard plots."""
+    table = agg.agg(['SKU', 'Product_type'], {
+        'Revenue_generated': 'sum',
+        'Number_of_products_sold': 'sum',
+        'Stock_levels': 'sum',
+    })
+    table['Inventory_Turnover_Ratio'] = table['Number_of_products_sold'] / table['Stock_levels']
+    return table.drop(columns='Stock_levels')
+
+
+# --- Figures ---
+
+def _template_rows(table, order=None):
+    # One row per Product_type, in the order the traces would appear for the full table
+    if order is not None:
+        table = table.sort_values(**order, kind='stable')
+    return table.groupby('Product_type', sort=False, observed=True).head(1)
+
+
+def _link(fig, columns, order=None):
+    """Turn a figure built from template rows into payload references."""
+    spec = plain(fig.to_plotly_json())
+    for trace in spec['data']:
+        trace['$table'] = 'sku'
+        trace['$where'] = {'Product_type': trace['name']}
+        if order is not None:
+            trace['$order'] = order
+        for attr, col in columns.items():
+            trace[attr] = {'$ref': col, 'wrap': attr == 'customdata'}
+    return spec
+
+
+@traced('dashboard.figures')
+def dashboard_figures(df, shared=True):
+    """Build the 14 dashboard figures as JSON-ready dicts.
+
+    With ``shared`` the per-SKU figures reference the payload returned alongside
+    them; without it they embed their data and layout template inline, as the notebook
+    originally did.
+    """
+    import plotly.express as px
+
+    agg = Aggregator(df)
+    skus = sku_table(agg)
+    # Summary charts are roll-ups of one cube instead of a group-by each,
+    # unless the data has too many level combinations for one
+    rollups = Cube.build(df, agg=agg) if Cube.fits(df, agg=agg) else agg
+    color_map = COLOR_MAP
+    figures = {}
+
+    # --- Product Performance ---
+    sales_by_product = rollups.sales_by_product_type()
+    figures['fig1'] = px.pie(sales_by_product, values='Number_of_products_sold', names='Product_type',
+                             title='Sales Distribution Across Product Categories', color_discrete_map=color_map, hole=0.4)
+
+    # --- Customer Demographics ---
+    revenue_by_demo = rollups.revenue_by_demo()
+    figures['fig3'] = px.pie(revenue_by_demo, values='Revenue_generated', names='Customer_demographics',
+                             title='Revenue Contribution by Customer Segments', hole=0.4,
+                             color_discrete_sequence=px.colors.qualitative.Pastel)
+
+    sales_by_demo_product = rollups.sales_by_demo_product()
+    figures['fig4'] = px.bar(sales_by_demo_product, x='Customer_demographics', y='Number_of_products_sold',
+                             color='Product_type', barmode='group',
+                             title='Product Sales Breakdown by Customer Segments', color_discrete_map=color_map)
+
+    # --- Cost Analysis ---
+    transport_costs = rollups.transport_costs()
+    figures['fig7'] = px.pie(transport_costs, values='Shipping_costs', names='Transportation_modes',
+                             title='Transportation Cost Breakdown by Mode', hole=0.4)
+
+    carrier_costs = rollups.carrier_costs()
+    figures['fig8'] = px.bar(carrier_costs, x='Shipping_carriers', y='Shipping_costs',
+                             title='Average Shipping Costs Across Carriers', color_discrete_sequence=['#4682B4'])
+
+    # --- Supplier Analysis ---
+    supplier_demand = rollups.supplier_demand()
+    figures['fig10'] = px.bar(supplier_demand, x='Supplier_name', y='Number_of_products_sold',
+                              title='Top Suppliers by Product Demand', color_discrete_sequence=['#32CD32'])
+
+    supplier_defects = rollups.supplier_defects()
+    figures['fig11'] = px.bar(supplier_defects, x='Supplier_name', y='Defect_rates', color='Supplier_name',
+                              title='Supplier Quality: Average Defect Rates',
+                              color_discrete_sequence=px.colors.qualitative.Set2)
+
+    # --- Quality Control ---
+    transport_defects = rollups.transport_defects()
+    figures['fig12'] = px.pie(transport_defects, values='Defect_rates', names='Transportation_modes',
+                              title='Quality Impact by Transportation Mode', hole=0.4)
+
+    carrier_defects = rollups.carrier_defects()
+    figures['fig13'] = px.bar(carrier_defects, x='Shipping_carriers', y='Defect_rates',
+                              title='Quality Impact by Shipping Carrier', color_discrete_sequence=['#FF6347'])
+
+    product_defects = rollups.product_type_defects()
+    figures['fig14'] = px.pie(product_defects, values='Defect_rates', names='Product_type',
+                              title='Quality Impact by Product Category', color_discrete_map=color_map, hole=0.4)
+
+    figures = {name: plain(fig.to_plotly_json()) for name, fig in figures.items()}
+
+    # --- Per-SKU figures ---
+    by_type = {'by': 'Product_type'}
+    by_turnover = {'by': 'Inventory_Turnover_Ratio', 'ascending': False}
+
+    def sku_figures(rows):
+        return {
+            'fig2': px.scatter(rows(by_type), x='Number_of_products_sold', y='Revenue_generated', color='Product_type',
+                               hover_data=['SKU'], title='Revenue vs Sales Performance by Product Category',
+                               color_discrete_map=color_map),
+            'fig5': px.bar(rows(None), x='SKU', y='Revenue_generated', color='Product_type',
+                           title='Revenue Generated per SKU by Product Category', color_discrete_map=color_map),
+            'fig6': px.bar(rows(None), x='SKU', y='Number_of_products_sold', color='Product_type',
+                           title='Order Quantities per SKU by Product Category', color_discrete_map=color_map),
+            'fig9': px.bar(rows(by_turnover), x='SKU', y='Inventory_Turnover_Ratio', color='Product_type',
+                           title='Inventory Turnover Efficiency by SKU', color_discrete_map=color_map),
+        }
+
+    if not shared:
+        def full_rows(order):
+            return skus if order is None else skus.sort_values(**order, kind='stable')
+        figures.update({name: plain(fig.to_plotly_json()) for name, fig in sku_figures(full_rows).items()})
+        return figures, None
+
+    linked = sku_figures(lambda order: _template_rows(skus, order))
+    figures['fig2'] = _link(linked['fig2'], {'x': 'Number_of_products_sold', 'y': 'Revenue_generated',
+                                             'customdata': 'SKU'})
+    figures['fig5'] = _link(linked['fig5'], {'x': 'SKU', 'y': 'Revenue_generated'})
+    figures['fig6'] = _link(linked['fig6'], {'x': 'SKU', 'y': 'Number_of_products_sold'})
+    figures['fig9'] = _link(linked['fig9'], {'x': 'SKU', 'y': 'Inventory_Turnover_Ratio'},
+                            {'by': 'Inventory_Turnover_Ratio', 'descending': True})
+    payload = {'tables': {'sku': encode_table(skus)}, 'template': share_template(figures)}
+    return figures, payload
+
+
+def share_template(figures):
+    """Move the layout template every figure repeats into the payload, once."""
+    templates = [fig['layout'].get('template') for fig in figures.values()]
+    shared = templates[0]
+    if shared is None or any(template != shared for template in templates):
+        return None
+    for fig in figures.values():
+        fig['layout']['template'] = {'$shared': True}
+    return shared
+
+
+def embedded_json(figures, payload):
+    """The figure and payload JSON the page embeds."""
+    ordered = {f'fig{i}': figures[f'fig{i}'] for i in range(1, 15)}
+    # Compact separators: this JSON is read by the browser, not by people
+    with span('dashboard.json_dumps') as s:
+        figures_json = json.dumps(ordered, default=np_serializer, separators=(',', ':'))
+        payload_json = json.dumps(payload or {'tables': {}, 'template': None}, separators=(',', ':'))
+        s.set(figures_bytes=len(figures_json), payload_bytes=len(payload_json))
+    return figures_json, payload_json
+
+
+def render_dashboard(figures, payload):
+    with open(TEMPLATE_PATH, encoding='utf-8') as f:
+        template = f.read()
+    figures_json, payload_json = embedded_json(figures, payload)
+    return template.replace('__PAYLOAD__', payload_json).replace('__FIGURES__', figures_json)
+
+
+def build_dashboard(df, shared=True):
+    return render_dashboard(*dashboard_figures(df, shared=shared))
+
+
+@traced('dashboard.write')
+def write_dashboard(df, path='SCA_Dashboard.html', shared=True, cache=None, fingerprint=None):
+    """Build every figure and write the dashboard HTML; returns the file size in bytes.
+
+    With a ``ResultCache`` the page is reused while the data (``fingerprint``,
+    by default a hash of ``df``) is unchanged.
+    """
+    if cache is None:
+        html = build_dashboard(df, shared)
+    else:
+        key = cache.key(fingerprint or frame_fingerprint(df), 'dashboard', 'SCA_Dashboard', {'shared': shared})
+        html = cache.get_or_compute(key, lambda: build_dashboard(df, shared))
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(html)
+    return len(html.encode('utf-8'))
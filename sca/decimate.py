@@ -0,0 +1,150 @@
+"""Point-budget reduction for the per-SKU charts.
+
+Plotting one marker per SKU stops working at hundreds of thousands of SKUs:
+Plotly serialization dominates the run and the browser cannot draw the result.
+The helpers here reduce any input to a fixed point budget per figure:
+
+- ``lttb`` / ``minmax`` pick representative rows for line charts
+- ``bin_scatter`` aggregates scatter points into rectangular or hexagonal bins
+
+Inputs already within budget are returned unchanged, so small datasets plot
+exactly as before.
+"""
+
+import numpy as np
+import pandas as pd
+
+POINT_BUDGET = 2000
+
+
+# --- Line downsampling ---
+
+def lttb(y, n_out, x=None):
+    """Largest-Triangle-Three-Buckets: indices of ``n_out`` points that keep the line's shape."""
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n) if n_out >= n else np.linspace(0, n - 1, max(n_out, 0)).astype(np.int64)
+    x = np.arange(n, dtype=np.float64) if x is None else np.asarray(x, dtype=np.float64)
+    # First and last points are always kept; the rest is split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    prev = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        # Average of the next bucket (or the last point) is the triangle's third vertex
+        nlo, nhi = edges[b + 1], edges[b + 2] if b + 2 < len(edges) else n
+        ax, ay = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        px, py = x[prev], y[prev]
+        area = np.abs((px - ax) * (y[lo:hi] - py) - (px - x[lo:hi]) * (ay - py))
+        prev = lo + int(np.argmax(area))
+        selected[b + 1] = prev
+    return selected
+
+
+def minmax(y, n_out):
+    """Indices of the minimum and maximum of each of ``n_out // 2`` equal buckets."""
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_out >= n:
+        return np.arange(n)
+    buckets = max(n_out // 2, 1)
+    starts = np.linspace(0, n, buckets + 1).astype(np.int64)[:-1]
+    bucket = np.repeat(np.arange(buckets), np.diff(np.append(starts, n)))
+    # Sort by (bucket, value): each bucket's first and last entries are its min and max
+    order = np.lexsort((y, bucket))
+    ends = np.append(starts[1:], n) - 1
+    picks = np.unique(np.concatenate([order[starts], order[ends]]))
+    return picks
+
+
+def decimate_lines(df, y, by=None, budget=POINT_BUDGET, method='lttb'):
+    """Rows of ``df`` to draw for a line of ``y`` per ``by`` group, within ``budget`` points.
+
+    Row order is preserved, so the result can go straight into ``px.line``.
+    """
+    if len(df) <= budget:
+        return df
+    pick = lttb if method == 'lttb' else minmax
+    if by is None:
+        return df.iloc[np.sort(pick(df[y].to_numpy(), budget))]
+    codes, _ = pd.factorize(df[by])
+    sizes = np.bincount(codes[codes >= 0])
+    # Split the budget across groups in proportion to their row counts
+    shares = np.maximum(np.floor(budget * sizes / sizes.sum()).astype(np.int64), 3)
+    values = df[y].to_numpy(dtype=np.float64)
+    keep = []
+    for group, share in enumerate(shares):
+        rows = np.flatnonzero(codes == group)
+        keep.append(rows[pick(values[rows], share)])
+    return df.iloc[np.sort(np.concatenate(keep))]
+
+
+# --- Scatter binning ---
+
+def _scaled(values, bins):
+    lo, hi = np.nanmin(values), np.nanmax(values)
+    span = hi - lo if hi > lo else 1.0
+    return (values - lo) / span * bins
+
+
+def rect_bins(x, y, gridsize):
+    """Cell id of each point on a ``gridsize`` x ``gridsize`` rectangular grid."""
+    ix = np.minimum(_scaled(x, gridsize).astype(np.int64), gridsize - 1)
+    iy = np.minimum(_scaled(y, gridsize).astype(np.int64), gridsize - 1)
+    return ix * gridsize + iy
+
+
+def hex_bins(x, y, gridsize):
+    """Cell id of each point on a hexagonal grid ``gridsize`` cells wide."""
+    ny = max(int(gridsize / np.sqrt(3)), 1)
+    sx, sy = _scaled(x, gridsize), _scaled(y, ny)
+    # Two offset rectangular lattices; each point belongs to the nearer center
+    i1, j1 = np.rint(sx), np.rint(sy)
+    i2, j2 = np.floor(sx), np.floor(sy)
+    d1 = (sx - i1) ** 2 + 3.0 * (sy - j1) ** 2
+    d2 = (sx - i2 - 0.5) ** 2 + 3.0 * (sy - j2 - 0.5) ** 2
+    first = d1 <= d2
+    lattice1 = i1 * (ny + 1) + j1
+    lattice2 = (gridsize + 1) * (ny + 1) + i2 * ny + j2
+    return np.where(first, lattice1, lattice2).astype(np.int64)
+
+
+def bin_scatter(df, x, y, color=None, size=None, label='SKU', budget=POINT_BUDGET, shape='rect',
+                size_how='sum'):
+    """Aggregate scatter points into at most ``budget`` bins per figure.
+
+    Each bin is drawn at the centroid of its points. ``size`` becomes the sum
+    (or mean, with ``size_how='mean'``) over the bin, and ``label`` reads like
+    ``"SKU12 (+40 more)"``. The result
+    keeps the input column names, so the same ``px.scatter`` call plots it.
+    """
+    if len(df) <= budget:
+        return df
+    groups, uniques = pd.factorize(df[color]) if color is not None else (np.zeros(len(df), np.int64), [None])
+    # A hex grid n cells wide has about 2 / sqrt(3) * n**2 cells, a square one n**2
+    density = 2 / np.sqrt(3) if shape == 'hex' else 1.0
+    gridsize = max(int(np.sqrt(budget / max(len(uniques), 1) / density)), 1)
+    xs = df[x].to_numpy(dtype=np.float64)
+    ys = df[y].to_numpy(dtype=np.float64)
+    cells = (hex_bins if shape == 'hex' else rect_bins)(xs, ys, gridsize)
+    cells = cells * len(uniques) + groups
+    # first: position of each bin's first row, which supplies its label and group
+    _, first, inverse, counts = np.unique(cells, return_index=True, return_inverse=True, return_counts=True)
+
+    binned = {
+        x: np.bincount(inverse, weights=xs) / counts,
+        y: np.bincount(inverse, weights=ys) / counts,
+    }
+    if color is not None:
+        binned[color] = df[color].to_numpy()[first]
+    if size is not None:
+        totals = np.bincount(inverse, weights=df[size].to_numpy(dtype=np.float64))
+        binned[size] = totals / counts if size_how == 'mean' else totals
+    if label is not None and label in df:
+        names = df[label].iloc[first].astype(str).to_numpy()
+        more = counts - 1
+        binned[label] = np.where(more > 0, [f'{name} (+{m} more)' for name, m in zip(names, more)], names)
+    binned['Points'] = counts
+    return pd.DataFrame(binned)
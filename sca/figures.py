@@ -0,0 +1,371 @@
+"""Figure builders for the SCA.py report.
+
+Each builder takes only the small, precomputed table it plots and returns a
+Plotly figure, so figures can be built independently (and in parallel, see
+sca/report.py). ``FIGURES`` lists every builder in report order together with
+the tables it needs.
+"""
+
+import plotly.express as px
+
+from sca.schema import COLOR_MAP
+from sca.trace import span
+
+# The product section highlights cosmetics in dark orange
+PRODUCT_COLOR_MAP = {**COLOR_MAP, 'cosmetics': '#FF7F50'}
+
+# name -> (builder, names of the tables it takes, in argument order)
+FIGURES = {}
+
+
+def figure(*tables):
+    def register(builder):
+        FIGURES[builder.__name__] = (builder, list(tables))
+        return builder
+    return register
+
+
+def build(name, tables):
+    """Build figure ``name`` from a dict of tables."""
+    builder, needs = FIGURES[name]
+    with span(f'figure.{name}', rows_in=sum(len(tables[table]) for table in needs)):
+        return builder(*(tables[table] for table in needs))
+
+
+# --- Product Performance ---
+
+@figure('sales_by_product_type')
+def sales_pie(sales_by_product_type):
+    # Pie Chart: Sales by Product Type (Number of Products Sold)
+    fig = px.pie(sales_by_product_type,
+                 values='Number_of_products_sold',
+                 names='Product_type',
+                 title='Sales Distribution by Product Type',
+                 color='Product_type',  # Use Product_type for color mapping
+                 color_discrete_map=PRODUCT_COLOR_MAP,
+                 hole=0.3)  # Donut style for visual appeal
+    fig.update_traces(textinfo='percent+label',
+                      pull=[0.1] * len(sales_by_product_type),  # Pull all slices slightly
+                      marker=dict(line=dict(color='#000000', width=2)))  # Black borders
+    fig.update_layout(showlegend=True,
+                      legend_title_text='Product Type')
+    return fig
+
+
+@figure('rev_prod_points')
+def rev_prod(rev_prod_points):
+    # Interactive Scatter Plot: Revenue vs Products Sold
+    fig = px.scatter(rev_prod_points, x='Number_of_products_sold', y='Revenue_generated',
+                     color='Product_type', size='Price', hover_data=['SKU'],
+                     title='Revenue vs Number of Products Sold by Product Type',
+                     labels={'Number_of_products_sold': 'Number of Products Sold', 'Revenue_generated': 'Revenue Generated'},
+                     color_discrete_map=PRODUCT_COLOR_MAP)
+    fig.update_traces(marker=dict(line=dict(color='#000000', width=1)))  # Add borders
+    fig.update_layout(showlegend=True,
+                      legend_title_text='Product Type',
+                      hovermode='closest')
+    return fig
+
+
+@figure('revenue_price_points')
+def revenue_price(revenue_price_points):
+    # Revenue Generated vs Price by Product Type
+    fig = px.scatter(revenue_price_points, x='Price', y='Revenue_generated',
+                     color='Product_type', size='Number_of_products_sold', hover_data=['SKU'],
+                     title='Revenue Generated vs Price by Product Type',
+                     labels={'Price': 'Price ($)', 'Revenue_generated': 'Revenue Generated ($)'},
+                     color_discrete_map=PRODUCT_COLOR_MAP)
+    fig.update_traces(marker=dict(line=dict(color='#000000', width=1)))
+    fig.update_layout(showlegend=True,
+                      legend_title_text='Product Type',
+                      hovermode='closest')
+    return fig
+
+
+# --- Customer Demographics ---
+
+@figure('revenue_by_demo')
+def revenue_pie(revenue_by_demo):
+    # Revenue Distribution by Customer Demographics (Pie Chart)
+    fig = px.pie(revenue_by_demo,
+                 values='Revenue_generated',
+                 names='Customer_demographics',
+                 title='Revenue Distribution by Customer Demographics',
+                 color_discrete_sequence=px.colors.qualitative.Plotly,
+                 hole=0.3)
+    fig.update_traces(textinfo='percent+label',
+                      pull=[0.1] * len(revenue_by_demo),
+                      marker=dict(line=dict(color='#000000', width=2)))
+    fig.update_layout(showlegend=True,
+                      legend_title_text='Customer Demographics')
+    return fig
+
+
+@figure('sales_by_demo_product')
+def sales_demo(sales_by_demo_product):
+    # Product Sales by Product Type and Customer Demographics (Bar Chart)
+    fig = px.bar(sales_by_demo_product,
+                 x='Customer_demographics',
+                 y='Number_of_products_sold',
+                 color='Product_type',
+                 barmode='group',  # Group bars side by side
+                 title='Product Sales by Product Type and Customer Demographics',
+                 labels={'Number_of_products_sold': 'Total Units Sold', 'Customer_demographics': 'Customer Demographics'},
+                 color_discrete_map=COLOR_MAP)
+    fig.update_traces(marker=dict(line=dict(color='#000000', width=1)), width=0.3)
+    fig.update_layout(showlegend=True,
+                      legend_title_text='Product Type',
+                      xaxis_title='Customer Demographics',
+                      yaxis_title='Total Units Sold',
+                      bargap=0.2,
+                      title_font=dict(size=16))
+    return fig
+
+
+@figure('supplier_by_demo')
+def supplier_demo(supplier_by_demo):
+    # Supplier Distribution by Customer Demographics (Bar Chart)
+    fig = px.bar(supplier_by_demo,
+                 x='Supplier_name',
+                 y='Count',
+                 color='Customer_demographics',
+                 barmode='stack',  # Stack bars for total supplier count
+                 title='Supplier Distribution by Customer Demographics',
+                 labels={'Count': 'Number of Products', 'Supplier_name': 'Supplier'})
+    fig.update_traces(marker=dict(line=dict(color='#000000', width=1)))
+    fig.update_layout(showlegend=True,
+                      legend_title_text='Customer Demographics',
+                      xaxis_title='Supplier',
+                      yaxis_title='Number of Products',
+                      bargap=0.2,
+                      title_font=dict(size=16))
+    return fig
+
+
+@figure('supplier_demo_product')
+def supplier_preference(supplier_demo_product):
+    # Supplier Preference by Customer Demographics and Product Type (Grouped Bar Chart)
+    fig = px.bar(supplier_demo_product,
+                 x='Supplier_name',
+                 y='Product_Count',
+                 color='Product_type',
+                 facet_col='Customer_demographics',  # Separate by demographics
+                 title='Supplier Preference by Customer Demographics and Product Type ',
+                 labels={'Product_Count': 'Number of Products', 'Supplier_name': 'Supplier'},
+                 color_discrete_map=COLOR_MAP,
+                 height=500,  # Increase height for better visibility
+                 text=supplier_demo_product['Product_Count'])  # Add value labels on bars
+    fig.update_traces(marker=dict(line=dict(color='#000000', width=1)),
+                      width=0.4,  # Slightly wider bars
+                      textposition='auto',  # Position text automatically
+                      textfont=dict(size=12))  # Readable font size
+    fig.update_layout(showlegend=True,
+                      legend_title_text='Product Type',
+                      xaxis_title='Supplier',
+                      yaxis_title='Number of Products',
+                      bargap=0.3,  # Larger gap for clarity
+                      bargroupgap=0.1,  # Gap between groups within facets
+                      title_font=dict(size=16),
+                      font=dict(size=12),  # Consistent font size
+                      hovermode='x unified')  # Unified hover tooltip
+    fig.update_xaxes(tickangle=45)  # Rotate x-axis labels for readability
+    return fig
+
+
+# --- Stock and Inventory ---
+
+@figure('product_type_dist')
+def product_type_pie(product_type_dist):
+    # Distribution of Product Types in Inventory
+    fig = px.pie(product_type_dist,
+                 values='Count',
+                 names='Product_type',
+                 title='Distribution of Product Types in Inventory',
+                 color_discrete_sequence=px.colors.qualitative.Plotly,  # Distinct colors
+                 hole=0.3)  # Add a donut hole for style
+    fig.update_traces(textinfo='percent+label',  # Show percentage and label
+                      pull=[0.1] * len(product_type_dist),  # Pull all slices slightly
+                      marker=dict(line=dict(color='#000000', width=2)))  # Add black borders for clarity
+    fig.update_layout(showlegend=True,  # Show legend
+                      legend_title_text='Product Type')
+    return fig
+
+
+# --- Supplier ---
+
+@figure('supplier_summary')
+def supplier_lead_defects(supplier_summary):
+    # Interactive Scatter Plot: Lead Time vs Defect Rates
+    return px.scatter(supplier_summary, x='Lead_time', y='Defect_rates', size='Production_volumes', color='Supplier_name',
+                      hover_data=['Supplier_name'], title='Supplier Lead Time vs Defect Rates',
+                      labels={'Lead_time': 'Average Lead Time (days)', 'Defect_rates': 'Average Defect Rate (%)'})
+
+
+@figure('supplier_summary')
+def supplier_bar(supplier_summary):
+    # Bar Chart: Suppliers vs Average Defect Rates
+    fig = px.bar(supplier_summary,
+                 x='Supplier_name',
+                 y='Defect_rates',
+                 color='Supplier_name',  # Color by supplier for distinction
+                 title='Average Defect Rates by Supplier',
+                 labels={'Defect_rates': 'Average Defect Rate (%)', 'Supplier_name': 'Supplier'},
+                 color_discrete_sequence=px.colors.qualitative.Plotly)
+    fig.update_traces(marker=dict(line=dict(color='#000000', width=1)),  # Add black borders
+                      width=0.5)  # Adjust bar width
+    fig.update_layout(showlegend=True,
+                      legend_title_text='Supplier',
+                      xaxis_title='Supplier',
+                      yaxis_title='Average Defect Rate (%)',
+                      bargap=0.2,  # Add gap between bars
+                      title_font=dict(size=16))
+    return fig
+
+
+# --- Shipping and Logistics ---
+
+@figure('shipping_summary')
+def shipping_costs(shipping_summary):
+    # Interactive Bar Plot: Shipping Costs by Carrier
+    fig = px.bar(shipping_summary,
+                 x='Shipping_carriers',
+                 y='Shipping_costs',
+                 color='Shipping_carriers',
+                 title='Total Shipping Costs by Carrier',
+                 labels={'Shipping_costs': 'Shipping Costs ($)'})
+    fig.update_traces(width=0.4)  # Slim bars
+    return fig
+
+
+# --- SKU ---
+
+def _sku_line(points, metric, title, label):
+    fig = px.line(points, x='SKU', y=metric, title=title,
+                  labels={metric: label, 'SKU': 'SKU'},
+                  color='Product_type',  # Color by Product Type
+                  color_discrete_map=COLOR_MAP)
+    fig.update_traces(mode='lines+markers', marker=dict(size=6, line=dict(width=1, color='#000000')))  # Add markers and borders
+    fig.update_layout(showlegend=True,
+                      legend_title_text='Product Type',
+                      xaxis_title='SKU',
+                      yaxis_title=label,
+                      title_font=dict(size=16))
+    return fig
+
+
+@figure('revenue_line')
+def rev_chart(revenue_line):
+    return _sku_line(revenue_line, 'Revenue_generated', 'Revenue Generated by SKU', 'Revenue Generated ($)')
+
+
+@figure('stock_line')
+def stock_chart(stock_line):
+    return _sku_line(stock_line, 'Stock_levels', 'Stock Levels by SKU', 'Stock Levels')
+
+
+@figure('order_line')
+def order_chart(order_line):
+    return _sku_line(order_line, 'Order_quantities', 'Order Quantities by SKU', 'Order Quantities')
+
+
+# --- Cost ---
+
+@figure('shipping_summary')
+def shipping_cost_chart(shipping_summary):
+    # Shipping Costs by carrier chart (one bar per carrier, summed)
+    fig = px.bar(shipping_summary,
+                 x='Shipping_carriers',
+                 y='Shipping_costs',
+                 title='Total Shipping Costs by Carrier',
+                 labels={'Shipping_costs': 'Shipping Costs ($)', 'Shipping_carriers': 'Shipping Carrier'},
+                 color='Shipping_carriers')  # Color by Shipping Carrier
+    fig.update_traces(width=0.4)  # Reduce bar width for better visibility
+    return fig
+
+
+@figure('transport_mode_costs')
+def transportation_cost_chart(transport_mode_costs):
+    # Transportation Costs by mode chart
+    return px.pie(transport_mode_costs,
+                  values='Costs',
+                  names='Transportation_modes',
+                  title='Transportation Costs by Mode',
+                  hole=0.5,  # Donut style for visual appeal
+                  color_discrete_sequence=px.colors.qualitative.Plotly,  # Distinct colors
+                  labels={'Costs': 'Transportation Costs ($)', 'Transportation_modes': 'Transportation Mode'})
+
+
+@figure('inventory_turnover_summary')
+def inventory_turnover(inventory_turnover_summary):
+    # Interactive Bar Plot: Inventory Turnover Ratio by Product Type
+    fig = px.bar(inventory_turnover_summary,
+                 x='SKU',
+                 y='Inventory_Turnover_Ratio',
+                 color='Product_type',
+                 title='Inventory Turnover Ratio by SKU ',
+                 labels={'Inventory_Turnover_Ratio': 'Inventory Turnover Ratio', 'SKU': 'SKU'},
+                 color_discrete_map=COLOR_MAP,
+                 category_orders={'Product_type': ['haircare', 'skincare', 'cosmetics']})  # Order Product_type
+    fig.update_traces(width=0.4,  # Reduce bar width for better visibility
+                      marker=dict(line=dict(color='#000000', width=1)))  # Add borders
+    fig.update_layout(showlegend=True,
+                      legend_title_text='Product Type',
+                      xaxis_title='SKU',
+                      yaxis_title='Inventory Turnover Ratio',
+                      title_font=dict(size=16),
+                      bargap=0.2)  # Add gap between bars for clarity
+    return fig
+
+
+# --- Quality Control ---
+
+@figure('transport_defects')
+def transport_pie(transport_defects):
+    # Pie Chart 1: Defect Rates by Mode of Transportation
+    fig = px.pie(transport_defects,
+                 values='Defect_rates',
+                 names='Transportation_modes',
+                 title='Average Defect Rates by Mode of Transportation',
+                 color_discrete_sequence=px.colors.qualitative.Plotly,
+                 hole=0.3)  # Donut style
+    fig.update_traces(textinfo='percent+label',
+                      pull=[0.1] * len(transport_defects),
+                      marker=dict(line=dict(color='#000000', width=2)))
+    fig.update_layout(showlegend=True,
+                      legend_title_text='Transportation Mode')
+    return fig
+
+
+@figure('product_type_defects')
+def product_type_defects_pie(product_type_defects):
+    # Pie Chart 2: Defect Rates by Product Type
+    fig = px.pie(product_type_defects,
+                 values='Defect_rates',
+                 names='Product_type',
+                 title='Average Defect Rates by Product Type',
+                 color='Product_type',
+                 color_discrete_map=COLOR_MAP,
+                 hole=0.3)
+    fig.update_traces(textinfo='percent+label',
+                      pull=[0.1] * len(product_type_defects),
+                      marker=dict(line=dict(color='#000000', width=2)))
+    fig.update_layout(showlegend=True,
+                      legend_title_text='Product Type')
+    return fig
+
+
+@figure('combined_defective')
+def defective_bar(combined_defective):
+    # Bar Chart: Top 3 Most Defective vs Bottom 3 Least Defective SKUs
+    fig = px.bar(combined_defective,
+                 x='SKU',
+                 y='Defect_rates',
+                 title='Top 3 Most Defective vs Bottom 3 Least Defective SKUs',
+                 labels={'Defect_rates': 'Defect Rate (%)'},
+                 color='Defect_rates',  # Gradient based on value
+                 color_continuous_scale='Viridis')  # High = yellow, Low = purple
+    fig.update_traces(marker=dict(line=dict(color='#000000', width=1)))
+    fig.update_layout(showlegend=False,  # No legend for continuous scale
+                      xaxis_title='SKU',
+                      yaxis_title='Defect Rate (%)')
+    return fig
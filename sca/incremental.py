@@ -0,0 +1,157 @@
+"""Incremental cleaning and re-aggregation for appended SKU rows.
+
+Rerunning Data_cleaning.ipynb and SCA.py for a handful of new SKUs rescans the
+whole history. ``IncrementalPipeline`` keeps only the state those steps depend
+on and updates it from each delta batch:
+
+- KLL sketches per numeric column for the median fill and the IQR fences
+- running value counts per text column for the mode fill
+- sorted row hashes for duplicate removal
+- ``PartialAggregate`` sums and counts for every summary table
+
+Rows already cleaned are not revisited. When a batch moves the IQR fences, the
+new fences apply to that batch and later ones only.
+"""
+
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from sca.aggregate import Aggregator
+from sca.cleaning import (
+    NUMERIC_DTYPES, clip_outliers, drop_sparse_columns, fill_missing, fix_types,
+    looks_like_dates, normalize_column_names, normalize_text, text_columns,
+)
+from sca.sketch import KLLSketch
+from sca.partition import finish_summary
+from sca.stream import partial_aggregates
+
+
+class IncrementalCleaner:
+    """Clean raw supply_chain.csv batches with statistics accumulated across batches.
+
+    The first batch fixes the schema (kept columns, numeric and date columns).
+    While fewer than ``k`` values per column have been seen the statistics are
+    exact, so a single batch gives the same result as ``clean()``.
+    """
+
+    def __init__(self, k=1024, sparse_threshold=0.5):
+        self.k = k
+        self.sparse_threshold = sparse_threshold
+        self.columns = None
+        self.numeric = None
+        self.date_columns = None
+        self.clean_numeric = None   # numeric columns under their cleaned names
+        self.fill_sketches = {}     # raw numeric values, for the median fill
+        self.clip_sketches = {}     # filled, de-duplicated values, for the IQR fences
+        self.value_counts = {}      # text value counts, for the mode fill
+        self.seen = np.empty(0, dtype=np.uint64)
+        self.rows_in = 0
+        self.rows_out = 0
+
+    def _fit_schema(self, raw):
+        kept = drop_sparse_columns(raw, self.sparse_threshold)
+        self.columns = list(kept.columns)
+        self.numeric = list(kept.select_dtypes(include=NUMERIC_DTYPES).columns)
+        self.date_columns = [col for col in text_columns(kept) if looks_like_dates(kept[col])]
+        self.clean_numeric = list(normalize_column_names(kept[self.numeric]).columns)
+
+    def _fills(self, data):
+        for col in self.numeric:
+            sketch = self.fill_sketches.setdefault(col, KLLSketch(self.k))
+            sketch.update(data[col].to_numpy(dtype=np.float64, na_value=np.nan))
+        for col in data.columns.difference(self.numeric):
+            counts = data[col].value_counts()
+            previous = self.value_counts.get(col)
+            self.value_counts[col] = counts if previous is None else previous.add(counts, fill_value=0)
+
+        fills = {}
+        for col in data.columns[data.isna().any().to_numpy()]:
+            if col in self.fill_sketches:
+                fills[col] = self.fill_sketches[col].quantile(0.5)
+            elif len(self.value_counts[col]):
+                counts = self.value_counts[col]
+                # Ties resolve to the smallest value, like Series.mode()[0]
+                fills[col] = counts.index[(counts == counts.max()).to_numpy()].sort_values()[0]
+        return fills
+
+    def _drop_seen(self, data):
+        # Drop rows identical to one already cleaned (within the batch or earlier)
+        data = data.drop_duplicates()
+        hashes = pd.util.hash_pandas_object(data, index=False).to_numpy()
+        pos = np.searchsorted(self.seen, hashes)
+        found = pos < len(self.seen)
+        found[found] = self.seen[pos[found]] == hashes[found]
+        new, new_pos = hashes[~found], pos[~found]
+        order = np.argsort(new, kind='stable')
+        self.seen = np.insert(self.seen, new_pos[order], new[order])
+        return data[~found]
+
+    def _bounds(self):
+        quartiles = {col: self.clip_sketches[col].quantile([0.25, 0.75]) for col in self.clean_numeric}
+        q1 = pd.Series({col: q[0] for col, q in quartiles.items()})
+        q3 = pd.Series({col: q[1] for col, q in quartiles.items()})
+        iqr = q3 - q1
+        return q1 - 1.5 * iqr, q3 + 1.5 * iqr
+
+    def update(self, raw):
+        """Clean one raw batch and fold it into the running statistics."""
+        if self.columns is None:
+            self._fit_schema(raw)
+        self.rows_in += len(raw)
+        data = raw.reindex(columns=self.columns)
+        data = fill_missing(data, self._fills(data))
+        data = fix_types(data, self.date_columns)
+        data = self._drop_seen(data)
+        data = normalize_column_names(data)
+        data = normalize_text(data)
+        for col in self.clean_numeric:
+            sketch = self.clip_sketches.setdefault(col, KLLSketch(self.k))
+            sketch.update(data[col].to_numpy(dtype=np.float64, na_value=np.nan))
+        data = clip_outliers(data, self.clean_numeric, bounds=self._bounds())
+        self.rows_out += len(data)
+        return data
+
+
+class IncrementalPipeline:
+    """Incremental cleaner plus running summary tables.
+
+        pipeline = IncrementalPipeline.load('data/SCA.state')
+        pipeline.update(pd.read_csv('new_skus.csv'), output='data/SCA.csv')
+        pipeline.summaries()['supplier_summary']
+        pipeline.save('data/SCA.state')
+    """
+
+    def __init__(self, names=None, **cleaner_options):
+        self.cleaner = IncrementalCleaner(**cleaner_options)
+        self.partials = partial_aggregates(names)
+
+    def update(self, raw, output=None):
+        """Clean a delta batch, update every summary, and optionally append it to ``output``."""
+        cleaned = self.cleaner.update(raw)
+        agg = Aggregator(cleaned)
+        for partial in self.partials.values():
+            partial.update(agg)
+        if output is not None:
+            cleaned.to_csv(output, mode='a', header=not os.path.exists(output), index=False)
+        return cleaned
+
+    def summaries(self):
+        """Current summary tables, in the row order ``Aggregator`` returns them."""
+        return {name: finish_summary(name, partial.result()) for name, partial in self.partials.items()}
+
+    def save(self, path):
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path, **options):
+        """Load saved state, or start fresh when ``path`` does not exist yet."""
+        if not os.path.exists(path):
+            return cls(**options)
+        with open(path, 'rb') as f:
+            return pickle.load(f)
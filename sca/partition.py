@@ -0,0 +1,396 @@
+"""Partitioned summaries: row shards aggregated in parallel, then merged.
+
+The frame is split into contiguous row shards aligned to ``BLOCK_ROWS``. Each
+shard computes partial aggregates with its own ``Aggregator``: group keys,
+sizes, non-null counts, integer sums, and per-block float sums. The parent
+merges them by key. Integer partials are exact in any order. Float sums are
+re-added block by block in row order, exactly as ``Aggregator`` does in a
+single process, so the merged tables are identical to the single-process ones
+for any number of shards.
+
+Shards run on a backend: anything with ``map(fn, items)`` that returns results
+in order. Built in are ``SerialBackend``, ``ProcessBackend`` (local processes;
+with ``fork`` the workers inherit the frame instead of receiving pickled
+shards), ``DaskBackend`` and ``RayBackend``. A ``concurrent.futures`` executor,
+``multiprocessing.Pool`` or ``ray.util.multiprocessing.Pool`` works as-is.
+
+    python -m sca.partition data/SCA.csv --workers 8 --check
+"""
+
+import argparse
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from sca.aggregate import (
+    BLOCK_ROWS, SUMMARIES, SUMMARY_SPECS, Aggregator, _as_keys, _unravel, fold_blocks, summaries,
+)
+from sca.analysis import inventory_turnover
+
+# Summary tables computed here, with the group-by behind each
+SPECS = {**SUMMARY_SPECS, 'product_type_dist': ('Product_type', {'Count': 'size'})}
+TURNOVER = 'inventory_turnover_summary'
+TURNOVER_COLUMNS = ['SKU', 'Product_type', 'Number_of_products_sold', 'Stock_levels']
+
+
+def finish_summary(name, table):
+    """Apply the row order the matching ``Aggregator`` method returns."""
+    if name == 'product_type_dist':
+        return table.sort_values('Count', ascending=False, kind='stable').reset_index(drop=True)
+    if name == 'supplier_demand':
+        return table.sort_values('Number_of_products_sold', ascending=False)
+    if name == 'supplier_defects':
+        return table.sort_values('Defect_rates', ascending=False)
+    return table
+
+
+def required_columns(names):
+    columns = []
+    for name in names:
+        if name == TURNOVER:
+            wanted = TURNOVER_COLUMNS
+        else:
+            keys, spec = SPECS[name]
+            wanted = list(_as_keys(keys)) + [col for col, how in spec.items() if how != 'size']
+        columns.extend(col for col in wanted if col not in columns)
+    return columns
+
+
+# --- Shards ---
+
+def shard_bounds(n, shards):
+    """``(lo, hi)`` row ranges for about ``shards`` shards, each starting on a block boundary."""
+    blocks = -(-n // BLOCK_ROWS)
+    per_shard = max(-(-blocks // max(shards, 1)), 1) * BLOCK_ROWS
+    return [(lo, min(lo + per_shard, n)) for lo in range(0, n, per_shard)] or [(0, 0)]
+
+
+def key_columns(names):
+    columns = []
+    for name in names:
+        if name != TURNOVER:
+            columns.extend(col for col in _as_keys(SPECS[name][0]) if col not in columns)
+    return columns
+
+
+def shard_partials(frame, names, codes, first_block=0):
+    """Partial aggregates of every summary in ``names`` over one shard.
+
+    ``codes`` holds the shard's slice of the key codes factorized over the
+    whole frame, so group ids from different shards line up.
+    """
+    agg = Aggregator(frame, codes)
+    partials = {}
+    for name in names:
+        if name == TURNOVER:
+            partials[name] = inventory_turnover(frame)
+            continue
+        keys, spec = SPECS[name]
+        g = agg.groups(keys)
+        partial = {'observed': g.observed, 'size': agg.size(keys), 'count': {}, 'int_sum': {}, 'float_sum': {},
+                   # Shard-local compression makes ids incomparable; merge on the key values then
+                   'keys': g.key_frame if g.prefix is not None else None}
+        for col, how in spec.items():
+            if how == 'size':
+                continue
+            partial['count'][col] = agg.count(keys, col)
+            _, _, is_int = agg._column(col)
+            if is_int and how == 'sum':
+                partial['int_sum'][col] = agg.sum(keys, col)
+            else:
+                block, group, total = agg.block_sums(keys, col)
+                partial['float_sum'][col] = (block + first_block, group, total)
+        partials[name] = partial
+    return partials
+
+
+_FRAME = None
+_CODES = None
+
+
+def _share_frame(frame, codes):
+    global _FRAME, _CODES
+    _FRAME, _CODES = frame, codes
+
+
+def _slice_codes(codes, lo, hi):
+    return {col: (col_codes[lo:hi], uniques) for col, (col_codes, uniques) in codes.items()}
+
+
+def _range_partials(task):
+    # Worker side of ProcessBackend: the shard is a slice of the inherited frame
+    lo, hi, names = task
+    return shard_partials(_FRAME.iloc[lo:hi], names, _slice_codes(_CODES, lo, hi), lo // BLOCK_ROWS)
+
+
+def _frame_partials(task):
+    frame, names, codes, first_block = task
+    return shard_partials(frame, names, codes, first_block)
+
+
+# --- Merge ---
+
+def _merge_groups(keys, parts, codes):
+    """Global groups for the shard partials: key frame plus each shard's group ids."""
+    if all(part['keys'] is None for part in parts):
+        levels = [codes[col][1] for col in keys]
+        observed, inverse = np.unique(np.concatenate([part['observed'] for part in parts]), return_inverse=True)
+        key_frame = _unravel(None, levels, observed)
+    else:
+        # Group the union of shard keys exactly as the single-process Aggregator would
+        frames = [part['keys'] if part['keys'] is not None else _unravel(None, [codes[col][1] for col in keys],
+                                                                           part['observed'])
+                  for part in parts]
+        g = Aggregator(pd.concat(frames, ignore_index=True)).groups(keys)
+        key_frame, inverse = g.key_frame, g.ids
+    offsets = np.cumsum([0] + [len(part['size']) for part in parts])
+    return key_frame, [inverse[lo:hi] for lo, hi in zip(offsets[:-1], offsets[1:])]
+
+
+def _merge_table(name, parts, codes):
+    keys, spec = SPECS[name]
+    keys = list(_as_keys(keys))
+    key_frame, ids = _merge_groups(keys, parts, codes)
+    ngroups = len(key_frame)
+    all_ids = np.concatenate(ids)
+
+    def total(field, col=None):
+        # Integer partials: float64 bincount is exact below 2**53
+        values = np.concatenate([part[field] if col is None else part[field][col] for part in parts])
+        return np.rint(np.bincount(all_ids, weights=values, minlength=ngroups)).astype(np.int64)
+
+    result = key_frame.copy()
+    for col, how in spec.items():
+        if how == 'size':
+            result[col] = total('size')
+            continue
+        if col in parts[0]['int_sum']:
+            result[col] = total('int_sum', col)
+            continue
+        # Shards arrive in row order and each lists its blocks in order
+        sums = fold_blocks(np.concatenate([part['float_sum'][col][0] for part in parts]),
+                           np.concatenate([part_ids[part['float_sum'][col][1]] for part, part_ids in zip(parts, ids)]),
+                           np.concatenate([part['float_sum'][col][2] for part in parts]), ngroups)
+        if how == 'sum':
+            result[col] = sums
+        else:
+            counts = total('count', col)
+            out = np.full(ngroups, np.nan)
+            np.divide(sums, counts, out=out, where=counts > 0)
+            result[col] = out
+    return finish_summary(name, result)
+
+
+def merge_partials(shards, names, codes):
+    """Combine per-shard partials (in row order) into final tables."""
+    tables = {}
+    for name in names:
+        parts = [shard[name] for shard in shards]
+        if name == TURNOVER:
+            # Each shard is sorted already; a stable sort of the concatenation
+            # gives the single-process order, ties included
+            tables[name] = pd.concat(parts).sort_values(by=['Product_type', 'Inventory_Turnover_Ratio'],
+                                                        ascending=[True, False], kind='stable')
+        else:
+            tables[name] = _merge_table(name, parts, codes)
+    return tables
+
+
+# --- Backends ---
+
+class SerialBackend:
+    """Runs shards one after another in this process."""
+
+    workers = 1
+
+    def map(self, fn, items):
+        return [fn(item) for item in items]
+
+
+def _fork_context():
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('fork' if 'fork' in methods else None)
+
+
+class ProcessBackend:
+    """Local worker processes. The pool is kept until ``close()`` so repeated calls reuse it."""
+
+    def __init__(self, workers=None):
+        self.workers = workers or os.cpu_count() or 1
+        self._pool = None
+        self._frame = None
+        self._codes = {}
+
+    def pool(self, frame, codes):
+        """Workers holding ``frame`` and ``codes``; reused while both still cover the request."""
+        if self._pool is None or self._frame is not frame or not codes.keys() <= self._codes.keys():
+            codes = {**self._codes, **codes} if self._frame is frame else codes
+            self.close()
+            self._pool = ProcessPoolExecutor(self.workers, mp_context=_fork_context(),
+                                             initializer=_share_frame, initargs=(frame, codes))
+            self._frame, self._codes = frame, codes
+        return self._pool
+
+    def map(self, fn, items):
+        # Any open pool will do: tasks carry their own data
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(self.workers, mp_context=_fork_context())
+        return list(self._pool.map(fn, items))
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool, self._frame, self._codes = None, None, {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class DaskBackend:
+    """Shards as Dask tasks, on ``client`` if given, else the local process scheduler."""
+
+    def __init__(self, client=None, workers=None):
+        self.client = client
+        self.workers = workers or os.cpu_count() or 1
+
+    def map(self, fn, items):
+        if self.client is not None:
+            return self.client.gather(self.client.map(fn, items, pure=False))
+        import dask
+
+        tasks = [dask.delayed(fn)(item) for item in items]
+        return list(dask.compute(*tasks, scheduler='processes', num_workers=self.workers))
+
+
+class RayBackend:
+    """Shards as Ray tasks; starts a local Ray instance if none is running."""
+
+    def __init__(self, workers=None, **init_options):
+        self.workers = workers or os.cpu_count() or 1
+        self.init_options = init_options
+
+    def map(self, fn, items):
+        import ray
+
+        if not ray.is_initialized():
+            ray.init(num_cpus=self.workers, **self.init_options)
+        remote = ray.remote(fn)
+        return ray.get([remote.remote(item) for item in items])
+
+
+BACKENDS = {'serial': SerialBackend, 'processes': ProcessBackend, 'dask': DaskBackend, 'ray': RayBackend}
+
+
+def resolve_backend(backend=None, workers=None):
+    if backend is None:
+        backend = 'serial' if workers == 1 else 'processes'
+    if isinstance(backend, str):
+        if backend not in BACKENDS:
+            raise ValueError(f"unknown backend {backend!r}; expected one of {sorted(BACKENDS)}")
+        return SerialBackend() if backend == 'serial' else BACKENDS[backend](workers=workers)
+    if not hasattr(backend, 'map'):
+        raise TypeError(f"backend must have a map(fn, items) method, got {type(backend).__name__}")
+    return backend
+
+
+def partitioned_summaries(df, names=None, backend=None, workers=None, shards=None, agg=None):
+    """Summary tables (``SUMMARIES`` plus inventory turnover by default) over row shards.
+
+    ``shards`` defaults to the backend's worker count; ``agg`` is an optional
+    ``Aggregator`` over ``df`` whose key codes are reused. The tables equal the
+    single-process ``Aggregator`` ones exactly.
+    """
+    names = list(names or SUMMARIES + [TURNOVER])
+    backend = resolve_backend(backend, workers)
+    bounds = shard_bounds(len(df), shards or getattr(backend, 'workers', None) or os.cpu_count() or 1)
+    # Factorize the key columns once over the whole frame (cheap for the
+    # categorical columns load_dataset returns); shards group by these codes
+    whole = agg if agg is not None else Aggregator(df)
+    codes = {col: whole.codes(col) for col in key_columns(names)}
+
+    if isinstance(backend, ProcessBackend):
+        # Forked workers inherit the frame and codes; tasks are just row ranges
+        pool = backend.pool(df, codes)
+        results = list(pool.map(_range_partials, [(lo, hi, names) for lo, hi in bounds]))
+    else:
+        frame = df[required_columns(names)]
+        tasks = [(frame.iloc[lo:hi], names, _slice_codes(codes, lo, hi), lo // BLOCK_ROWS) for lo, hi in bounds]
+        results = list(backend.map(_frame_partials, tasks))
+    return merge_partials(results, names, codes)
+
+
+class PartitionedAggregator:
+    """The ``Aggregator`` summary methods, computed on a partitioned backend.
+
+    Tables are computed on first request and memoized.
+    """
+
+    def __init__(self, df, backend=None, workers=None, shards=None):
+        self.df = df
+        self.backend = resolve_backend(backend, workers)
+        self.shards = shards
+        self.whole = Aggregator(df)  # key codes, shared by every pass
+        self._tables = {}
+
+    def prefetch(self, names):
+        """Compute several tables in one pass over the shards."""
+        missing = [name for name in names if name not in self._tables]
+        if missing:
+            self._tables.update(partitioned_summaries(self.df, missing, self.backend, shards=self.shards,
+                                                      agg=self.whole))
+
+    def summary(self, name):
+        self.prefetch([name])
+        return self._tables[name]
+
+    def inventory_turnover(self):
+        return self.summary(TURNOVER)
+
+    def __getattr__(self, name):
+        # product_summary(), supplier_summary(), ... like Aggregator
+        if name in SPECS:
+            return lambda: self.summary(name)
+        raise AttributeError(name)
+
+
+def check_equal(expected, actual):
+    """Raise if any table differs from the single-process result."""
+    for name, table in expected.items():
+        pd.testing.assert_frame_equal(actual[name], table, check_exact=True)
+
+
+def main():
+    from sca.store import load_dataset
+
+    parser = argparse.ArgumentParser(description='Compute the SCA summaries over row shards in parallel.')
+    parser.add_argument('path', nargs='?', default='data/SCA.csv')
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default=None)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--shards', type=int, default=None)
+    parser.add_argument('--check', action='store_true', help='compare with the single-process tables')
+    args = parser.parse_args()
+
+    df = load_dataset(args.path)
+    backend = resolve_backend(args.backend, args.workers)
+    start = time.perf_counter()
+    tables = partitioned_summaries(df, backend=backend, shards=args.shards)
+    print(f"{len(tables)} tables over {len(df):,} rows in {time.perf_counter() - start:.3f}s "
+          f"({type(backend).__name__}, {backend.workers} workers)")
+    if isinstance(backend, ProcessBackend):
+        backend.close()
+    if args.check:
+        expected = summaries(df)
+        expected[TURNOVER] = inventory_turnover(df)
+        check_equal(expected, tables)
+        print('identical to the single-process tables')
+
+
+if __name__ == '__main__':
+    main()
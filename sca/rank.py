@@ -0,0 +1,89 @@
+"""Top-k / bottom-k rows by any metric, overall or within groups.
+
+Sorting every SKU to keep a handful is O(n log n). ``select_k`` finds the k
+best positions with ``np.argpartition`` in O(n) and only sorts those k.
+Grouped rankings bucket the rows by group code once (a stable integer sort)
+and select within each bucket.
+
+Missing metric values are never ranked. Ties are broken by row order, the
+earlier row ranking first, so results are deterministic.
+
+    top_k(df, 'Revenue_generated', 10)
+    top_k(df, 'Inventory_Turnover_Ratio', 5, by='Product_type')
+    bottom_k(df, 'Defect_rates', 3, by='Supplier_name')
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def select_k(values, k, largest=True):
+    """Positions of the ``k`` largest (or smallest) non-NaN values, best first."""
+    values = np.asarray(values, dtype=np.float64)
+    valid = np.flatnonzero(~np.isnan(values))
+    scores = values[valid] if not largest else -values[valid]
+    if k <= 0 or len(valid) == 0:
+        return np.empty(0, dtype=np.int64)
+    if k < len(valid):
+        # Everything strictly better than the k-th score is in; fill the rest
+        # of the k slots with the earliest rows tied at the k-th score
+        kth = scores[np.argpartition(scores, k - 1)[k - 1]]
+        better = np.flatnonzero(scores < kth)
+        tied = np.flatnonzero(scores == kth)[:k - len(better)]
+        picked = np.concatenate([better, tied])
+    else:
+        picked = np.arange(len(valid))
+    # lexsort keys go last-to-first: score, then position
+    return valid[picked[np.lexsort((picked, scores[picked]))]]
+
+
+def group_codes(df, by):
+    """Integer group code per row (-1 for missing keys) and the number of groups, keys sorted."""
+    codes = df.groupby(by, sort=True, observed=True, dropna=True).ngroup()
+    codes = codes.fillna(-1).to_numpy(dtype=np.int64)
+    return codes, int(codes.max()) + 1 if len(codes) else 0
+
+
+def select_k_grouped(values, codes, ngroups, k, largest=True):
+    """``select_k`` within each group; groups in code order, rows best first."""
+    values = np.asarray(values, dtype=np.float64)
+    keep = np.flatnonzero(codes >= 0)
+    dtype = np.int16 if ngroups < (1 << 15) else np.int64
+    # Stable sort of small integer codes is a radix sort: rows bucketed by group in O(n)
+    order = keep[np.argsort(codes[keep].astype(dtype), kind='stable')]
+    bounds = np.concatenate([[0], np.cumsum(np.bincount(codes[keep], minlength=ngroups))])
+    picks = []
+    for lo, hi in zip(bounds[:-1], bounds[1:]):
+        rows = order[lo:hi]
+        picks.append(rows[select_k(values[rows], k, largest)])
+    return np.concatenate(picks) if picks else np.empty(0, dtype=np.int64)
+
+
+def top_k(df, col, k=3, by=None, largest=True, columns=None):
+    """The ``k`` rows of ``df`` with the largest ``col`` (smallest with ``largest=False``).
+
+    With ``by`` (a column name or list) the ``k`` best rows of each group are
+    returned, groups in sorted key order. ``columns`` limits the output
+    columns; the original index is kept.
+    """
+    values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+    if by is None:
+        positions = select_k(values, k, largest)
+    else:
+        codes, ngroups = group_codes(df, by)
+        positions = select_k_grouped(values, codes, ngroups, k, largest)
+    out = df.iloc[positions]
+    return out if columns is None else out[list(columns)]
+
+
+def bottom_k(df, col, k=3, by=None, columns=None):
+    return top_k(df, col, k, by, largest=False, columns=columns)
+
+
+def extremes(df, col, k=3, columns=None):
+    """Top ``k`` then bottom ``k`` rows, both in descending order of ``col``.
+
+    Same layout as ``sort_values(col, ascending=False)`` followed by
+    ``head(k)`` and ``tail(k)``, without sorting every row.
+    """
+    return pd.concat([top_k(df, col, k, columns=columns), bottom_k(df, col, k, columns=columns).iloc[::-1]])
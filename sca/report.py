@@ -0,0 +1,172 @@
+"""Build and export every SCA.py figure across a process pool.
+
+The summary tables are computed once in the parent process. Each figure then
+depends only on its own small table, so building it (the px call plus styling)
+and writing it out run as independent tasks on a ``ProcessPoolExecutor``. The
+output directory gets one HTML or JSON file per figure, an optional combined
+``report.html``, and ``timings.json`` with per-figure build and write times.
+
+    python -m sca.report --out report --workers 8 --combined
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from sca.analysis import Analysis
+from sca.decimate import POINT_BUDGET
+from sca.figures import FIGURES, build
+from sca.results import ResultCache, file_fingerprint, frame_fingerprint
+from sca.store import load_dataset
+from sca.trace import span, traced
+
+FORMATS = ('html', 'json')
+
+
+# --- Tables ---
+
+@traced('report.tables')
+def compute_tables(df, budget=POINT_BUDGET, names=None, cache=None, fingerprint=None):
+    """Every table the figures ``names`` (all by default) plot, already within ``budget`` points."""
+    analysis = Analysis(df, budget, cache, fingerprint)
+    needed = dict.fromkeys(table for name in (names or FIGURES) for table in FIGURES[name][1])
+    return analysis.tables(list(needed))
+
+
+# --- Figures ---
+
+def _warm_up():
+    # The first px call in a process loads plotly's validators and templates;
+    # pay that once per worker instead of inside the first figure's timing
+    import plotly.express as px
+
+    px.scatter(x=[0], y=[0]).to_json()
+
+
+def _export(fig, fmt, fragment):
+    return {
+        'file': fig.to_html(include_plotlyjs='cdn') if fmt == 'html' else fig.to_json(),
+        'html': fig.to_html(full_html=False, include_plotlyjs=False) if fragment else None,
+    }
+
+
+def render(name, tables, out_dir, fmt='html', fragment=False, cache=None, key=None):
+    """Build one figure and write it to ``out_dir``; returns its timing record.
+
+    With ``fragment`` the record also carries the figure as an HTML ``<div>``
+    for the combined report. With a ``cache`` the rendered output is stored
+    under ``key`` and a repeat run only copies it out.
+    """
+    start = time.perf_counter()
+    rendered = cache.get(key) if cache is not None else None
+    cached = rendered is not None and (rendered['html'] is not None or not fragment)
+    if not cached:
+        fig = build(name, tables)
+    built = time.perf_counter()
+    if not cached:
+        with span('report.export', figure=name, format=fmt):
+            rendered = _export(fig, fmt, fragment)
+        if cache is not None:
+            cache.put(key, rendered)
+
+    path = os.path.join(out_dir, f'{name}.{fmt}')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(rendered['file'])
+    record = {
+        'figure': name,
+        'file': os.path.basename(path),
+        'cached': cached,
+        'build_s': built - start,
+        'write_s': time.perf_counter() - built,
+        'bytes': os.path.getsize(path),
+        'pid': os.getpid(),
+    }
+    if fragment:
+        record['html'] = rendered['html']
+    return record
+
+
+@traced('report.combined')
+def write_combined(fragments, path):
+    """One page holding every figure, loading plotly.js once."""
+    from plotly.offline import get_plotlyjs_version
+
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('<html>\n<head><meta charset="utf-8" />\n'
+                f'<script src="https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"></script>\n'
+                '<title>Supply Chain Analysis</title>\n</head>\n<body>\n')
+        for fragment in fragments:
+            f.write(fragment)
+            f.write('\n')
+        f.write('</body>\n</html>\n')
+    return os.path.getsize(path)
+
+
+def build_report(df, out_dir, workers=None, fmt='html', combined=False, names=None, budget=POINT_BUDGET,
+                 cache=None, fingerprint=None):
+    """Compute the tables once, then build and write the figures on ``workers`` processes.
+
+    ``workers=1`` renders in this process. With a ``ResultCache`` tables and
+    rendered figures are reused across runs over the same data
+    (``fingerprint``, by default a hash of ``df``). Returns the timings, also
+    written to ``out_dir/timings.json``.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"fmt must be one of {FORMATS}, got {fmt!r}")
+    names = list(names or FIGURES)
+    os.makedirs(out_dir, exist_ok=True)
+    start = time.perf_counter()
+    if cache is not None and fingerprint is None:
+        fingerprint = frame_fingerprint(df)
+    tables = compute_tables(df, budget, names, cache, fingerprint)
+    tables_s = time.perf_counter() - start
+
+    # Ship each task only the tables its figure reads
+    tasks = []
+    for name in names:
+        key = cache.key(fingerprint, 'report', name, {'format': fmt, 'budget': budget}) if cache else None
+        tasks.append((name, {table: tables[table] for table in FIGURES[name][1]}, out_dir, fmt, combined, cache, key))
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        records = [render(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks)), initializer=_warm_up) as pool:
+            futures = [pool.submit(render, *task) for task in tasks]
+            records = [future.result() for future in futures]
+
+    timings = {'rows': len(df), 'workers': workers, 'format': fmt, 'tables_s': tables_s}
+    if combined:
+        timings['combined_bytes'] = write_combined([record.pop('html') for record in records],
+                                                   os.path.join(out_dir, 'report.html'))
+    timings['total_s'] = time.perf_counter() - start
+    timings['figures'] = records
+    with open(os.path.join(out_dir, 'timings.json'), 'w', encoding='utf-8') as f:
+        json.dump(timings, f, indent=2)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--source', default='data/SCA.csv')
+    parser.add_argument('--out', default='report')
+    parser.add_argument('--workers', type=int, default=None, help='processes (default: all cores)')
+    parser.add_argument('--format', choices=FORMATS, default='html')
+    parser.add_argument('--combined', action='store_true', help='also write report.html with every figure')
+    parser.add_argument('--figure', action='append', choices=sorted(FIGURES), help='only these figures')
+    parser.add_argument('--no-cache', action='store_true', help='recompute instead of reusing data/SCA.results/')
+    args = parser.parse_args()
+
+    cache = None if args.no_cache else ResultCache.for_source(args.source)
+    fingerprint = None if args.no_cache else file_fingerprint(args.source)
+    timings = build_report(load_dataset(args.source), args.out, args.workers, args.format, args.combined,
+                           args.figure, cache=cache, fingerprint=fingerprint)
+    for record in timings['figures']:
+        print(f"{record['figure']:<28} build {record['build_s']:7.3f}s  write {record['write_s']:7.3f}s  "
+              f"{record['bytes'] / 1024:9,.0f} KB{'  (cached)' if record['cached'] else ''}")
+    print(f"tables {timings['tables_s']:.3f}s, total {timings['total_s']:.3f}s on {timings['workers']} workers")
+
+
+if __name__ == '__main__':
+    main()
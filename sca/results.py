@@ -0,0 +1,163 @@
+"""Content-addressed on-disk cache for summary tables and rendered figures.
+
+Every entry is keyed on a fingerprint of the input data, the name and
+parameters of the computation, and the source of the ``sca`` package, so a
+changed data/SCA.csv, different parameters or edited code all miss instead of
+returning stale results. Entries are single pickle files under the cache
+directory. Reading one refreshes its modification time, and when the
+directory grows past ``max_bytes`` the least recently used entries are
+deleted.
+
+    cache = ResultCache.for_source('data/SCA.csv')
+    key = cache.key(file_fingerprint('data/SCA.csv'), 'table', 'supplier_summary')
+    summary = cache.get_or_compute(key, lambda: Aggregator(df).supplier_summary())
+"""
+
+import glob
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+
+RESULTS_VERSION = 1
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+ENTRY_SUFFIX = '.pkl'
+
+_MISSING = object()
+_code_fingerprint = None
+
+
+# --- Fingerprints ---
+
+def _digest(*parts):
+    blob = json.dumps(parts, sort_keys=True, default=str, separators=(',', ':'))
+    return hashlib.sha256(blob.encode('utf-8')).hexdigest()
+
+
+def file_fingerprint(path):
+    """Fingerprint of a source file from its size and modification time, like ``store.is_fresh``."""
+    st = os.stat(path)
+    return _digest('file', os.path.abspath(path), st.st_size, st.st_mtime_ns)
+
+
+def frame_fingerprint(df):
+    """Fingerprint of a DataFrame's contents (values, index, column names and dtypes)."""
+    import pandas as pd
+
+    h = hashlib.sha256(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    h.update(_digest(list(map(str, df.columns)), list(map(str, df.dtypes))).encode('ascii'))
+    return h.hexdigest()
+
+
+def code_fingerprint():
+    """Hash of the ``sca`` sources, so editing a computation invalidates its entries."""
+    global _code_fingerprint
+    if _code_fingerprint is None:
+        root = os.path.dirname(os.path.abspath(__file__))
+        h = hashlib.sha256()
+        for path in sorted(glob.glob(os.path.join(root, '*.py')) + glob.glob(os.path.join(root, 'templates', '*'))):
+            h.update(os.path.relpath(path, root).encode('utf-8'))
+            with open(path, 'rb') as f:
+                h.update(f.read())
+        _code_fingerprint = h.hexdigest()
+    return _code_fingerprint
+
+
+def results_dir_for(path):
+    """Default cache location: ``data/SCA.csv`` -> ``data/SCA.results/``."""
+    root, _ = os.path.splitext(path)
+    return root + '.results'
+
+
+# --- Cache ---
+
+class ResultCache:
+    """Size-bounded LRU cache of pickled results in ``cache_dir``."""
+
+    def __init__(self, cache_dir, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def for_source(cls, path, **options):
+        return cls(results_dir_for(path), **options)
+
+    def key(self, fingerprint, kind, name, params=None):
+        """Cache key of computation ``kind``/``name`` with ``params`` over data ``fingerprint``."""
+        return _digest(RESULTS_VERSION, code_fingerprint(), fingerprint, kind, name, params or {})
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + ENTRY_SUFFIX)
+
+    def get(self, key, default=None):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            self.misses += 1
+            return default
+        # The modification time doubles as the last-used time for eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix='.tmp-', dir=self.cache_dir)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        self.evict()
+        return value
+
+    def get_or_compute(self, key, compute):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = self.put(key, compute())
+        return value
+
+    def entries(self):
+        """``(path, size, last_used)`` of every entry, least recently used first."""
+        entries = []
+        for path in glob.glob(os.path.join(self.cache_dir, '*' + ENTRY_SUFFIX)):
+            try:
+                st = os.stat(path)
+            except OSError:  # removed by a concurrent eviction
+                continue
+            entries.append((path, st.st_size, st.st_mtime_ns))
+        return sorted(entries, key=lambda entry: entry[2])
+
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self, max_bytes=None):
+        """Delete least recently used entries until the cache fits in ``max_bytes``."""
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for path, size, _ in entries:
+            if total <= limit:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self):
+        return self.evict(0)
@@ -0,0 +1,204 @@
+"""Cheapest feasible carrier / transportation mode / route for every SKU.
+
+The Shipping and Cost sections report what each carrier and mode costs today.
+This module asks what each SKU would cost on another (carrier, mode, route)
+option. The options and their statistics come from the data: every
+combination observed at least ``min_count`` times, with its mean
+Shipping_costs, Costs and Shipping_times (one cube roll-up).
+
+A SKU's cost on an option scales its own costs by the ratio of the option's
+means to the means of the SKU's current option, so SKU-specific factors
+(weight, distance) carry over:
+
+    cost(sku, o) = Shipping_costs x ship_mean[o] / ship_mean[current]
+                 + Costs x cost_mean[o] / cost_mean[current]
+
+Constraints mark options infeasible per SKU: allowed carriers, modes and
+routes; ``max_days`` on the option's mean shipping time; and ``max_delay``, the
+days an option may add over the SKU's current Shipping_times. Options don't
+share capacity, so the assignment separates per SKU: the optimum is a
+row-wise argmin over a (SKUs x options) cost matrix with infeasible cells set
+to inf. It is evaluated in row chunks, so memory stays flat at any SKU count.
+
+A SKU only moves when an option other than its current one is cheaper by more
+than ``SAVINGS_RTOL`` of its current cost, so rounding in the rescaled costs
+never reports a move to the same option. Otherwise the SKU keeps its current
+option, even when that option breaks the allowlists or ``max_days``: savings
+are never negative, and ``current_feasible`` in the plan (and ``infeasible``
+in ``savings_total``) marks the SKUs left on such an option.
+
+    plan = optimize_routes(df)
+    route_savings(plan)
+    savings_total(plan)
+"""
+
+import numpy as np
+import pandas as pd
+
+from sca.trace import traced
+
+OPTION_KEYS = ['Shipping_carriers', 'Transportation_modes', 'Routes']
+OPTION_METRICS = ['Shipping_costs', 'Costs', 'Shipping_times']
+MIN_COUNT = 2               # options observed fewer times are too noisy to recommend
+MAX_DELAY = 0.0             # by default an option may not be slower than the SKU's current shipping time
+CHUNK_ROWS = 1 << 16
+SAVINGS_RTOL = 1e-9         # smaller relative savings are rounding, not a cheaper option
+
+
+def option_stats(df, cube=None, min_count=MIN_COUNT):
+    """Observed options: one row per (carrier, mode, route) with its SKU count and metric means.
+
+    ``cube`` is an ``sca.cube.Cube`` over ``df`` with the option keys as
+    dimensions and metrics; without one, a small cube over just those is built.
+    """
+    if cube is None:
+        from sca.cube import Cube
+
+        cube = Cube.build(df, dims=OPTION_KEYS, metrics=OPTION_METRICS)
+    spec = {'SKUs': 'size'}
+    spec.update({col: 'mean' for col in OPTION_METRICS})
+    stats = cube.agg(OPTION_KEYS, spec)
+    return stats[stats['SKUs'] >= min_count].reset_index(drop=True)
+
+
+def _key_codes(df):
+    # Per option key: its sorted levels and each row's code in them
+    codes = []
+    for key in OPTION_KEYS:
+        row_codes, levels = pd.factorize(df[key], sort=True)
+        codes.append((pd.Index(levels), row_codes))
+    return codes
+
+
+def _option_codes(key_codes, options):
+    # Per option key: each option's code in the levels of ``_key_codes``
+    return [levels.get_indexer(options[key]) for (levels, _), key in zip(key_codes, OPTION_KEYS)]
+
+
+def _option_index(key_codes, options):
+    # Position of each row's current option among ``options``, -1 if it is not one of them
+    sizes = [len(levels) for levels, _ in key_codes]
+    cell = np.zeros(len(key_codes[0][1]), dtype=np.int64)
+    option_cell = np.zeros(len(options), dtype=np.int64)
+    valid = np.ones(len(cell), dtype=bool)
+    for (_, row_codes), option_codes, size in zip(key_codes, _option_codes(key_codes, options), sizes):
+        valid &= row_codes >= 0
+        cell = cell * size + row_codes
+        option_cell = option_cell * size + option_codes
+    lookup = np.full(int(np.prod(sizes, dtype=np.int64)), -1, dtype=np.int64)
+    lookup[option_cell] = np.arange(len(options))
+    return np.where(valid, lookup[np.where(valid, cell, 0)], -1)
+
+
+def _allowed(values, allowed):
+    return np.ones(len(values), dtype=bool) if allowed is None else np.isin(values, list(allowed))
+
+
+@traced('routing.optimize_routes')
+def optimize_routes(df, cube=None, min_count=MIN_COUNT, max_days=None, max_delay=MAX_DELAY,
+                    carriers=None, modes=None, routes=None, chunk_rows=CHUNK_ROWS):
+    """Per-SKU current and cheapest feasible option, with the cost and shipping time of each.
+
+    ``max_delay=None`` drops the per-SKU shipping-time constraint. ``carriers``,
+    ``modes`` and ``routes`` restrict the options that may be recommended.
+    SKUs with no cheaper feasible option keep their current one;
+    ``current_feasible`` is False where that option itself breaks the
+    allowlists or ``max_days``.
+    """
+    all_options = option_stats(df, cube, min_count=1)
+    options = all_options[all_options['SKUs'] >= min_count].reset_index(drop=True)
+    ship_mean = options['Shipping_costs'].to_numpy(dtype=np.float64)
+    cost_mean = options['Costs'].to_numpy(dtype=np.float64)
+    days_mean = options['Shipping_times'].to_numpy(dtype=np.float64)
+
+    # Option-level constraints, shared by every SKU
+    usable = (_allowed(options['Shipping_carriers'].astype(str), carriers)
+              & _allowed(options['Transportation_modes'].astype(str), modes)
+              & _allowed(options['Routes'].astype(str), routes))
+    if max_days is not None:
+        usable &= days_mean <= max_days
+
+    # Each SKU's own costs relative to its current option's means
+    key_codes = _key_codes(df)
+    current = _option_index(key_codes, all_options)
+    # The current option among the recommendable ones, masked out of each SKU's candidates
+    current_option = _option_index(key_codes, options)
+    current_ship = all_options['Shipping_costs'].to_numpy(dtype=np.float64)[current]
+    current_cost = all_options['Costs'].to_numpy(dtype=np.float64)[current]
+    shipping = df['Shipping_costs'].to_numpy(dtype=np.float64, na_value=np.nan)
+    costs = df['Costs'].to_numpy(dtype=np.float64, na_value=np.nan)
+    days = df['Shipping_times'].to_numpy(dtype=np.float64, na_value=np.nan)
+    ship_scale = np.divide(shipping, current_ship, out=np.zeros(len(df)), where=(current >= 0) & (current_ship > 0))
+    cost_scale = np.divide(costs, current_cost, out=np.zeros(len(df)), where=(current >= 0) & (current_cost > 0))
+    now = shipping + costs
+    threshold = now - SAVINGS_RTOL * np.abs(now)
+
+    best = np.full(len(df), -1, dtype=np.int64)
+    best_cost = now.copy()
+    for start in range(0, len(df), chunk_rows):
+        rows = slice(start, start + chunk_rows)
+        matrix = np.multiply.outer(ship_scale[rows], ship_mean)
+        matrix += np.multiply.outer(cost_scale[rows], cost_mean)
+        feasible = np.broadcast_to(usable, matrix.shape)
+        if max_delay is not None:
+            feasible = feasible & (days_mean[None, :] <= days[rows, None] + max_delay)
+        # Rows whose current option is unknown can't be rescaled, so they keep it
+        feasible = feasible & (current[rows, None] >= 0)
+        matrix[~feasible] = np.inf
+        own = current_option[rows]
+        listed = np.flatnonzero(own >= 0)
+        matrix[listed, own[listed]] = np.inf
+        choice = matrix.argmin(axis=1)
+        cheapest = matrix[np.arange(len(choice)), choice]
+        better = cheapest < threshold[rows]
+        best[rows] = np.where(better, choice, -1)
+        best_cost[rows] = np.where(better, cheapest, best_cost[rows])
+
+    moved = best >= 0
+    # Whether each SKU's current option passes the option-level constraints itself
+    current_days = np.where(current >= 0, all_options['Shipping_times'].to_numpy(dtype=np.float64)[current], days)
+    current_feasible = np.ones(len(df), dtype=bool)
+    for key, allowed in zip(OPTION_KEYS, [carriers, modes, routes]):
+        if allowed is not None:
+            current_feasible &= _allowed(df[key].astype(str), allowed)
+    if max_days is not None:
+        current_feasible &= current_days <= max_days
+
+    plan = df[['SKU'] + OPTION_KEYS].copy()
+    plan['current_cost'] = now
+    plan['current_days'] = days
+    plan['current_feasible'] = current_feasible
+    # Recommended option as categoricals over the levels of the current one
+    for (levels, row_codes), option_codes, name in zip(key_codes, _option_codes(key_codes, options),
+                                                       ['best_carrier', 'best_mode', 'best_route']):
+        codes = np.where(moved, option_codes[np.maximum(best, 0)] if len(option_codes) else -1, row_codes)
+        plan[name] = pd.Categorical.from_codes(codes, dtype=pd.CategoricalDtype(levels))
+    plan['best_cost'] = best_cost
+    plan['best_days'] = np.where(moved, days_mean[np.maximum(best, 0)] if len(days_mean) else np.nan, days)
+    plan['savings'] = now - best_cost
+    return plan
+
+
+def route_savings(plan):
+    """Moves from each current option to its recommended one, largest total savings first."""
+    moves = plan[plan['savings'] > 0]
+    keys = OPTION_KEYS + ['best_carrier', 'best_mode', 'best_route']
+    summary = moves.groupby(keys, observed=True).agg(
+        SKUs=('SKU', 'size'), current_cost=('current_cost', 'sum'), best_cost=('best_cost', 'sum'),
+        savings=('savings', 'sum')).reset_index()
+    return summary.sort_values('savings', ascending=False, kind='stable').reset_index(drop=True)
+
+
+def savings_total(plan):
+    """Current and optimized total cost, the savings, how many SKUs move and how many
+    are left on an option that breaks the constraints."""
+    current, best = plan['current_cost'].sum(), plan['best_cost'].sum()
+    return {
+        'SKUs': len(plan),
+        'moved': int((plan['savings'] > 0).sum()),
+        'infeasible': int((~plan['current_feasible'] & (plan['savings'] <= 0)).sum()),
+        'current_cost': float(current),
+        'best_cost': float(best),
+        'savings': float(current - best),
+        'savings_pct': float(100 * (current - best) / current) if current else 0.0,
+    }
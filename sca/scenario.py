@@ -0,0 +1,359 @@
+"""Vectorized what-if scenarios over every SKU at once.
+
+A scenario changes some of the planning levers: price, demand, order
+quantities, lead time, shipping carrier or transportation mode. ``ScenarioEngine``
+evaluates a whole batch of them as NumPy broadcasts over a
+(scenarios x SKUs) array. Each scenario is a row of parameters; each SKU is
+a column of base values from the cleaned dataset. For every pair it
+recomputes units, revenue, shipping, transport and manufacturing cost,
+stock, inventory turnover (``units / stock``, as in SCA.py),
+Stock_Availability_Diff and stockout risk. Scenarios are processed in chunks
+sized to ``max_bytes``, so sweeps of thousands of scenarios over millions of
+SKUs stay within memory. Every chunk is written into the same preallocated
+buffers, so the sweep does not pay to allocate and page in fresh arrays per
+chunk. ``run`` keeps only per-scenario totals, and ``iter_chunks`` yields the
+full per-SKU arrays chunk by chunk.
+
+Model, per SKU (all factors default to 1, so the neutral scenario reproduces
+the snapshot):
+
+- units = Number_of_products_sold x demand x price ** -elasticity
+- revenue = Revenue_generated x price x units / Number_of_products_sold
+- shipping cost = Shipping_costs x (new carrier's mean / current carrier's mean)
+- transport cost = Costs x (new mode's mean / current mode's mean)
+- manufacturing cost = Manufacturing_costs x manufacturing
+- stock = Stock_levels + Order_quantities x (order_qty - 1)
+- lead time = Lead_times x lead_time + lead_time_shift + shipping days of the carrier
+- stockout risk = P(demand over the lead time > stock), with demand over the
+  lead time ~ Normal(mu, mu) (Poisson approximation) and mu = units / period_days x lead time
+
+    engine = ScenarioEngine(df)
+    grid = scenario_grid(price=[0.9, 1.0, 1.1], carrier=[None, 'Carrier A'], mode=[None, 'Rail'])
+    totals = engine.run(grid)
+
+    python -m sca.scenario --price 0.9 1 1.1 --lead-time 0.5 1 --carrier keep 'Carrier A' --top 10
+"""
+
+import argparse
+import itertools
+import time
+
+import numpy as np
+import pandas as pd
+
+from sca.trace import span
+
+PERIOD_DAYS = 30            # Number_of_products_sold is taken as sales over this many days
+ELASTICITY = 1.0            # default price elasticity of demand
+# Buffer budget per chunk: a few MB keeps the in-place passes cache-friendly; at least one
+# scenario row is always evaluated, so very wide snapshots go one scenario at a time
+MAX_BYTES = 16 * 1024 * 1024
+RISK_THRESHOLD = 0.5        # SKUs above this stockout risk count as at risk
+
+# Scenario parameters and their neutral values
+PARAMETERS = {
+    'price': 1.0,           # price factor
+    'demand': 1.0,          # demand factor before the price response
+    'elasticity': ELASTICITY,
+    'order_qty': 1.0,       # Order_quantities factor (the change is added to stock)
+    'lead_time': 1.0,       # Lead_times factor
+    'lead_time_shift': 0.0,  # days added to Lead_times
+    'manufacturing': 1.0,   # Manufacturing_costs factor
+    'carrier': None,        # switch every SKU to this Shipping_carriers value
+    'mode': None,           # switch every SKU to this Transportation_modes value
+}
+
+# Factors that must be positive and finite (0 or less would divide by zero or invert the model)
+POSITIVE = ['price', 'demand', 'order_qty', 'lead_time']
+
+# Per-SKU outputs of iter_chunks; every one is a (scenarios x SKUs) array
+OUTPUTS = ['units', 'revenue', 'shipping_cost', 'transport_cost', 'manufacturing_cost', 'total_cost',
+           'stock', 'turnover', 'stock_availability_diff', 'stockout_risk']
+# Scratch (scenarios x SKUs) arrays used while evaluating, on top of the outputs
+_SCRATCH = 3
+
+_SQRT2 = np.sqrt(2.0)
+
+
+def scenario_grid(**axes):
+    """Every combination of the given parameter values, one scenario per row.
+
+    ``scenario_grid(price=[0.9, 1.1], mode=[None, 'Rail'])`` gives 4 scenarios.
+    """
+    unknown = set(axes) - set(PARAMETERS)
+    if unknown:
+        raise ValueError(f"unknown scenario parameters {sorted(unknown)}; expected {list(PARAMETERS)}")
+    names = list(axes)
+    return pd.DataFrame(list(itertools.product(*(axes[name] for name in names))), columns=names)
+
+
+def _normal_sf(z, x, t, poly):
+    """Upper tail of the standard normal at ``z``, written over ``z``.
+
+    erfc comes from the Abramowitz-Stegun 7.1.26 fit (|error| < 1.5e-7).
+    ``x``, ``t`` and ``poly`` are scratch arrays shaped like ``z``.
+    """
+    np.abs(z, out=x)
+    x /= _SQRT2
+    np.multiply(x, 0.3275911, out=t)
+    t += 1.0
+    np.reciprocal(t, out=t)
+    np.multiply(t, 1.061405429, out=poly)
+    for coefficient in (-1.453152027, 1.421413741, -0.284496736, 0.254829592):
+        poly += coefficient
+        poly *= t
+    # Past 26 the tail is below 1e-290; clipping keeps exp out of its slow underflow path
+    np.minimum(x, 26.0, out=x)
+    np.square(x, out=x)
+    np.negative(x, out=x)
+    np.exp(x, out=x)
+    poly *= x
+    poly *= 0.5
+    # poly is now the upper tail of |z|; reflect it for negative z without a masked ufunc
+    np.subtract(0.5, poly, out=poly)
+    np.copysign(poly, z, out=z)
+    np.subtract(0.5, z, out=z)
+    return z
+
+
+class ScenarioEngine:
+    """Per-SKU base arrays of one snapshot, ready to evaluate scenario batches."""
+
+    def __init__(self, df, period_days=PERIOD_DAYS, max_bytes=MAX_BYTES):
+        self.period_days = period_days
+        self.max_bytes = max_bytes
+        self.sku = df['SKU'].to_numpy()
+
+        def column(name):
+            return df[name].to_numpy(dtype=np.float64, na_value=np.nan)
+
+        self.units = column('Number_of_products_sold')
+        self.revenue = column('Revenue_generated')
+        self.stock = column('Stock_levels')
+        self.availability = column('Availability')
+        self.order_qty = column('Order_quantities')
+        self.lead_times = column('Lead_times')
+        self.shipping_costs = column('Shipping_costs')
+        self.transport_costs = column('Costs')
+        self.manufacturing_costs = column('Manufacturing_costs')
+        # Revenue scales with price x units sold; SKUs that sold nothing contribute none
+        self.sold_revenue = np.where(self.units > 0, self.revenue, 0.0)
+        self._ones = np.ones(len(df))
+
+        # Switching carrier or mode rescales each SKU's cost by the ratio of the new group's mean
+        # to its current group's mean. SKUs without a group count as average.
+        self.carriers, self.carrier_codes, (self.carrier_cost, self.carrier_days), (current_cost, self.shipping_days) = \
+            self._group_means(df, 'Shipping_carriers', ['Shipping_costs', 'Shipping_times'])
+        self.modes, self.mode_codes, (self.mode_cost,), (current_mode_cost,) = \
+            self._group_means(df, 'Transportation_modes', ['Costs'])
+        self.shipping_scale = np.divide(self.shipping_costs, current_cost, out=np.zeros(len(df)),
+                                        where=current_cost > 0)
+        self.transport_scale = np.divide(self.transport_costs, current_mode_cost, out=np.zeros(len(df)),
+                                         where=current_mode_cost > 0)
+
+    @staticmethod
+    def _group_means(df, key, columns):
+        # Sorted names, per-row codes, the per-name mean of each column and each row's own group mean
+        codes, uniques = pd.factorize(df[key], sort=True)
+        valid = codes >= 0
+        counts = np.bincount(codes[valid], minlength=len(uniques))
+        means, row_means = [], []
+        for col in columns:
+            values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+            sums = np.bincount(codes[valid], weights=values[valid], minlength=len(uniques))
+            mean = sums / np.maximum(counts, 1)
+            means.append(mean)
+            row_means.append(np.where(valid, mean[codes], np.nanmean(values) if len(values) else np.nan))
+        return [str(value) for value in uniques], codes, means, row_means
+
+    @property
+    def n_skus(self):
+        return len(self.units)
+
+    # --- Scenario parameters ---
+
+    def _lookup(self, names, values, label):
+        # Scenario column of category names -> codes, -1 for "keep the current one"
+        index = {name: i for i, name in enumerate(names)}
+        codes = np.full(len(values), -1, dtype=np.int64)
+        for i, value in enumerate(values):
+            if value is None or (isinstance(value, float) and np.isnan(value)):
+                continue
+            if value not in index:
+                raise ValueError(f"unknown {label} {value!r}; expected one of {names}")
+            codes[i] = index[value]
+        return codes
+
+    def parameters(self, scenarios):
+        """Scenario parameters as arrays (one value per scenario), missing ones at their neutral value.
+
+        Raises ``ValueError`` for unknown parameters, carriers or modes, and
+        for ``POSITIVE`` factors that are not positive and finite.
+        """
+        scenarios = pd.DataFrame(scenarios)
+        unknown = set(scenarios.columns) - set(PARAMETERS)
+        if unknown:
+            raise ValueError(f"unknown scenario parameters {sorted(unknown)}; expected {list(PARAMETERS)}")
+        n = len(scenarios)
+        params = {}
+        for name, neutral in PARAMETERS.items():
+            if name in ('carrier', 'mode'):
+                continue
+            values = scenarios[name].to_numpy(dtype=np.float64) if name in scenarios else np.full(n, neutral)
+            if name in POSITIVE:
+                bad = values[~(np.isfinite(values) & (values > 0))]
+                if len(bad):
+                    raise ValueError(f"{name} factors must be positive and finite, got {sorted(set(bad.tolist()))}")
+            params[name] = values
+        carriers = scenarios['carrier'].tolist() if 'carrier' in scenarios else [None] * n
+        modes = scenarios['mode'].tolist() if 'mode' in scenarios else [None] * n
+        params['carrier'] = self._lookup(self.carriers, carriers, 'carrier')
+        params['mode'] = self._lookup(self.modes, modes, 'mode')
+        return params
+
+    # --- Evaluation ---
+
+    def chunk_size(self):
+        """Scenarios per chunk so the output and scratch (chunk x SKUs) arrays fit in ``max_bytes``."""
+        per_scenario = (len(OUTPUTS) + _SCRATCH) * 8 * max(self.n_skus, 1)
+        return max(1, self.max_bytes // per_scenario)
+
+    def buffers(self, scenarios):
+        """Output and scratch arrays for ``evaluate``, room for ``scenarios`` scenarios."""
+        return {name: np.empty((scenarios, self.n_skus))
+                for name in OUTPUTS + [f'_scratch{i}' for i in range(_SCRATCH)]}
+
+    @staticmethod
+    def _switch(codes, kept, scale, targets, out):
+        # Scenario rows that switch group get ``targets[code] * scale``; rows that keep the
+        # current group (code -1) get ``kept``. An outer product plus row copies, no per-cell gather.
+        np.multiply.outer(targets[np.maximum(codes, 0)], scale, out=out)
+        out[codes < 0] = kept
+        return out
+
+    def evaluate(self, params, out=None):
+        """Per-SKU outputs (see ``OUTPUTS``) for one chunk of scenario parameters.
+
+        Every per-SKU array is an outer product or a gather from a small
+        per-scenario table, computed in place. ``out`` (from ``buffers``) is
+        reused when given; it may hold room for more scenarios than the chunk.
+        """
+        k = len(params['price'])
+        out = self.buffers(k) if out is None else {name: array[:k] for name, array in out.items()}
+        units, stock, risk = out['units'], out['stock'], out['stockout_risk']
+        mu, scratch1, scratch2 = out['_scratch0'], out['_scratch1'], out['_scratch2']
+
+        demand = params['demand'] * params['price'] ** -params['elasticity']
+        np.multiply.outer(demand, self.units, out=units)
+        np.multiply.outer(params['price'] * demand, self.sold_revenue, out=out['revenue'])
+        self._switch(params['carrier'], self.shipping_costs, self.shipping_scale, self.carrier_cost,
+                     out['shipping_cost'])
+        self._switch(params['mode'], self.transport_costs, self.transport_scale, self.mode_cost,
+                     out['transport_cost'])
+        np.multiply.outer(params['manufacturing'], self.manufacturing_costs, out=out['manufacturing_cost'])
+        np.add(out['shipping_cost'], out['transport_cost'], out=out['total_cost'])
+        out['total_cost'] += out['manufacturing_cost']
+
+        np.multiply.outer(params['order_qty'] - 1.0, self.order_qty, out=stock)
+        stock += self.stock
+        with np.errstate(divide='ignore', invalid='ignore'):
+            np.divide(units, stock, out=out['turnover'])
+        np.subtract(stock, self.availability, out=out['stock_availability_diff'])
+
+        # Expected demand over the lead time plus the (possibly new) carrier's shipping days
+        np.multiply.outer(params['lead_time'], self.lead_times, out=mu)
+        mu += params['lead_time_shift'][:, None]
+        np.maximum(mu, 0.0, out=mu)
+        mu += self._switch(params['carrier'], self.shipping_days, self._ones, self.carrier_days, scratch1)
+        mu *= units
+        mu /= self.period_days
+        np.subtract(stock, mu, out=risk)
+        np.sqrt(mu, out=mu)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            risk /= mu
+        # No expected demand: no stockout risk (0/0 -> nan -> +inf)
+        np.nan_to_num(risk, copy=False, nan=np.inf, posinf=np.inf, neginf=-np.inf)
+        _normal_sf(risk, mu, scratch1, scratch2)
+        return {name: out[name] for name in OUTPUTS}
+
+    def iter_chunks(self, scenarios, chunk_size=None):
+        """Yield ``(start, outputs)`` per chunk of scenarios; outputs are (chunk x SKUs) arrays.
+
+        The arrays are reused for the next chunk, so copy anything that must outlive the iteration.
+        """
+        params = self.parameters(scenarios)
+        n = len(params['price'])
+        chunk_size = chunk_size or self.chunk_size()
+        out = self.buffers(min(chunk_size, n))
+        for start in range(0, n, chunk_size):
+            chunk = {name: values[start:start + chunk_size] for name, values in params.items()}
+            with span('scenario.chunk', rows_in=self.n_skus, scenarios=len(chunk['price'])):
+                yield start, self.evaluate(chunk, out)
+
+    def run(self, scenarios, chunk_size=None, risk_threshold=RISK_THRESHOLD):
+        """Per-scenario totals: one row per scenario, its parameters followed by the results."""
+        scenarios = pd.DataFrame(scenarios).reset_index(drop=True)
+        columns = {name: np.empty(len(scenarios)) for name in (
+            'units', 'revenue', 'shipping_cost', 'transport_cost', 'manufacturing_cost', 'total_cost', 'margin',
+            'mean_turnover', 'expected_stockouts', 'skus_at_risk')}
+        for start, out in self.iter_chunks(scenarios, chunk_size):
+            rows = slice(start, start + len(out['units']))
+            for name in ('units', 'revenue', 'shipping_cost', 'transport_cost', 'manufacturing_cost', 'total_cost'):
+                columns[name][rows] = out[name].sum(axis=1)
+            columns['margin'][rows] = columns['revenue'][rows] - columns['total_cost'][rows]
+            finite = np.isfinite(out['turnover'])
+            np.copyto(out['turnover'], 0.0, where=~finite)
+            with np.errstate(invalid='ignore'):
+                columns['mean_turnover'][rows] = out['turnover'].sum(axis=1) / finite.sum(axis=1)
+            columns['expected_stockouts'][rows] = out['stockout_risk'].sum(axis=1)
+            columns['skus_at_risk'][rows] = (out['stockout_risk'] > risk_threshold).sum(axis=1)
+        result = pd.concat([scenarios, pd.DataFrame(columns)], axis=1)
+        result['skus_at_risk'] = result['skus_at_risk'].astype(np.int64)
+        return result
+
+    def per_sku(self, scenario, **overrides):
+        """One scenario's per-SKU outputs as a DataFrame indexed like the SKUs."""
+        params = dict(scenario or {}, **overrides)
+        out = self.evaluate(self.parameters(pd.DataFrame([params]) if params else pd.DataFrame(index=[0])))
+        frame = pd.DataFrame({name: values[0] for name, values in out.items()})
+        frame.insert(0, 'SKU', self.sku)
+        return frame
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sweep a grid of what-if scenarios over the cleaned dataset.')
+    parser.add_argument('--data', default='data/SCA.csv')
+    parser.add_argument('--price', type=float, nargs='+', default=[1.0])
+    parser.add_argument('--demand', type=float, nargs='+', default=[1.0])
+    parser.add_argument('--elasticity', type=float, nargs='+', default=[ELASTICITY])
+    parser.add_argument('--order-qty', type=float, nargs='+', default=[1.0])
+    parser.add_argument('--lead-time', type=float, nargs='+', default=[1.0])
+    parser.add_argument('--lead-time-shift', type=float, nargs='+', default=[0.0])
+    parser.add_argument('--manufacturing', type=float, nargs='+', default=[1.0])
+    parser.add_argument('--carrier', nargs='+', default=['keep'], help="carrier names, 'keep' for no change")
+    parser.add_argument('--mode', nargs='+', default=['keep'], help="transportation modes, 'keep' for no change")
+    parser.add_argument('--period-days', type=float, default=PERIOD_DAYS)
+    parser.add_argument('--top', type=int, default=20, help='scenarios to print, by margin')
+    parser.add_argument('--out', help='write every scenario\'s totals to this CSV')
+    args = parser.parse_args()
+
+    from sca.store import load_dataset
+
+    engine = ScenarioEngine(load_dataset(args.data), period_days=args.period_days)
+    grid = scenario_grid(
+        price=args.price, demand=args.demand, elasticity=args.elasticity, order_qty=args.order_qty,
+        lead_time=args.lead_time, lead_time_shift=args.lead_time_shift, manufacturing=args.manufacturing,
+        carrier=[None if name == 'keep' else name for name in args.carrier],
+        mode=[None if name == 'keep' else name for name in args.mode])
+    start = time.perf_counter()
+    totals = engine.run(grid)
+    elapsed = time.perf_counter() - start
+    print(f"{len(grid):,} scenarios x {engine.n_skus:,} SKUs in {elapsed:.3f}s")
+    print(totals.sort_values('margin', ascending=False).head(args.top).to_string(index=False))
+    if args.out:
+        totals.to_csv(args.out, index=False)
+        print(f"totals written to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
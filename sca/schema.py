@@ -0,0 +1,55 @@
+# Column groups of the cleaned supply-chain dataset (data/SCA.csv)
+
+# Low-cardinality text columns used as group keys throughout the analysis
+CATEGORICAL_COLUMNS = [
+    'Product_type',
+    'Customer_demographics',
+    'Shipping_carriers',
+    'Supplier_name',
+    'Location',
+    'Inspection_results',
+    'Transportation_modes',
+    'Routes',
+]
+
+# Whole-number columns (the cleaning step writes them as 55.0-style floats)
+COUNT_COLUMNS = [
+    'Availability',
+    'Number_of_products_sold',
+    'Stock_levels',
+    'Lead_times',
+    'Order_quantities',
+    'Shipping_times',
+    'Lead_time',
+    'Production_volumes',
+    'Manufacturing_lead_time',
+]
+
+# Continuous measures
+MEASURE_COLUMNS = [
+    'Price',
+    'Revenue_generated',
+    'Shipping_costs',
+    'Manufacturing_costs',
+    'Defect_rates',
+    'Costs',
+]
+
+NUMERIC_COLUMNS = COUNT_COLUMNS + MEASURE_COLUMNS
+
+# Column order of data/SCA.csv
+COLUMNS = [
+    'Product_type', 'SKU', 'Price', 'Availability', 'Number_of_products_sold',
+    'Revenue_generated', 'Customer_demographics', 'Stock_levels', 'Lead_times',
+    'Order_quantities', 'Shipping_times', 'Shipping_carriers', 'Shipping_costs',
+    'Supplier_name', 'Location', 'Lead_time', 'Production_volumes',
+    'Manufacturing_lead_time', 'Manufacturing_costs', 'Inspection_results',
+    'Defect_rates', 'Transportation_modes', 'Routes', 'Costs',
+]
+
+# Consistent colors for Product_type across every chart
+COLOR_MAP = {
+    'haircare': '#ADD8E6',   # Light Blue
+    'skincare': '#90EE90',   # Light Green
+    'cosmetics': '#FFA500'   # Orange
+}
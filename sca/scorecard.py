@@ -0,0 +1,295 @@
+"""Windowed supplier scorecards, updated one record at a time.
+
+``supplier_summary`` averages Lead_time, Manufacturing_costs and Defect_rates
+and sums Production_volumes per Supplier_name over the whole file.
+``SupplierScorecard`` keeps the same aggregates over a sliding window per
+supplier as records stream in. The window is the supplier's last ``window``
+records, or its records from the last ``period`` (seconds or a pandas
+timedelta string such as ``'30D'``). With neither, the whole history is kept.
+
+Each supplier holds running sums and non-null counts of the metrics. A count
+window keeps its records in a ring buffer, a time window in a deque. Adding
+a record adds its values, and every record that falls out of the window is
+subtracted, so an update costs O(1) (amortized for time windows). The sums
+are rebuilt from the buffer once per window's worth of evictions, so float
+drift cannot build up. ``scorecard()`` reads the sums directly: its cost
+depends on the number of suppliers, not records. The composite ``Score`` (0-100)
+is a weighted mean of each metric min-max scaled across suppliers. Low lead
+time, cost and defect rate score high, and so does high production volume.
+
+    card = SupplierScorecard(window=50)
+    for row in records:
+        card.update(row['Supplier_name'], row)
+    card.scorecard()
+
+    python -m sca.scorecard --window 20
+"""
+
+import argparse
+import math
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from sca.aggregate import SUMMARY_SPECS
+
+KEY = 'Supplier_name'
+# Metric -> 'mean' or 'sum', as in supplier_summary
+METRICS = dict(SUMMARY_SPECS['supplier_summary'][1])
+# Composite score weights; a negative weight means lower is better
+SCORE_WEIGHTS = {
+    'Defect_rates': -0.4,
+    'Lead_time': -0.25,
+    'Manufacturing_costs': -0.25,
+    'Production_volumes': 0.1,
+}
+
+
+# --- Windows ---
+
+class _Window:
+    """Running sums and non-null counts of the metrics over every record pushed."""
+
+    def __init__(self, n_metrics):
+        self.sums = [0.0] * n_metrics
+        self.counts = [0] * n_metrics
+        self.records = 0
+
+    def _add(self, values):
+        sums, counts = self.sums, self.counts
+        for i, value in enumerate(values):
+            if value == value:      # skip NaN
+                sums[i] += value
+                counts[i] += 1
+        self.records += 1
+
+    def _remove(self, values):
+        sums, counts = self.sums, self.counts
+        for i, value in enumerate(values):
+            if value == value:
+                sums[i] -= value
+                counts[i] -= 1
+        self.records -= 1
+
+    def _resum(self, rows):
+        # Rebuild the sums from the buffered records so subtraction error doesn't accumulate
+        self.sums = [math.fsum(v for v in column if v == v) for column in zip(*rows)] or [0.0] * len(self.sums)
+
+    def push(self, values, at=None):
+        self._add(values)
+
+    def expire(self, now):
+        pass
+
+
+class _CountWindow(_Window):
+    """The last ``size`` records, in a ring buffer."""
+
+    def __init__(self, n_metrics, size):
+        super().__init__(n_metrics)
+        self.ring = [None] * size
+        self.pos = 0
+        self.evicted = 0
+
+    def push(self, values, at=None):
+        old = self.ring[self.pos]
+        if old is not None:
+            self._remove(old)
+            self.evicted += 1
+        self.ring[self.pos] = values
+        self.pos = (self.pos + 1) % len(self.ring)
+        self._add(values)
+        if self.evicted >= len(self.ring):
+            self._resum([row for row in self.ring if row is not None])
+            self.evicted = 0
+
+
+class _TimeWindow(_Window):
+    """Records from the last ``period`` seconds, in a deque ordered by time."""
+
+    def __init__(self, n_metrics, period):
+        super().__init__(n_metrics)
+        self.period = period
+        self.rows = deque()
+        self.evicted = 0
+        self.latest = -math.inf
+
+    def push(self, values, at=None):
+        if at is None:
+            raise ValueError("a time window needs the record time ('at')")
+        if at < self.latest:
+            raise ValueError(f"records must arrive in time order ({at} after {self.latest})")
+        self.latest = at
+        self.rows.append((at, values))
+        self._add(values)
+        self.expire(at)
+
+    def expire(self, now):
+        rows = self.rows
+        cutoff = now - self.period
+        while rows and rows[0][0] <= cutoff:
+            self._remove(rows.popleft()[1])
+            self.evicted += 1
+        if self.evicted >= max(len(rows), 1):
+            self._resum([values for _, values in rows])
+            self.evicted = 0
+
+
+def _seconds(value):
+    """Seconds from a number, a ``Timedelta``/``timedelta`` or a pandas offset string like ``'30D'``."""
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return float(value)
+    return pd.Timedelta(value).total_seconds()
+
+
+def _timestamp(value):
+    """Seconds since the epoch for a number, datetime or ``Timestamp``."""
+    if value is None or isinstance(value, (int, float, np.integer, np.floating)):
+        return value
+    return pd.Timestamp(value).value / 1e9
+
+
+# --- Scorecard ---
+
+class SupplierScorecard:
+    """Per-supplier windowed ``supplier_summary`` metrics and a composite score.
+
+    ``window`` keeps each supplier's last N records; ``period`` keeps its
+    records newer than that much time before the latest one (records then need
+    an ``at`` time, in order). ``metrics`` maps column -> 'mean' or 'sum' and
+    ``weights`` sets the composite score (see ``SCORE_WEIGHTS``).
+    """
+
+    def __init__(self, window=None, period=None, metrics=None, weights=None):
+        if window is not None and period is not None:
+            raise ValueError("give either a record window or a time period, not both")
+        if window is not None and window < 1:
+            raise ValueError("window must be at least 1 record")
+        self.window = window
+        self.period = None if period is None else _seconds(period)
+        self.metrics = dict(METRICS if metrics is None else metrics)
+        self.weights = dict(SCORE_WEIGHTS if weights is None else weights)
+        self.columns = list(self.metrics)
+        self.suppliers = {}
+        self.now = None
+        self._card = None
+
+    def _new_window(self):
+        if self.window is not None:
+            return _CountWindow(len(self.columns), self.window)
+        if self.period is not None:
+            return _TimeWindow(len(self.columns), self.period)
+        return _Window(len(self.columns))
+
+    def update(self, supplier, record, at=None):
+        """Add one record: a mapping with the metric columns, or their values in ``columns`` order."""
+        if hasattr(record, 'keys'):
+            values = tuple(float(record[col]) for col in self.columns)
+        else:
+            values = tuple(float(value) for value in record)
+        self._push(supplier, values, _timestamp(at))
+
+    def _push(self, supplier, values, at):
+        window = self.suppliers.get(supplier)
+        if window is None:
+            window = self.suppliers[supplier] = self._new_window()
+        window.push(values, at)
+        if at is not None and (self.now is None or at > self.now):
+            self.now = at
+        self._card = None
+
+    def update_frame(self, df, time_column=None):
+        """Feed every row of ``df`` in order (one O(1) update each)."""
+        suppliers = df[KEY].astype(str).tolist()
+        values = df[self.columns].to_numpy(dtype=np.float64, na_value=np.nan).tolist()
+        times = [None] * len(df) if time_column is None else _times(df[time_column])
+        push = self._push
+        for supplier, row, at in zip(suppliers, values, times):
+            push(supplier, row, at)
+
+    def scorecard(self, at=None):
+        """Current scorecard, one row per supplier with records in its window; cached until the next update.
+
+        With a time window, every supplier's window is first aged to ``at``
+        (default: the latest record time), so idle suppliers age out too.
+        """
+        if self.period is not None and (at is not None or self._card is None):
+            at = self.now if at is None else _timestamp(at)
+            for window in self.suppliers.values():
+                window.expire(at)
+            self._card = None
+        if self._card is None:
+            self._card = self._build()
+        return self._card
+
+    def _build(self):
+        names = sorted(name for name, window in self.suppliers.items() if window.records)
+        windows = [self.suppliers[name] for name in names]
+        # Explicit shape, so no suppliers gives (0, metrics) arrays rather than a reshape error
+        shape = (len(names), len(self.columns))
+        sums = np.array([window.sums for window in windows], dtype=np.float64).reshape(shape)
+        counts = np.array([window.counts for window in windows], dtype=np.float64).reshape(shape)
+        columns = {KEY: np.array(names, dtype=object),
+                   'Records': np.array([window.records for window in windows], dtype=np.int64)}
+        for j, col in enumerate(self.columns):
+            if self.metrics[col] == 'sum':
+                columns[col] = sums[:, j]
+            else:
+                columns[col] = np.divide(sums[:, j], counts[:, j], out=np.full(len(names), np.nan),
+                                         where=counts[:, j] > 0)
+        columns['Score'] = composite_score(columns, self.weights)
+        return pd.DataFrame(columns)
+
+
+def _times(series):
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        return (series.astype('datetime64[ns]').astype(np.int64) / 1e9).tolist()
+    return series.astype(np.float64).tolist()
+
+
+def composite_score(card, weights=None):
+    """0-100 weighted mean of each weighted metric min-max scaled across the rows of ``card``.
+
+    ``card`` is a DataFrame or a mapping of column arrays. A metric that is
+    equal for every supplier (or missing) scores 0.5 for all.
+    """
+    weights = SCORE_WEIGHTS if weights is None else weights
+    total = np.zeros(len(card[KEY]))
+    weight_sum = 0.0
+    for col, weight in weights.items():
+        if col not in card or weight == 0:
+            continue
+        values = np.asarray(card[col], dtype=np.float64)
+        lo, hi = (np.nanmin(values), np.nanmax(values)) if np.isfinite(values).any() else (np.nan, np.nan)
+        if hi > lo:
+            scaled = (values - lo) / (hi - lo)
+        else:
+            scaled = np.full(len(values), 0.5)
+        scaled = np.where(np.isnan(scaled), 0.5, scaled)
+        total += abs(weight) * (scaled if weight > 0 else 1.0 - scaled)
+        weight_sum += abs(weight)
+    return 100 * total / weight_sum if weight_sum else np.full(len(total), np.nan)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay the cleaned dataset through a windowed supplier scorecard.')
+    parser.add_argument('--data', default='data/SCA.csv')
+    parser.add_argument('--window', type=int, default=None, help='last N records per supplier')
+    args = parser.parse_args()
+
+    import time
+
+    from sca.store import load_dataset
+
+    df = load_dataset(args.data)
+    card = SupplierScorecard(window=args.window)
+    start = time.perf_counter()
+    card.update_frame(df)
+    elapsed = time.perf_counter() - start
+    print(f"{len(df):,} records in {elapsed:.3f}s ({elapsed / max(len(df), 1) * 1e6:.1f} us per update)")
+    print(card.scorecard().sort_values('Score', ascending=False).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,323 @@
+"""Local asyncio HTTP service answering supply-chain queries from a warm process.
+
+The cleaned dataset, its summary tables and the ``sca.cube.Cube`` are loaded
+once at start-up and stay resident. Each query is answered on a small thread
+pool so the event loop keeps accepting connections. Responses are JSON, cached
+per request (path plus normalized query string) in an LRU, and identical
+concurrent requests share one computation. Connections are kept alive, so a
+dashboard polling the service reuses its sockets instead of reconnecting.
+
+    python -m sca.service --port 8765
+
+Endpoints (all GET):
+
+    /health                         row count, uptime and response-cache stats
+    /tables                         names of the precomputed tables
+    /tables/<name>                  one ``Analysis`` table, e.g. /tables/product_summary
+    /summary/<name>                 a categorical summary, e.g. /summary/supplier_summary
+    /turnover                       inventory turnover per SKU, best first within product type
+    /rank                           top/bottom-k rows, e.g. /rank?metric=Defect_rates&k=5&by=Supplier_name
+
+Any categorical column is a filter: ``?Transportation_modes=Air,Rail&Location=Mumbai``
+keeps only those rows before aggregating (summaries are sliced from the cube, when the
+data has few enough level combinations for one).
+``/turnover`` and ``/rank`` also accept ``SKU=...``; ``limit=N`` caps the rows
+returned. ``/rank`` takes ``metric`` (default Defect_rates), ``k`` (default 3),
+``by`` (comma-separated group columns) and ``order`` (top, bottom or extremes).
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from sca.analysis import TABLES, Analysis, turnover_ratios
+from sca.schema import CATEGORICAL_COLUMNS, NUMERIC_COLUMNS
+from sca.trace import span
+
+DEFAULT_PORT = 8765
+CACHE_SIZE = 1024
+MAX_HEADER_BYTES = 16 * 1024
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 500: 'Internal Server Error'}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _split(value):
+    return [part for part in value.split(',') if part]
+
+
+def _frame_json(frame, limit=None):
+    if limit is not None:
+        frame = frame.head(limit)
+    # pandas writes NaN/inf as null and categoricals as their values
+    rows = frame.to_json(orient='records', double_precision=15)
+    columns = json.dumps([str(col) for col in frame.columns])
+    return f'{{"columns":{columns},"count":{len(frame)},"rows":{rows}}}'
+
+
+class QueryService:
+    """Query endpoints over one resident ``Analysis``; ``serve`` runs them over HTTP."""
+
+    def __init__(self, analysis, workers=4, cache_size=CACHE_SIZE):
+        self.analysis = analysis
+        self.df = analysis.df
+        self.cache_size = cache_size
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='sca-query')
+        self.started = time.time()
+        self.hits = 0
+        self.misses = 0
+        self._responses = OrderedDict()
+        self._pending = {}
+        self.routes = {
+            'health': self.health,
+            'tables': self.tables,
+            'summary': self.summary,
+            'turnover': self.turnover,
+            'rank': self.rank,
+        }
+
+    @classmethod
+    def from_csv(cls, path='data/SCA.csv', cache=True, **options):
+        return cls(Analysis.from_csv(path, cache=cache), **options)
+
+    def warm(self):
+        """Compute every table and the cube up front so the first requests are fast."""
+        # The cube first, so the tables roll up from it instead of a cube of their own
+        self.analysis.cube
+        self.analysis.tables()
+        return self
+
+    # --- Parameters ---
+
+    def _filters(self, params, allowed=(), extra=()):
+        filters = {}
+        for key, value in params.items():
+            if key in CATEGORICAL_COLUMNS or key in extra:
+                filters[key] = _split(value)
+            elif key not in allowed:
+                raise HTTPError(400, f"unknown parameter {key!r}")
+        return filters
+
+    def _rows(self, filters):
+        if not filters:
+            return self.df
+        mask = None
+        for col, values in filters.items():
+            keep = self.df[col].isin(values).to_numpy()
+            mask = keep if mask is None else mask & keep
+        return self.df[mask]
+
+    @staticmethod
+    def _int(params, key, default):
+        try:
+            return int(params[key]) if key in params else default
+        except ValueError:
+            raise HTTPError(400, f"{key} must be an integer") from None
+
+    # --- Endpoints ---
+
+    def health(self, rest, params):
+        return json.dumps({
+            'rows': len(self.df),
+            'uptime_s': round(time.time() - self.started, 3),
+            'cache': {'entries': len(self._responses), 'hits': self.hits, 'misses': self.misses},
+        })
+
+    def tables(self, rest, params):
+        if not rest:
+            return json.dumps(TABLES)
+        if rest not in TABLES:
+            raise HTTPError(404, f"unknown table {rest!r}")
+        unknown = sorted(set(params) - {'limit'})
+        if unknown:
+            raise HTTPError(400, f"precomputed tables take only limit, not {unknown}")
+        return _frame_json(self.analysis.table(rest), self._int(params, 'limit', None))
+
+    def summary(self, rest, params):
+        from sca.cube import covers
+
+        cube = self.analysis.cube
+        if not covers(rest, CATEGORICAL_COLUMNS, NUMERIC_COLUMNS) or (cube is not None and not cube.covers(rest)):
+            raise HTTPError(404, f"unknown summary {rest!r}")
+        filters = self._filters(params, allowed=('limit',))
+        if cube is None:
+            # Too many level combinations for a cube: group the filtered rows
+            from sca.aggregate import Aggregator
+
+            return _frame_json(getattr(Aggregator(self._rows(filters)), rest)(), self._int(params, 'limit', None))
+        # Values that never occur select nothing rather than failing
+        selection = {col: [v for v in values if v in cube.levels[cube.dims.index(col)]]
+                     for col, values in filters.items()}
+        return _frame_json(getattr(cube.slice(**selection), rest)(), self._int(params, 'limit', None))
+
+    def turnover(self, rest, params):
+        filters = self._filters(params, allowed=('limit',), extra=('SKU',))
+        table = turnover_ratios(self._rows(filters))
+        table = table.sort_values(by=['Product_type', 'Inventory_Turnover_Ratio'], ascending=[True, False])
+        return _frame_json(table, self._int(params, 'limit', None))
+
+    def rank(self, rest, params):
+        from sca.rank import bottom_k, extremes, top_k
+
+        filters = self._filters(params, allowed=('metric', 'k', 'by', 'order', 'limit'), extra=('SKU',))
+        metric = params.get('metric', 'Defect_rates')
+        if metric not in NUMERIC_COLUMNS:
+            raise HTTPError(400, f"metric must be one of {NUMERIC_COLUMNS}")
+        by = _split(params.get('by', '')) or None
+        if by and not set(by) <= set(CATEGORICAL_COLUMNS):
+            raise HTTPError(400, f"by must be categorical columns: {CATEGORICAL_COLUMNS}")
+        order = params.get('order', 'top')
+        k = self._int(params, 'k', 3)
+        columns = ['SKU'] + (by or []) + [metric]
+        rows = self._rows(filters)
+        if order == 'top':
+            table = top_k(rows, metric, k, by=by, columns=columns)
+        elif order == 'bottom':
+            table = bottom_k(rows, metric, k, by=by, columns=columns)
+        elif order == 'extremes' and by is None:
+            table = extremes(rows, metric, k, columns=columns)
+        else:
+            raise HTTPError(400, "order must be top or bottom (or extremes without by)")
+        return _frame_json(table, self._int(params, 'limit', None))
+
+    # --- Dispatch and caching ---
+
+    def query(self, target):
+        """``(status, body)`` for a request target such as ``/summary/supplier_summary?Routes=Route+A``."""
+        url = urlsplit(target)
+        params = dict(parse_qsl(url.query, keep_blank_values=True))
+        route, _, rest = unquote(url.path).strip('/').partition('/')
+        handler = self.routes.get(route)
+        with span(f'service.{route}', target=target) as s:
+            try:
+                if handler is None:
+                    raise HTTPError(404, f"unknown endpoint /{route}")
+                return 200, handler(rest, params)
+            except HTTPError as exc:
+                s.set(status=exc.status)
+                return exc.status, json.dumps({'error': exc.message})
+
+    @staticmethod
+    def cache_key(target):
+        # The path as ``query`` dispatches on it, so /tables/a%5Fb and /tables/a_b/ share an entry
+        url = urlsplit(target)
+        return '/' + unquote(url.path).strip('/'), tuple(sorted(parse_qsl(url.query, keep_blank_values=True)))
+
+    async def respond(self, target):
+        """Cached, coalesced ``query`` run on the thread pool."""
+        key = self.cache_key(target)
+        if key[0] == '/health':
+            return self.query(target)
+        if key in self._responses:
+            self.hits += 1
+            self._responses.move_to_end(key)
+            return self._responses[key]
+        if key in self._pending:
+            self.hits += 1
+            return await asyncio.shield(self._pending[key])
+        self.misses += 1
+        future = asyncio.get_running_loop().run_in_executor(self.executor, self.query, target)
+        self._pending[key] = future
+        try:
+            response = await future
+        finally:
+            del self._pending[key]
+        if response[0] == 200:
+            self._responses[key] = response
+            if len(self._responses) > self.cache_size:
+                self._responses.popitem(last=False)
+        return response
+
+    # --- HTTP ---
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                lines = head.decode('latin-1').split('\r\n')
+                try:
+                    method, target, version = lines[0].split(' ')
+                except ValueError:
+                    await self._write(writer, 400, json.dumps({'error': 'malformed request line'}), False)
+                    break
+                headers = {k.strip().lower(): v.strip() for k, _, v in (line.partition(':') for line in lines[1:] if line)}
+                keep_alive = (headers.get('connection', '').lower() != 'close'
+                              and (version == 'HTTP/1.1' or headers.get('connection', '').lower() == 'keep-alive'))
+                if method != 'GET':
+                    status, body = 405, json.dumps({'error': 'only GET is supported'})
+                else:
+                    try:
+                        status, body = await self.respond(target)
+                    except Exception as exc:  # a failing query must not take the server down
+                        status, body = 500, json.dumps({'error': repr(exc)})
+                await self._write(writer, status, body, keep_alive)
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    @staticmethod
+    async def _write(writer, status, body, keep_alive):
+        payload = body.encode('utf-8')
+        writer.write((f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                      f"Content-Type: application/json\r\n"
+                      f"Content-Length: {len(payload)}\r\n"
+                      f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n").encode('latin-1') + payload)
+        await writer.drain()
+
+    async def start(self, host='127.0.0.1', port=DEFAULT_PORT):
+        """Start listening; returns the ``asyncio.Server`` (port 0 picks a free port)."""
+        return await asyncio.start_server(self.handle_connection, host, port, limit=MAX_HEADER_BYTES)
+
+    async def serve(self, host='127.0.0.1', port=DEFAULT_PORT):
+        server = await self.start(host, port)
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+        self.analysis.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--source', default='data/SCA.csv')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--workers', type=int, default=4, help='query threads')
+    parser.add_argument('--cache-size', type=int, default=CACHE_SIZE, help='cached responses')
+    parser.add_argument('--no-cache', action='store_true', help='recompute instead of reusing data/SCA.results/')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    service = QueryService.from_csv(args.source, cache=None if args.no_cache else True,
+                                    workers=args.workers, cache_size=args.cache_size).warm()
+    print(f"{len(service.df):,} rows loaded in {time.perf_counter() - start:.2f}s; "
+          f"serving on http://{args.host}:{args.port}/")
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""Mergeable quantile sketch (KLL) for streaming medians and IQR bounds.
+
+Values are kept in a stack of compactors. When a level overflows it is
+sorted and every other item is promoted to the next level with twice the
+weight, so memory stays around ``3k`` items however many values are added.
+Until the first compaction the sketch holds every value and its quantiles are
+exact (linear interpolation, as ``pandas.Series.quantile``).
+"""
+
+import numpy as np
+
+
+class KLLSketch:
+
+    def __init__(self, k=1024, c=2 / 3, seed=None):
+        self.k = k
+        self.c = c
+        self.n = 0
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def __len__(self):
+        return self.n
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(2, int(np.ceil(self.k * self.c ** depth)))
+
+    def update(self, values):
+        """Add a batch of values; NaNs are ignored."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+        self.n += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other):
+        """Fold another sketch into this one."""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.n += other.n
+        self._compress()
+        return self
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) <= self._capacity(level):
+                level += 1
+                continue
+            if level + 1 == len(self.levels):
+                self.levels.append(np.empty(0))
+            items = np.sort(items)
+            # An odd item out stays behind so total weight is preserved
+            cut = len(items) - len(items) % 2
+            rest, items = items[cut:], items[:cut]
+            promoted = items[self._rng.integers(2)::2]
+            self.levels[level] = rest
+            self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            # Adding a level shrinks the capacity of every level below it
+            level = 0
+
+    @property
+    def exact(self):
+        return all(len(items) == 0 for items in self.levels[1:])
+
+    def quantile(self, q):
+        """Estimate one or more quantiles (scalar ``q`` returns a scalar)."""
+        qs = np.atleast_1d(np.asarray(q, dtype=np.float64))
+        if self.n == 0:
+            out = np.full(len(qs), np.nan)
+        elif self.exact:
+            out = np.quantile(self.levels[0], qs)
+        else:
+            items = np.concatenate(self.levels)
+            weights = np.concatenate([np.full(len(lv), 2.0 ** i) for i, lv in enumerate(self.levels)])
+            order = np.argsort(items, kind='stable')
+            items, weights = items[order], weights[order]
+            # Rank of each item's midpoint, scaled to [0, 1]
+            ranks = (np.cumsum(weights) - weights / 2) / weights.sum()
+            out = np.interp(qs, ranks, items)
+        return out if np.ndim(q) else out[0]
@@ -0,0 +1,257 @@
+"""Typed columnar cache for the cleaned dataset.
+
+Re-parsing data/SCA.csv on every run is slow, and it brings the count columns
+back as ``55.0``-style floats and the text columns back as Python objects.
+``write_cache`` stores each column as its own ``.npy`` file with an explicit
+dtype:
+
+- text columns become categorical codes (int8/int16/int32) plus a category list
+- whole-number columns become the narrowest integer type that holds them
+- float columns become float32 when that round-trips exactly, else float64
+
+``load_dataset`` memory-maps those files and only falls back to parsing the
+CSV when the cache is missing or older than the CSV it was built from. A
+parsed frame that cannot be cached goes through ``optimize_memory``, which
+applies the same encodings in memory, so either way SCA.py works on the
+compact frame. ``memory_report`` compares the footprint as parsed with the
+footprint as loaded; the cache records the parsed sizes so the report needs
+no second parse.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from sca.trace import span, traced
+
+CACHE_VERSION = 2
+META_FILE = 'meta.json'
+
+
+def cache_dir_for(path):
+    """Default cache location: ``data/SCA.csv`` -> ``data/SCA.cache/``."""
+    root, _ = os.path.splitext(path)
+    return root + '.cache'
+
+
+def source_stamp(path):
+    st = os.stat(path)
+    return {'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+
+
+# --- Column encoding ---
+
+def _code_dtype(n_categories):
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories < np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+def _int_dtype(values):
+    lo, hi = values.min(), values.max()
+    for dtype in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if info.min <= lo and hi <= info.max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+def narrow_numeric(values):
+    """Narrowest dtype that holds ``values`` without changing any of them."""
+    values = np.asarray(values)
+    if values.dtype.kind == 'b':
+        return values
+    if values.dtype.kind in 'iu':
+        return values.astype(_int_dtype(values)) if len(values) else values
+    values = values.astype(np.float64, copy=False)
+    if len(values) == 0:
+        return values
+    finite = np.isfinite(values)
+    if finite.all() and np.array_equal(values, np.round(values)) and np.abs(values).max() < 2 ** 53:
+        return values.astype(_int_dtype(values))
+    narrow = values.astype(np.float32)
+    if np.array_equal(narrow.astype(np.float64), values, equal_nan=True):
+        return narrow
+    return values
+
+
+def encode_column(series):
+    """Return ``(array, categories)``; categories is None for numeric columns."""
+    if pd.api.types.is_numeric_dtype(series.dtype) and not isinstance(series.dtype, pd.CategoricalDtype):
+        return narrow_numeric(series.to_numpy(dtype=None, na_value=np.nan)), None
+    codes, uniques = pd.factorize(series, sort=True)
+    categories = [str(value) for value in uniques]
+    return codes.astype(_code_dtype(len(categories))), categories
+
+
+def decode_column(array, categories):
+    """Column values for an ``encode_column`` result: a Categorical over the codes, or the array."""
+    if categories is None:
+        return array
+    return pd.Categorical.from_codes(array, dtype=pd.CategoricalDtype(categories))
+
+
+def _is_text(series):
+    return series.dtype == object or isinstance(series.dtype, pd.StringDtype)
+
+
+@traced('store.optimize_memory')
+def optimize_memory(df):
+    """Compact copy of ``df``: text columns (SKU included) as categoricals over
+    integer codes, numbers in the narrowest dtype that keeps every value.
+
+    Columns of any other dtype (already categorical, datetime, bool) are kept.
+    """
+    data = {}
+    for col in df.columns:
+        series = df[col]
+        if _is_text(series) or (pd.api.types.is_numeric_dtype(series.dtype)
+                                and not pd.api.types.is_bool_dtype(series.dtype)):
+            data[col] = decode_column(*encode_column(series))
+        else:
+            data[col] = series.array
+    return pd.DataFrame(data, index=df.index, copy=False)
+
+
+# --- Memory report ---
+
+def column_bytes(df):
+    """``{column: (dtype, bytes)}`` with object/string payloads counted (``deep=True``)."""
+    sizes = df.memory_usage(deep=True, index=False)
+    return {col: (str(df[col].dtype), int(sizes[col])) for col in df.columns}
+
+
+def memory_report(before, after):
+    """Per-column dtype and bytes before and after, plus a ``total`` row.
+
+    ``before`` and ``after`` are DataFrames or ``column_bytes`` results.
+    """
+    before = column_bytes(before) if isinstance(before, pd.DataFrame) else before
+    after = column_bytes(after) if isinstance(after, pd.DataFrame) else after
+    rows = [(col, before[col][0], after[col][0], before[col][1], after[col][1])
+            for col in after if col in before]
+    report = pd.DataFrame(rows, columns=['column', 'dtype_before', 'dtype_after', 'bytes_before', 'bytes_after'])
+    report = report.set_index('column')
+    report.loc['total'] = ['', '', report['bytes_before'].sum(), report['bytes_after'].sum()]
+    report['ratio'] = report['bytes_before'] / report['bytes_after'].where(report['bytes_after'] > 0)
+    return report
+
+
+def dataset_memory_report(path='data/SCA.csv', cache_dir=None):
+    """``memory_report`` of the dataset as parsed from ``path`` vs as loaded from its cache.
+
+    Uses the parsed sizes recorded when the cache was written; None if there
+    is no cache (or it predates that record).
+    """
+    cache_dir = cache_dir or cache_dir_for(path)
+    meta = read_meta(cache_dir)
+    if meta is None or any('parsed' not in entry for entry in meta['columns']):
+        return None
+    before = {entry['name']: tuple(entry['parsed']) for entry in meta['columns']}
+    return memory_report(before, read_cache(cache_dir))
+
+
+# --- Cache I/O ---
+
+@traced('store.write_cache')
+def write_cache(df, cache_dir, source=None):
+    """Write ``df`` as a columnar cache; ``source`` is the CSV it must stay in sync with."""
+    parent = os.path.dirname(os.path.abspath(cache_dir))
+    os.makedirs(parent, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(prefix='.sca-cache-', dir=parent)
+    try:
+        parsed = column_bytes(df)
+        columns = []
+        for i, col in enumerate(df.columns):
+            array, categories = encode_column(df[col])
+            file_name = f'{i:03d}.npy'
+            np.save(os.path.join(tmp_dir, file_name), array, allow_pickle=False)
+            columns.append({'name': col, 'file': file_name, 'dtype': array.dtype.str,
+                            'categories': categories, 'parsed': parsed[col]})
+        meta = {
+            'version': CACHE_VERSION,
+            'rows': len(df),
+            'columns': columns,
+            'source': source_stamp(source) if source else None,
+        }
+        with open(os.path.join(tmp_dir, META_FILE), 'w') as f:
+            json.dump(meta, f)
+        # Swap the finished directory in so readers never see a half-written cache
+        if os.path.isdir(cache_dir):
+            shutil.rmtree(cache_dir)
+        os.replace(tmp_dir, cache_dir)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    return cache_dir
+
+
+def read_meta(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, META_FILE)) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return meta if meta.get('version') == CACHE_VERSION else None
+
+
+def is_fresh(cache_dir, source):
+    """True when the cache exists and was built from the current ``source`` file."""
+    meta = read_meta(cache_dir)
+    if meta is None:
+        return False
+    if source is None or meta['source'] is None:
+        return True
+    try:
+        return meta['source'] == source_stamp(source)
+    except OSError:
+        return False
+
+
+@traced('store.read_cache')
+def read_cache(cache_dir, columns=None, mmap=True):
+    """Load a cache written by ``write_cache``; numeric columns stay memory-mapped."""
+    meta = read_meta(cache_dir)
+    if meta is None:
+        raise FileNotFoundError(f"No columnar cache in {cache_dir}")
+    mmap_mode = 'r' if mmap else None
+    data = {}
+    for entry in meta['columns']:
+        if columns is not None and entry['name'] not in columns:
+            continue
+        array = np.load(os.path.join(cache_dir, entry['file']), mmap_mode=mmap_mode, allow_pickle=False)
+        data[entry['name']] = decode_column(array, entry['categories'])
+    if columns is not None:
+        data = {col: data[col] for col in columns}
+    return pd.DataFrame(data, copy=False)
+
+
+@traced('store.load_dataset')
+def load_dataset(path='data/SCA.csv', columns=None, cache_dir=None, mmap=True, refresh=True):
+    """Load the cleaned dataset, preferring the columnar cache next to ``path``.
+
+    A missing or stale cache falls back to ``pd.read_csv``; with ``refresh``
+    the cache is rebuilt so the next load is fast again. A frame that is not
+    cached is compacted with ``optimize_memory`` instead.
+    """
+    cache_dir = cache_dir or cache_dir_for(path)
+    if is_fresh(cache_dir, path):
+        return read_cache(cache_dir, columns, mmap)
+    with span('store.read_csv', path=path) as s:
+        df = pd.read_csv(path)
+        s.rows_out = len(df)
+    if refresh:
+        try:
+            write_cache(df, cache_dir, source=path)
+        except OSError:
+            pass    # Read-only checkout: keep working from the CSV
+        else:
+            return read_cache(cache_dir, columns, mmap)
+    if columns is not None:
+        df = df[list(columns)]
+    return optimize_memory(df)
@@ -0,0 +1,123 @@
+"""Out-of-core summaries for extracts larger than memory.
+
+The CSV is read in chunks. Each chunk is folded into mergeable partial
+aggregates (per-group sums and non-null counts), so peak memory is bounded by
+the chunk size plus one row per group. Means are rebuilt from their sum and
+count at the end, which gives the same tables as ``Aggregator`` over the
+whole file, in the same row order.
+
+    python -m sca.stream data/SCA.csv --chunksize 500000
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from sca.aggregate import SUMMARIES, Aggregator, _as_keys
+from sca.partition import SPECS, finish_summary
+
+DEFAULT_CHUNKSIZE = 100_000
+
+
+class PartialAggregate:
+    """Mergeable sums and counts behind one summary table."""
+
+    def __init__(self, keys, spec):
+        self.keys = list(_as_keys(keys))
+        self.spec = spec
+        self.state = None       # one row per group, indexed by the key columns
+        self.int_cols = None    # columns that were integer in every chunk seen so far
+
+    def update(self, agg):
+        """Fold in one chunk, given an ``Aggregator`` over that chunk."""
+        parts = {}
+        int_cols = set()
+        for col, how in self.spec.items():
+            if how == 'size':
+                parts[(col, 'count')] = agg.size(self.keys)
+                continue
+            parts[(col, 'sum')] = agg.sum(self.keys, col).astype(np.float64)
+            if how == 'mean':
+                parts[(col, 'count')] = agg.count(self.keys, col)
+            if pd.api.types.is_integer_dtype(agg.df[col].dtype):
+                int_cols.add(col)
+        index = pd.MultiIndex.from_frame(agg.groups(self.keys).key_frame)
+        self._fold(pd.DataFrame(parts, index=index), int_cols)
+
+    def merge(self, other):
+        """Combine with a partial aggregate built over other rows."""
+        if other.state is not None:
+            self._fold(other.state, other.int_cols)
+        return self
+
+    def _fold(self, state, int_cols):
+        if self.state is None:
+            self.state, self.int_cols = state, set(int_cols)
+        else:
+            self.state = self.state.add(state, fill_value=0)
+            self.int_cols &= int_cols
+
+    def result(self):
+        """Final table, laid out like ``df.groupby(keys).agg(spec).reset_index()``.
+
+        Rows are in key order; ``finish_summary`` applies a named table's own order.
+        """
+        if self.state is None:
+            return pd.DataFrame(columns=self.keys + list(self.spec))
+        state = self.state.sort_index()
+        result = state.index.to_frame(index=False)
+        for col, how in self.spec.items():
+            if how == 'size':
+                result[col] = state[(col, 'count')].to_numpy().astype(np.int64)
+            elif how == 'sum':
+                totals = state[(col, 'sum')].to_numpy()
+                result[col] = np.rint(totals).astype(np.int64) if col in self.int_cols else totals
+            else:
+                totals = state[(col, 'sum')].to_numpy()
+                counts = state[(col, 'count')].to_numpy()
+                out = np.full(len(state), np.nan)
+                np.divide(totals, counts, out=out, where=counts > 0)
+                result[col] = out
+        return result
+
+
+def partial_aggregates(names=None):
+    return {name: PartialAggregate(*SPECS[name]) for name in (names or SUMMARIES)}
+
+
+def required_columns(names=None):
+    """Columns the named summaries read, so the rest of the CSV is never parsed."""
+    columns = []
+    for name in names or SUMMARIES:
+        keys, spec = SPECS[name]
+        wanted = list(_as_keys(keys)) + [col for col, how in spec.items() if how != 'size']
+        columns.extend(col for col in wanted if col not in columns)
+    return columns
+
+
+def stream_summaries(path, names=None, chunksize=DEFAULT_CHUNKSIZE):
+    """Compute summary tables from a CSV without loading it whole."""
+    partials = partial_aggregates(names)
+    for chunk in pd.read_csv(path, chunksize=chunksize, usecols=required_columns(names)):
+        agg = Aggregator(chunk)
+        for partial in partials.values():
+            partial.update(agg)
+    return {name: finish_summary(name, partial.result()) for name, partial in partials.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compute SCA summaries from a CSV in chunks.')
+    parser.add_argument('path', nargs='?', default='data/SCA.csv')
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument('--summary', action='append', choices=SUMMARIES,
+                        help='Summary to compute (repeatable, default: all)')
+    args = parser.parse_args()
+
+    for name, table in stream_summaries(args.path, args.summary, args.chunksize).items():
+        print(f"\n=== {name} ===")
+        print(table.to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+"""Synthetic supply_chain.csv-shaped data at any scale.
+
+The repo ships 100 rows, which is too few to measure anything. ``generate``
+produces a raw frame with the 24 columns of data/supply_chain.csv (original
+column names). Each text column follows the category frequencies of the
+source. Each numeric column is drawn from the source's empirical distribution,
+interpolated between observed values and rounded for integer columns, so
+ranges and shapes match while rows stay distinct.
+
+Skew options model the long tails that real order data has. ``sku_skew``
+draws SKUs from a Zipf-like distribution over ``skus`` ids, so a few SKUs
+repeat often. ``supplier_skew`` re-weights the suppliers the same way.
+``missing`` blanks a fraction of cells to exercise the cleaning fills.
+
+    raw = generate(1_000_000, sku_skew=1.1, skus=50_000)
+    python -m sca.synthetic --rows 10000000 --out data/synthetic.csv
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+SOURCE = 'data/supply_chain.csv'
+CHUNK_ROWS = 1_000_000
+
+
+class Profile:
+    """Per-column distributions of a raw supply-chain frame."""
+
+    def __init__(self, raw):
+        self.columns = list(raw.columns)
+        self.sku = next(col for col in self.columns if col.strip().upper() == 'SKU')
+        self.categories = {}   # column -> (values, probabilities), most frequent first
+        self.numeric = {}      # column -> (sorted observed values, is_int)
+        for col in self.columns:
+            if col == self.sku:
+                continue
+            series = raw[col].dropna()
+            if pd.api.types.is_numeric_dtype(series.dtype):
+                is_int = pd.api.types.is_integer_dtype(series.dtype) or bool((series % 1 == 0).all())
+                self.numeric[col] = (np.sort(series.to_numpy(dtype=np.float64)), is_int)
+            else:
+                counts = series.value_counts()
+                self.categories[col] = (counts.index.to_numpy(dtype=object), counts.to_numpy() / counts.sum())
+
+    @classmethod
+    def from_csv(cls, path=SOURCE):
+        return cls(pd.read_csv(path))
+
+
+def zipf_weights(n, skew):
+    """Probabilities proportional to ``rank ** -skew`` over ``n`` ranks (uniform for 0)."""
+    weights = np.arange(1, n + 1, dtype=np.float64) ** -float(skew)
+    return weights / weights.sum()
+
+
+def _draw_numeric(rng, observed, is_int, rows):
+    # Inverse of the piecewise-linear empirical CDF through the observed values
+    quantiles = np.linspace(0.0, 1.0, len(observed))
+    values = np.interp(rng.random(rows), quantiles, observed)
+    return np.rint(values).astype(np.int64) if is_int else values
+
+
+def generate(rows, seed=0, sku_skew=0.0, skus=None, supplier_skew=0.0, missing=0.0, profile=None, start=0):
+    """A raw frame of ``rows`` rows with the columns and distributions of ``profile``.
+
+    ``skus`` is the number of distinct SKU ids (default ``rows``). Without
+    ``sku_skew`` SKUs are sequential from ``start``, unique like the source;
+    with it they are drawn with ``zipf_weights(skus, sku_skew)``. Text
+    columns come back as categoricals, which ``to_csv`` writes as plain text.
+    """
+    profile = profile or Profile.from_csv()
+    rng = np.random.default_rng(seed)
+    data = {}
+    for col in profile.columns:
+        if col == profile.sku:
+            if sku_skew:
+                n = skus or rows
+                ids = np.searchsorted(np.cumsum(zipf_weights(n, sku_skew)), rng.random(rows), side='right')
+                ids = np.minimum(ids, n - 1)
+            else:
+                ids = start + np.arange(rows)
+                if skus:
+                    ids %= skus
+            uniques, codes = np.unique(ids, return_inverse=True)
+            categories = pd.Index(uniques.astype(str), dtype=object)
+            data[col] = pd.Categorical.from_codes(codes, categories='SKU' + categories)
+        elif col in profile.categories:
+            values, probs = profile.categories[col]
+            if supplier_skew and col.lower().startswith('supplier'):
+                probs = zipf_weights(len(values), supplier_skew)
+            codes = np.searchsorted(np.cumsum(probs), rng.random(rows), side='right')
+            data[col] = pd.Categorical.from_codes(np.minimum(codes, len(values) - 1), categories=values)
+        else:
+            data[col] = _draw_numeric(rng, *profile.numeric[col], rows)
+    raw = pd.DataFrame(data)
+    if missing:
+        for col in raw.columns:
+            if col == profile.sku:
+                continue
+            blank = rng.random(rows) < missing
+            if blank.any():
+                raw[col] = raw[col].mask(blank)
+    return raw
+
+
+def write_csv(path, rows, chunk_rows=CHUNK_ROWS, seed=0, **options):
+    """Generate ``rows`` rows into a CSV ``chunk_rows`` at a time, so memory stays bounded.
+
+    Each chunk uses its own seed derived from ``seed``. Unskewed SKUs continue
+    across chunks.
+    """
+    profile = options.pop('profile', None) or Profile.from_csv()
+    if options.get('skus') is None:
+        options['skus'] = rows
+    seeds = np.random.SeedSequence(seed).spawn(-(-rows // chunk_rows) or 1)
+    for i, start in enumerate(range(0, rows, chunk_rows)):
+        n = min(chunk_rows, rows - start)
+        chunk = generate(n, seed=seeds[i], profile=profile, start=start, **options)
+        chunk.to_csv(path, index=False, mode='w' if i == 0 else 'a', header=i == 0)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write a synthetic supply_chain.csv of any size.')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--out', default='data/synthetic.csv')
+    parser.add_argument('--source', default=SOURCE, help='raw CSV whose distributions to follow')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--sku-skew', type=float, default=0.0, help='Zipf exponent for SKU repeats')
+    parser.add_argument('--skus', type=int, default=None, help='distinct SKU ids (default: rows)')
+    parser.add_argument('--supplier-skew', type=float, default=0.0, help='Zipf exponent over suppliers')
+    parser.add_argument('--missing', type=float, default=0.0, help='fraction of blank cells')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    write_csv(args.out, args.rows, seed=args.seed, profile=Profile.from_csv(args.source),
+              sku_skew=args.sku_skew, skus=args.skus, supplier_skew=args.supplier_skew, missing=args.missing)
+    print(f"{args.rows:,} rows written to {args.out} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
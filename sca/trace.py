@@ -0,0 +1,267 @@
+"""Lightweight spans around pipeline stages, written as a JSON-lines trace.
+
+Tracing is off unless the ``SCA_TRACE`` environment variable is set, to a
+path or to ``1``/``true`` for sca-trace.jsonl (``0``/``false``/``no``/``off``
+keep it off). While off, ``span`` returns a shared no-op and ``traced``
+functions call straight through, so the hooks left in the code cost one flag
+check each.
+
+    SCA_TRACE=trace.jsonl python SCA.py             # one JSON object per span
+    SCA_TRACE=- python -m sca.report                # ... to stderr
+    SCA_TRACE=trace.jsonl SCA_TRACE_CHROME=trace.json python -m sca.report
+
+Each record holds the span name, its start time, wall and CPU seconds, the
+change in resident memory, the rows going in and out where known, the
+process and thread, its nesting depth and any extra attributes. With
+``SCA_TRACE_CHROME`` the trace is also converted at exit into a Chrome
+trace-event file for chrome://tracing or https://ui.perfetto.dev. Runs append
+to the JSON-lines file, and worker processes append to it too, so their spans
+are included.
+``python -m sca.trace trace.jsonl`` prints the slowest spans and can write the
+Chrome file after the fact.
+
+    with span('clean.fill_missing', rows_in=len(data)) as s:
+        data = fill_missing(data)
+        s.rows_out = len(data)
+
+    @traced('cube.build')
+    def build(...): ...
+"""
+
+import argparse
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+ENV = 'SCA_TRACE'
+CHROME_ENV = 'SCA_TRACE_CHROME'
+DEFAULT_PATH = 'sca-trace.jsonl'
+# SCA_TRACE values that switch tracing on to DEFAULT_PATH, or leave it off; anything else is a path
+ON_VALUES = ('1', 'true', 'yes', 'on')
+OFF_VALUES = ('0', 'false', 'no', 'off')
+
+enabled = False
+_since = None
+_path = None
+_chrome = None
+_file = None
+_lock = threading.Lock()
+_local = threading.local()
+
+
+def current_rss():
+    """Resident set size in bytes from /proc/self/statm, or None where that is missing."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def rows_of(value):
+    """Row count of a frame-like value (anything with a ``shape``), else None."""
+    shape = getattr(value, 'shape', None)
+    return shape[0] if shape else None
+
+
+# --- Spans ---
+
+class _NoSpan:
+    rows_in = rows_out = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+class Span:
+    def __init__(self, name, rows_in=None, **attrs):
+        self.name = name
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.attrs = attrs
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        stack = getattr(_local, 'stack', None)
+        if stack is None:
+            stack = _local.stack = []
+        self.depth = len(stack)
+        self.parent = stack[-1].name if stack else None
+        stack.append(self)
+        self.rss = current_rss()
+        self.start = time.time()
+        self.cpu = time.process_time()
+        self.wall = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self.wall
+        cpu = time.process_time() - self.cpu
+        rss = current_rss()
+        _local.stack.pop()
+        record = {
+            'name': self.name,
+            'start': round(self.start, 6),
+            'wall_s': round(wall, 6),
+            'cpu_s': round(cpu, 6),
+            'rss_delta_mb': None if rss is None or self.rss is None else round((rss - self.rss) / 2 ** 20, 3),
+            'rows_in': self.rows_in,
+            'rows_out': self.rows_out,
+            'pid': os.getpid(),
+            'tid': threading.get_ident(),
+            'depth': self.depth,
+            'parent': self.parent,
+        }
+        if exc_type is not None:
+            record['error'] = exc_type.__name__
+        if self.attrs:
+            record['attrs'] = self.attrs
+        _emit(record)
+        return False
+
+
+def span(name, rows_in=None, **attrs):
+    """Context manager timing one stage; a shared no-op while tracing is off."""
+    if not enabled:
+        return _NO_SPAN
+    return Span(name, rows_in, **attrs)
+
+
+def traced(name=None):
+    """Decorator wrapping every call in a span; rows in/out come from the first argument and the result."""
+    def decorate(func):
+        label = name or f'{func.__module__}.{func.__qualname__}'
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return func(*args, **kwargs)
+            with Span(label, rows_of(args[0]) if args else None) as s:
+                result = func(*args, **kwargs)
+                s.rows_out = rows_of(result)
+                return result
+        return wrapper
+    return decorate
+
+
+# --- Output ---
+
+def _emit(record):
+    global _file
+    line = json.dumps(record, default=str) + '\n'
+    with _lock:
+        if _file is None:
+            _file = sys.stderr if _path == '-' else open(_path, 'a', encoding='utf-8', buffering=1)
+        _file.write(line)
+
+
+def enable(path=DEFAULT_PATH, chrome=None):
+    """Start tracing to ``path`` ('-' for stderr); with ``chrome`` also write that file at exit."""
+    global enabled, _since, _path, _chrome, _file
+    _path, _chrome, _file = path, chrome, None
+    _since = time.time()
+    enabled = True
+    if chrome:
+        atexit.register(_write_chrome_at_exit)
+
+
+def disable():
+    global enabled, _file
+    enabled = False
+    with _lock:
+        if _file is not None and _file is not sys.stderr:
+            _file.close()
+        _file = None
+
+
+def read_trace(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def chrome_trace(records):
+    """Chrome trace-event JSON (complete 'X' events) for a list of span records."""
+    events = []
+    for record in records:
+        args = {key: record[key] for key in ('rows_in', 'rows_out', 'cpu_s', 'rss_delta_mb') if record.get(key) is not None}
+        args.update(record.get('attrs') or {})
+        events.append({
+            'name': record['name'],
+            'cat': record['name'].split('.', 1)[0],
+            'ph': 'X',
+            'ts': record['start'] * 1e6,
+            'dur': record['wall_s'] * 1e6,
+            'pid': record['pid'],
+            'tid': record['tid'],
+            'args': args,
+        })
+    return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+
+def write_chrome(records, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(chrome_trace(records), f, default=str)
+    return path
+
+
+def _write_chrome_at_exit():
+    # Only the top-level process converts; pool workers just append lines
+    import multiprocessing
+
+    if multiprocessing.parent_process() is not None:
+        return
+    if not _chrome or _path == '-' or not os.path.exists(_path):
+        return
+    disable()
+    # The JSON-lines file is appended to across runs; keep this run's spans
+    write_chrome([r for r in read_trace(_path) if r['start'] >= _since], _chrome)
+
+
+def summarize(records, top=20):
+    """``(name, calls, total wall, total cpu, max rss delta)`` per span name, slowest first."""
+    totals = {}
+    for record in records:
+        calls, wall, cpu, rss = totals.get(record['name'], (0, 0.0, 0.0, 0.0))
+        totals[record['name']] = (calls + 1, wall + record['wall_s'], cpu + record['cpu_s'],
+                                  max(rss, record.get('rss_delta_mb') or 0.0))
+    rows = sorted(((name,) + value for name, value in totals.items()), key=lambda row: -row[2])
+    return rows[:top]
+
+
+_value = os.environ.get(ENV, '').strip()
+if _value and _value.lower() not in OFF_VALUES:
+    enable(DEFAULT_PATH if _value.lower() in ON_VALUES else _value, os.environ.get(CHROME_ENV) or None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Summarize a JSON-lines trace written with SCA_TRACE.')
+    parser.add_argument('path', nargs='?', default=DEFAULT_PATH)
+    parser.add_argument('--chrome', help='also write a Chrome trace-event file')
+    parser.add_argument('--top', type=int, default=20)
+    args = parser.parse_args()
+
+    records = read_trace(args.path)
+    print(f"{'span':<40} {'calls':>6} {'wall s':>9} {'cpu s':>9} {'max +MB':>8}")
+    for name, calls, wall, cpu, rss in summarize(records, args.top):
+        print(f"{name:<40} {calls:>6} {wall:>9.3f} {cpu:>9.3f} {rss:>8.1f}")
+    if args.chrome:
+        print(f"chrome trace written to {write_chrome(records, args.chrome)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+DATA = os.path.join(ROOT, 'data', 'SCA.csv')
+# Columns blanked at random in the ``messy`` frames: keys and metrics of the summaries
+MESSY_COLUMNS = ['Supplier_name', 'Customer_demographics', 'Transportation_modes', 'Defect_rates', 'Lead_time',
+                 'Price', 'Shipping_costs', 'Number_of_products_sold']
+
+
+def tile(raw, rows):
+    """``raw`` repeated up to ``rows`` rows, SKUs suffixed per copy."""
+    copies = -(-rows // len(raw))
+    frames = []
+    for i in range(copies):
+        part = raw.copy()
+        part['SKU'] = part['SKU'] + f'-{i}'
+        frames.append(part)
+    return pd.concat(frames, ignore_index=True).iloc[:rows]
+
+
+def compacted(df):
+    """Text columns as categoricals and whole-number columns as integers, as the loaded dataset has them."""
+    df = df.copy()
+    for col in df.columns:
+        if not pd.api.types.is_numeric_dtype(df[col].dtype):
+            df[col] = df[col].astype('category')
+        elif df[col].notna().all() and (df[col] % 1 == 0).all():
+            df[col] = df[col].astype(np.int64)
+    return df
+
+
+# The SCA.py group-bys behind each summary table: keys, {column: reduction}, and the
+# column the table is then sorted by (descending), if any
+REFERENCE = {
+    'product_summary': (['Product_type', 'SKU'], {'Revenue_generated': 'sum', 'Number_of_products_sold': 'sum',
+                                                  'Price': 'mean'}, None),
+    'sales_by_product_type': (['Product_type'], {'Number_of_products_sold': 'sum'}, None),
+    'revenue_by_demo': (['Customer_demographics'], {'Revenue_generated': 'sum'}, None),
+    'sales_by_demo_product': (['Product_type', 'Customer_demographics'], {'Number_of_products_sold': 'sum'}, None),
+    'supplier_by_demo': (['Supplier_name', 'Customer_demographics'], {'Count': 'size'}, None),
+    'supplier_demo_product': (['Supplier_name', 'Customer_demographics', 'Product_type'], {'Product_Count': 'size'},
+                              None),
+    'supplier_summary': (['Supplier_name'], {'Lead_time': 'mean', 'Production_volumes': 'sum',
+                                             'Manufacturing_costs': 'mean', 'Defect_rates': 'mean'}, None),
+    'shipping_summary': (['Shipping_carriers'], {'Shipping_times': 'sum', 'Shipping_costs': 'sum', 'Costs': 'sum'},
+                         None),
+    'transport_defects': (['Transportation_modes'], {'Defect_rates': 'mean'}, None),
+    'product_type_defects': (['Product_type'], {'Defect_rates': 'mean'}, None),
+    'sku_revenue': (['SKU', 'Product_type'], {'Revenue_generated': 'sum'}, None),
+    'sku_orders': (['SKU', 'Product_type'], {'Number_of_products_sold': 'sum'}, None),
+    'transport_costs': (['Transportation_modes'], {'Shipping_costs': 'sum'}, None),
+    'transport_mode_costs': (['Transportation_modes'], {'Costs': 'sum'}, None),
+    'carrier_costs': (['Shipping_carriers'], {'Shipping_costs': 'mean'}, None),
+    'supplier_demand': (['Supplier_name'], {'Number_of_products_sold': 'sum'}, 'Number_of_products_sold'),
+    'supplier_defects': (['Supplier_name'], {'Defect_rates': 'mean'}, 'Defect_rates'),
+    'carrier_defects': (['Shipping_carriers'], {'Defect_rates': 'mean'}, None),
+}
+
+
+def expected_summary(df, name):
+    """A summary table computed with a plain ``groupby``, as SCA.py did."""
+    if name == 'product_type_dist':
+        expected = df['Product_type'].value_counts().reset_index()
+        expected.columns = ['Product_type', 'Count']
+        return expected
+    keys, spec, order = REFERENCE[name]
+    # The engines accumulate in float64; pandas would keep float32 columns in float32
+    df = df.astype({col: np.float64 for col in spec if col in df and pd.api.types.is_float_dtype(df[col].dtype)})
+    grouped = df.groupby(keys, observed=True, sort=True)
+    result = grouped.size().reset_index()[keys]
+    for col, how in spec.items():
+        result[col] = (grouped.size() if how == 'size' else grouped[col].agg(how)).to_numpy()
+    return result if order is None else result.sort_values(order, ascending=False)
+
+
+def assert_same_table(actual, expected):
+    """Equal up to float rounding; key columns compared as text, so categorical and object keys match."""
+    actual, expected = actual.reset_index(drop=True), expected.reset_index(drop=True)
+    assert list(actual.columns) == list(expected.columns)
+    for col in expected.columns:
+        if pd.api.types.is_numeric_dtype(expected[col].dtype):
+            np.testing.assert_allclose(actual[col].to_numpy(dtype=np.float64), expected[col].to_numpy(dtype=np.float64),
+                                       rtol=1e-9, equal_nan=True, err_msg=col)
+        else:
+            assert actual[col].astype(str).tolist() == expected[col].astype(str).tolist(), col
+
+
+@pytest.fixture(scope='session')
+def raw():
+    return pd.read_csv(DATA)
+
+
+@pytest.fixture(scope='session')
+def compact(raw):
+    return compacted(raw)
+
+
+@pytest.fixture(scope='session')
+def messy(raw):
+    df = tile(raw, 1000)
+    rng = np.random.default_rng(0)
+    for col in MESSY_COLUMNS:
+        df.loc[rng.random(len(df)) < 0.05, col] = np.nan
+    return df
+
+
+@pytest.fixture(scope='session')
+def messy_compact(messy):
+    return compacted(messy)
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+from conftest import assert_same_table, expected_summary, tile
+
+from sca.aggregate import BLOCK_ROWS, SUMMARIES, SUMMARY_SPECS, Aggregator, summaries
+
+FRAMES = ['raw', 'compact', 'messy', 'messy_compact']
+
+
+@pytest.mark.parametrize('frame', FRAMES)
+@pytest.mark.parametrize('name', SUMMARIES)
+def test_summary_matches_groupby(request, frame, name):
+    df = request.getfixturevalue(frame)
+    assert_same_table(getattr(Aggregator(df), name)(), expected_summary(df, name))
+
+
+def test_agg_count_and_size_skip_missing_keys(messy):
+    spec = {'Defect_rates': 'count', 'Lead_time': 'mean'}
+    agg = Aggregator(messy)
+    result = agg.agg(['Supplier_name', 'Transportation_modes'], spec)
+    sizes = agg.size_frame(['Supplier_name', 'Transportation_modes'])
+    grouped = messy.groupby(['Supplier_name', 'Transportation_modes'], observed=True)
+    assert sizes['size'].sum() == messy[['Supplier_name', 'Transportation_modes']].notna().all(axis=1).sum()
+    np.testing.assert_array_equal(sizes['size'], grouped.size().to_numpy())
+    np.testing.assert_array_equal(result['Defect_rates'], grouped['Defect_rates'].count().to_numpy())
+    np.testing.assert_allclose(result['Lead_time'], grouped['Lead_time'].mean().to_numpy(), rtol=1e-12)
+
+
+def test_integer_sums_stay_integer(compact):
+    result = Aggregator(compact).sales_by_product_type()
+    assert pd.api.types.is_integer_dtype(result['Number_of_products_sold'].dtype)
+
+
+def test_float_sums_do_not_depend_on_row_count_per_block(raw):
+    # Block-wise float sums over many blocks still agree with a plain group-by
+    df = tile(raw, 2 * BLOCK_ROWS + 123)
+    assert_same_table(Aggregator(df).supplier_summary(), expected_summary(df, 'supplier_summary'))
+
+
+@pytest.mark.parametrize('name', list(SUMMARY_SPECS))
+def test_spec_tables_match_the_named_methods(messy, name):
+    # summary(name) leaves every table in key order, before any ranking sort
+    assert_same_table(Aggregator(messy).summary(name), expected_summary(messy, name).sort_index())
+
+
+def test_many_keys_compress_without_overflow(messy):
+    keys = ['SKU', 'Product_type', 'Supplier_name', 'Location', 'Customer_demographics', 'Routes']
+    sizes = Aggregator(messy).size_frame(keys)
+    expected = messy.groupby(keys, observed=True).size().reset_index(name='size')
+    assert_same_table(sizes, expected)
+
+
+def test_summaries_cover_every_table(raw):
+    tables = summaries(raw)
+    assert list(tables) == SUMMARIES
@@ -0,0 +1,108 @@
+import os
+import subprocess
+import sys
+
+import pandas as pd
+import pytest
+from conftest import ROOT, assert_same_table, expected_summary
+
+from sca import cube as cube_module
+from sca.analysis import TABLES, Analysis
+from sca.anomaly import detect_anomalies
+from sca.cleaning import clean
+from sca.cube import summary_layout
+from sca.partition import ProcessBackend
+from sca.results import ResultCache
+
+SUMMARIES = ['sales_by_product_type', 'revenue_by_demo', 'supplier_summary', 'shipping_summary',
+             'transport_defects', 'product_type_dist']
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    """``(dims, metrics)`` of every cube built during the test."""
+    calls = []
+    build = cube_module.Cube.build.__func__
+
+    def recording(cls, df, dims=None, metrics=None, **options):
+        cube = build(cls, df, dims, metrics, **options)
+        calls.append((cube.dims, cube.metrics))
+        return cube
+
+    monkeypatch.setattr(cube_module.Cube, 'build', classmethod(recording))
+    return calls
+
+
+def test_one_off_tables_do_not_build_a_cube(compact, builds):
+    analysis = Analysis(compact)
+    assert_same_table(analysis.supplier_summary, expected_summary(compact, 'supplier_summary'))
+    assert_same_table(analysis.transport_defects, expected_summary(compact, 'transport_defects'))
+    assert builds == []
+
+
+def test_tables_share_a_cube_over_their_keys_only(compact, builds):
+    tables = Analysis(compact).tables(SUMMARIES + ['product_summary'])
+    dims, metrics, covered = summary_layout(SUMMARIES)
+    assert builds == [(dims, metrics)]
+    assert covered == SUMMARIES
+    assert set(dims) == {'Product_type', 'Customer_demographics', 'Supplier_name', 'Shipping_carriers',
+                         'Transportation_modes'}
+    for name in SUMMARIES + ['product_summary']:
+        assert_same_table(tables[name], expected_summary(compact, name))
+
+
+def test_tables_roll_up_from_a_built_cube(messy, builds):
+    analysis = Analysis(messy)
+    assert analysis.cube is not None
+    tables = analysis.tables(SUMMARIES)
+    assert len(builds) == 1 and len(builds[0][0]) == 8
+    for name in SUMMARIES:
+        assert_same_table(tables[name], expected_summary(messy, name))
+
+
+def test_a_single_summary_in_a_batch_groups_the_rows(compact, builds):
+    Analysis(compact).tables(['supplier_summary', 'inventory_summary'])
+    assert builds == []
+
+
+def test_every_table_is_computed_once(compact):
+    analysis = Analysis(compact)
+    tables = analysis.tables()
+    assert list(tables) == TABLES
+    for name in TABLES:
+        assert analysis.table(name) is tables[name]
+    with pytest.raises(KeyError):
+        analysis.table('nope')
+
+
+def test_closing_shuts_down_the_backend(messy):
+    backend = ProcessBackend(workers=2)
+    with Analysis(messy, backend=backend) as analysis:
+        assert_same_table(analysis.supplier_summary, expected_summary(messy, 'supplier_summary'))
+        assert backend._pool is not None
+    assert backend._pool is None
+    with Analysis(messy, backend='processes') as analysis:
+        analysis.supplier_summary
+        backend = analysis.agg.backend
+    assert backend._pool is None
+
+
+def test_anomalies_score_the_unclipped_values(tmp_path):
+    raw = pd.read_csv(os.path.join(ROOT, 'data', 'supply_chain.csv'))
+    raw.loc[7, 'Defect rates'] = 50.0
+    clipped = clean(raw).reset_index(drop=True)
+    unclipped = clean(raw, clip=False).reset_index(drop=True)
+    path = str(tmp_path / 'supply_chain.csv')
+    raw.to_csv(path, index=False)
+    cache = ResultCache(str(tmp_path / 'results'))
+    # Clipped to its IQR fence, the outlier no longer stands out
+    assert 7 not in Analysis(clipped, cache=cache).anomalies['row'].tolist()
+    for source in [unclipped, path]:
+        flagged = Analysis(clipped, cache=cache, unclipped=source).anomalies
+        pd.testing.assert_frame_equal(flagged, detect_anomalies(unclipped))
+        assert flagged.iloc[0][['row', 'column', 'value']].tolist() == [7, 'Defect_rates', 50.0]
+
+
+def test_import_leaves_pandas_unloaded():
+    code = 'import sys, sca.analysis; sys.exit("pandas" in sys.modules or "numpy" in sys.modules)'
+    assert subprocess.run([sys.executable, '-c', code], cwd=ROOT).returncode == 0
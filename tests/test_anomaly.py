@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from sca import anomaly
+from sca.anomaly import GROUPS, detect_anomalies, robust_zscores
+
+COLUMNS = GROUPS['Supplier_name']
+
+
+def reference_z(df, columns, by):
+    """Robust z-scores from pandas group medians (MAD, then mean deviation where the MAD is 0)."""
+    grouped = df.groupby(by, observed=True)
+    z = pd.DataFrame(index=df.index)
+    for col in columns:
+        median = grouped[col].transform('median')
+        deviation = (df[col] - median).abs()
+        mad = deviation.groupby(df[by], observed=True).transform('median')
+        mean_ad = deviation.groupby(df[by], observed=True).transform('mean')
+        scale = np.where(mad > 0, 1.4826 * mad, 1.2533 * mean_ad)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z[col] = (df[col] - median) / scale
+        z.loc[z[col].isna() & df[col].notna(), col] = 0.0
+    return z.to_numpy()
+
+
+@pytest.mark.parametrize('frame', ['raw', 'messy'])
+def test_zscores_match_pandas(request, frame):
+    df = request.getfixturevalue(frame).dropna(subset=['Supplier_name'])
+    z, codes, medians, scales = robust_zscores(df, COLUMNS, 'Supplier_name')
+    np.testing.assert_allclose(z, reference_z(df, COLUMNS, 'Supplier_name'), rtol=1e-12, equal_nan=True)
+    # One extra group holds rows without a supplier
+    assert medians.shape == scales.shape == (df['Supplier_name'].nunique() + 1, len(COLUMNS))
+    assert codes.max() < df['Supplier_name'].nunique()
+
+
+def test_both_median_paths_agree(messy, monkeypatch):
+    df = messy.assign(Many=np.arange(len(messy)) % 300)
+    looped = robust_zscores(df, COLUMNS, 'Many')
+    monkeypatch.setattr(anomaly, 'MAX_LOOP_GROUPS', 1)
+    sorted_ = robust_zscores(df, COLUMNS, 'Many')
+    for a, b in zip(looped, sorted_):
+        np.testing.assert_allclose(a, b, rtol=1e-12, equal_nan=True)
+
+
+def test_constant_groups_flag_only_values_off_the_median():
+    df = pd.DataFrame({'g': ['a'] * 6 + ['b'] * 4, 'x': [5.0] * 5 + [9.0] + [1.0, 1.0, 1.0, np.nan]})
+    z, _, _, scales = robust_zscores(df, ['x'], 'g')
+    # Group a: MAD 0, mean deviation 4/6 stands in; group b: both 0
+    assert z[5, 0] == pytest.approx(4 / (1.2533 * 4 / 6))
+    np.testing.assert_array_equal(z[6:9, 0], 0.0)
+    assert np.isnan(z[9, 0])
+    assert scales[1, 0] == 0.0
+
+
+def test_detect_flags_injected_outliers(raw):
+    df = raw.copy()
+    df.loc[7, 'Defect_rates'] = 50.0
+    df.loc[42, 'Shipping_costs'] = -30.0
+    flagged = detect_anomalies(df)
+    assert (flagged['robust_z'].abs() > 3.5).all()
+    assert flagged['robust_z'].abs().is_monotonic_decreasing
+    top = flagged.set_index(['row', 'column'])
+    assert top.loc[(7, 'Defect_rates'), 'group'] == df.loc[7, 'Supplier_name']
+    assert top.loc[(42, 'Shipping_costs'), 'robust_z'] < 0
+    assert len(detect_anomalies(df, threshold=np.inf)) == 0
+    assert list(detect_anomalies(df, groups={'Nope': ['Price']}).columns) == list(flagged.columns)
@@ -0,0 +1,63 @@
+import os
+import sys
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+from conftest import DATA, ROOT, tile
+
+from sca.cleaning import clean, clip_outliers, iqr_bounds, looks_like_dates
+
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from bench_cleaning import legacy_clean  # noqa: E402
+
+SOURCE = os.path.join(ROOT, 'data', 'supply_chain.csv')
+
+
+@pytest.fixture(scope='module')
+def supply_chain():
+    return pd.read_csv(SOURCE)
+
+
+def legacy(data):
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        return legacy_clean(data.copy())
+
+
+def test_clean_reproduces_the_cleaned_csv(supply_chain):
+    expected = pd.read_csv(DATA)
+    pd.testing.assert_frame_equal(clean(supply_chain).reset_index(drop=True), expected, check_dtype=False)
+
+
+def test_clean_matches_the_notebook_on_gappy_data(supply_chain):
+    data = tile(supply_chain, 500)
+    rng = np.random.default_rng(1)
+    for col in ['Price', 'Lead times', 'Supplier name', 'Transportation modes']:
+        data.loc[rng.random(len(data)) < 0.1, col] = np.nan
+    data['Mostly empty'] = np.where(rng.random(len(data)) < 0.8, np.nan, 1.0)
+    data = pd.concat([data, data.iloc[:20]], ignore_index=True)
+    result = clean(data)
+    assert 'Mostly_empty' not in result
+    assert not result.isna().any().any()
+    pd.testing.assert_frame_equal(result, legacy(data), check_dtype=False)
+
+
+def test_date_columns_are_parsed():
+    data = pd.DataFrame({'When': ['2023-01-0%d' % i for i in range(1, 10)], 'What': [' a!'] * 9,
+                         'Amount': np.arange(9.0)})
+    assert looks_like_dates(data['When'])
+    assert not looks_like_dates(data['What'])
+    result = clean(data)
+    assert pd.api.types.is_datetime64_any_dtype(result['When'].dtype)
+    assert (result['What'] == 'a').all()
+
+
+def test_clip_stays_inside_the_iqr_fences(supply_chain):
+    columns = supply_chain.select_dtypes('number').columns
+    lower, upper = iqr_bounds(supply_chain, columns)
+    clipped = clip_outliers(supply_chain)
+    for col in columns:
+        assert clipped[col].min() >= lower[col] and clipped[col].max() <= upper[col], col
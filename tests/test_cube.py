@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+from conftest import assert_same_table, expected_summary
+
+from sca.aggregate import SUMMARY_SPECS, Aggregator
+from sca.cube import Cube, cube_nbytes
+
+FRAMES = ['raw', 'compact', 'messy', 'messy_compact']
+CUBE_SUMMARIES = [name for name, (keys, _) in SUMMARY_SPECS.items() if 'SKU' not in keys]
+
+
+@pytest.mark.parametrize('frame', FRAMES)
+def test_rollups_match_groupby(request, frame):
+    df = request.getfixturevalue(frame)
+    cube = Cube.build(df)
+    for name in CUBE_SUMMARIES:
+        assert cube.covers(name)
+        assert_same_table(getattr(cube, name)(), expected_summary(df, name))
+    assert not cube.covers('product_summary')
+
+
+@pytest.mark.parametrize('frame', FRAMES)
+@pytest.mark.parametrize('keys', ['Location', ['Routes', 'Supplier_name'], ['Inspection_results', 'Product_type']])
+def test_agg_reductions_match_groupby(request, frame, keys):
+    df = request.getfixturevalue(frame)
+    metrics = ['Defect_rates', 'Price', 'Stock_levels']
+    spec = {'Defect_rates': 'count', 'Price': 'mean', 'Stock_levels': 'sum', 'rows': 'size'}
+    result = Cube.build(df, metrics=metrics).agg(keys, spec)
+    grouped = df.astype({col: np.float64 for col in metrics}).groupby(keys, observed=True)
+    expected = grouped.size().reset_index()[[keys] if isinstance(keys, str) else keys]
+    for col, how in spec.items():
+        expected[col] = (grouped.size() if how == 'size' else grouped[col].agg(how)).to_numpy()
+    assert_same_table(result, expected)
+
+    spread = Cube.build(df, metrics=metrics).agg(keys, {'Defect_rates': 'std', 'Price': 'var'})
+    np.testing.assert_allclose(spread['Defect_rates'], grouped['Defect_rates'].std().to_numpy(), rtol=1e-6,
+                               equal_nan=True)
+    np.testing.assert_allclose(spread['Price'], grouped['Price'].var().to_numpy(), rtol=1e-6, equal_nan=True)
+
+
+def test_slice_matches_filtered_groupby(messy):
+    cube = Cube.build(messy)
+    sliced = cube.slice(Transportation_modes=['Air', 'Rail'], Location='Mumbai')
+    rows = messy[messy['Transportation_modes'].isin(['Air', 'Rail']) & (messy['Location'] == 'Mumbai')]
+    for name in ['supplier_summary', 'shipping_summary', 'sales_by_demo_product']:
+        assert_same_table(getattr(sliced, name)(), expected_summary(rows, name))
+    with pytest.raises(KeyError):
+        cube.slice(Location='Nowhere')
+
+
+def test_product_type_dist_matches_aggregator(compact):
+    assert_same_table(Cube.build(compact).product_type_dist(), Aggregator(compact).product_type_dist())
+
+
+def test_size_limit_counts_every_array(raw):
+    cube = Cube.build(raw)
+    assert cube.nbytes == cube_nbytes(cube.shape, len(cube.metrics))
+    assert Cube.fits(raw, max_bytes=cube.nbytes)
+    assert not Cube.fits(raw, max_bytes=cube.nbytes - 1)
+    with pytest.raises(ValueError):
+        Cube.build(raw, max_bytes=cube.nbytes - 1)
+
+
+def test_too_large_cube_falls_back_to_group_by(raw):
+    from sca.analysis import Analysis
+
+    df = raw.copy()
+    # 100 distinct suppliers and locations: 3.24 billion cells over the 8 dimensions
+    df['Supplier_name'] = [f'Supplier {i}' for i in range(len(df))]
+    df['Location'] = pd.Series([f'City {i}' for i in range(len(df))]).sample(frac=1, random_state=0).to_numpy()
+    assert not Cube.fits(df)
+    analysis = Analysis(df)
+    assert analysis.cube is None
+    assert_same_table(analysis.supplier_summary, expected_summary(df, 'supplier_summary'))
+    assert len(analysis.route_plan) == len(df)
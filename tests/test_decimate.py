@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from sca.decimate import bin_scatter, decimate_lines, hex_bins, lttb, minmax, rect_bins
+
+
+@pytest.fixture(scope='module')
+def walk():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'SKU': [f'SKU{i}' for i in range(20_000)],
+        'Product_type': rng.choice(['haircare', 'skincare', 'cosmetics'], 20_000),
+        'Price': rng.standard_normal(20_000).cumsum(),
+        'Revenue_generated': rng.random(20_000) * 1000,
+        'Number_of_products_sold': rng.integers(0, 1000, 20_000),
+    })
+
+
+def test_lttb_keeps_ends_and_spikes():
+    y = np.zeros(10_000)
+    y[4321] = 50.0
+    picks = lttb(y, 100)
+    assert len(picks) == 100
+    assert picks[0] == 0 and picks[-1] == len(y) - 1
+    assert np.all(np.diff(picks) > 0)
+    assert 4321 in picks
+
+
+def test_minmax_keeps_every_bucket_extreme():
+    y = np.random.default_rng(1).standard_normal(10_000)
+    picks = minmax(y, 200)
+    assert len(picks) <= 200
+    assert y.argmin() in picks and y.argmax() in picks
+
+
+def test_small_inputs_are_unchanged(walk):
+    small = walk.iloc[:500]
+    assert decimate_lines(small, 'Price', by='Product_type') is small
+    assert bin_scatter(small, 'Price', 'Revenue_generated', color='Product_type') is small
+    np.testing.assert_array_equal(lttb(np.arange(5.0), 10), np.arange(5))
+
+
+@pytest.mark.parametrize('method', ['lttb', 'minmax'])
+def test_lines_fit_the_budget_per_group(walk, method):
+    result = decimate_lines(walk, 'Price', by='Product_type', budget=600, method=method)
+    assert len(result) <= 600 + 3 * 3
+    assert result.index.is_monotonic_increasing
+    assert set(result['Product_type']) == set(walk['Product_type'])
+
+
+@pytest.mark.parametrize('shape', ['rect', 'hex'])
+def test_bins_conserve_points_and_sizes(walk, shape):
+    binned = bin_scatter(walk, 'Price', 'Revenue_generated', color='Product_type', size='Number_of_products_sold',
+                         budget=500, shape=shape)
+    assert len(binned) <= 500
+    assert binned['Points'].sum() == len(walk)
+    assert binned['Number_of_products_sold'].sum() == pytest.approx(walk['Number_of_products_sold'].sum())
+    expected = walk.groupby('Product_type').size()
+    assert binned.groupby('Product_type')['Points'].sum().to_dict() == expected.to_dict()
+    assert binned['SKU'].str.contains(r'\(\+\d+ more\)').any()
+
+
+def test_bin_ids_stay_in_range():
+    rng = np.random.default_rng(2)
+    x, y = rng.random(5000), rng.random(5000)
+    assert rect_bins(x, y, 10).max() < 100
+    cells = hex_bins(x, y, 10)
+    assert cells.min() >= 0
+    # Nearby points share a cell; far apart ones do not
+    near = hex_bins(np.array([0.5, 0.501, 0.0]), np.array([0.5, 0.501, 1.0]), 10)
+    assert near[0] == near[1] != near[2]
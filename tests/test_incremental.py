@@ -0,0 +1,78 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from conftest import ROOT, assert_same_table
+
+from sca.aggregate import SUMMARIES, Aggregator
+from sca.cleaning import clean
+from sca.incremental import IncrementalCleaner, IncrementalPipeline
+from sca.sketch import KLLSketch
+
+SOURCE = os.path.join(ROOT, 'data', 'supply_chain.csv')
+
+
+@pytest.fixture(scope='module')
+def supply_chain():
+    return pd.read_csv(SOURCE)
+
+
+def test_batches_reproduce_clean(supply_chain):
+    cleaner = IncrementalCleaner()
+    batches = [cleaner.update(supply_chain.iloc[:60]), cleaner.update(supply_chain.iloc[60:])]
+    pd.testing.assert_frame_equal(pd.concat(batches), clean(supply_chain), check_dtype=False)
+    assert cleaner.rows_in == cleaner.rows_out == len(supply_chain)
+
+
+def test_rows_seen_in_earlier_batches_are_dropped(supply_chain):
+    cleaner = IncrementalCleaner()
+    cleaner.update(supply_chain.iloc[:60])
+    again = cleaner.update(pd.concat([supply_chain.iloc[50:70], supply_chain.iloc[65:70]]))
+    assert len(again) == 10
+    assert cleaner.rows_out == 70
+
+
+def test_pipeline_summaries_match_one_pass(supply_chain, tmp_path):
+    state = str(tmp_path / 'SCA.state')
+    output = str(tmp_path / 'SCA.csv')
+    pipeline = IncrementalPipeline.load(state)
+    pipeline.update(supply_chain.iloc[:60], output=output)
+    pipeline.save(state)
+    pipeline = IncrementalPipeline.load(state)
+    pipeline.update(supply_chain.iloc[60:], output=output)
+    cleaned = pd.read_csv(output)
+    pd.testing.assert_frame_equal(cleaned, clean(supply_chain).reset_index(drop=True), check_dtype=False)
+    agg = Aggregator(cleaned)
+    tables = pipeline.summaries()
+    assert list(tables) == SUMMARIES
+    for name, table in tables.items():
+        assert_same_table(table, getattr(agg, name)())
+
+
+def test_sketch_is_exact_below_k():
+    values = np.random.default_rng(0).standard_normal(500)
+    sketch = KLLSketch(k=1024)
+    for batch in np.array_split(values, 7):
+        sketch.update(batch)
+    assert sketch.exact
+    qs = [0, 0.25, 0.5, 0.75, 1]
+    np.testing.assert_allclose(sketch.quantile(qs), pd.Series(values).quantile(qs).to_numpy())
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_sketch_rank_error_stays_bounded(seed):
+    rng = np.random.default_rng(seed)
+    values = rng.standard_normal(100_000)
+    left, right = KLLSketch(k=200, seed=seed), KLLSketch(k=200, seed=seed + 10)
+    for batch in np.array_split(values[:60_000], 23):
+        left.update(batch)
+    for batch in np.array_split(values[60_000:], 17):
+        right.update(batch)
+    sketch = left.merge(right)
+    assert len(sketch) == len(values)
+    assert sum(len(items) for items in sketch.levels) < 3 * 200
+    qs = np.linspace(0.01, 0.99, 99)
+    ranks = np.searchsorted(np.sort(values), sketch.quantile(qs)) / len(values)
+    # KLL's rank error is O(1/k); 0.02 leaves a wide margin at k=200
+    assert np.abs(ranks - qs).max() < 0.02
@@ -0,0 +1,56 @@
+import pytest
+from conftest import assert_same_table, expected_summary, tile
+
+from sca.aggregate import BLOCK_ROWS, SUMMARIES, summaries
+from sca.analysis import inventory_turnover
+from sca.partition import (TURNOVER, PartitionedAggregator, ProcessBackend, SerialBackend, check_equal,
+                           partitioned_summaries, shard_bounds)
+
+
+def single_process(df):
+    expected = summaries(df)
+    expected[TURNOVER] = inventory_turnover(df)
+    return expected
+
+
+def test_shard_bounds_cover_every_row():
+    for n, shards in [(0, 3), (5, 8), (100, 7), (1000, 1)]:
+        bounds = shard_bounds(n, shards)
+        rows = [i for lo, hi in bounds for i in range(lo, hi)]
+        assert rows == list(range(n))
+
+
+@pytest.mark.parametrize('frame', ['raw', 'compact', 'messy', 'messy_compact'])
+@pytest.mark.parametrize('shards', [1, 3, 7])
+def test_serial_shards_are_identical(request, frame, shards):
+    df = request.getfixturevalue(frame)
+    check_equal(single_process(df), partitioned_summaries(df, backend=SerialBackend(), shards=shards))
+
+
+def test_shards_spanning_several_blocks_are_identical(compact):
+    # Float sums are folded per BLOCK_ROWS block, so shards may split blocks anywhere
+    df = tile(compact.astype({'SKU': str}), 2 * BLOCK_ROWS + 4321)
+    check_equal(single_process(df), partitioned_summaries(df, backend=SerialBackend(), shards=5))
+
+
+def test_process_backend_is_identical(messy_compact):
+    with ProcessBackend(workers=2) as backend:
+        tables = partitioned_summaries(messy_compact, backend=backend, shards=4)
+    check_equal(single_process(messy_compact), tables)
+
+
+def test_process_backend_reuses_its_pool():
+    with ProcessBackend(workers=2) as backend:
+        assert backend.map(abs, [-1, 2, -3]) == [1, 2, 3]
+        pool = backend._pool
+        assert backend.map(abs, [-4]) == [4]
+        assert backend._pool is pool
+    assert backend._pool is None
+
+
+def test_partitioned_aggregator_matches_groupby(messy):
+    agg = PartitionedAggregator(messy, backend='serial', shards=4)
+    agg.prefetch(SUMMARIES)
+    for name in ['supplier_summary', 'shipping_summary', 'supplier_by_demo', 'product_summary']:
+        assert_same_table(getattr(agg, name)(), expected_summary(messy, name))
+    assert_same_table(agg.inventory_turnover(), inventory_turnover(messy))
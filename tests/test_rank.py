@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from sca.rank import bottom_k, extremes, select_k, top_k
+
+COLUMNS = ['Revenue_generated', 'Defect_rates', 'Stock_levels', 'Number_of_products_sold']
+
+
+def stable_sorted(df, col, largest=True):
+    # Reference order: best first, ties in row order, missing values dropped
+    values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+    keep = np.flatnonzero(~np.isnan(values))
+    order = keep[np.argsort(-values[keep] if largest else values[keep], kind='stable')]
+    return df.iloc[order]
+
+
+@pytest.mark.parametrize('frame', ['raw', 'compact', 'messy'])
+@pytest.mark.parametrize('col', COLUMNS)
+@pytest.mark.parametrize('k', [0, 1, 3, 10, 5000])
+def test_top_and_bottom_k_match_a_stable_sort(request, frame, col, k):
+    df = request.getfixturevalue(frame)
+    pd.testing.assert_frame_equal(top_k(df, col, k), stable_sorted(df, col).head(k))
+    pd.testing.assert_frame_equal(bottom_k(df, col, k), stable_sorted(df, col, largest=False).head(k))
+
+
+@pytest.mark.parametrize('frame', ['raw', 'compact', 'messy'])
+@pytest.mark.parametrize('by', ['Product_type', ['Supplier_name', 'Transportation_modes']])
+@pytest.mark.parametrize('col', COLUMNS)
+def test_grouped_top_k_matches_sort_then_head(request, frame, by, col):
+    df = request.getfixturevalue(frame)
+    keys = [by] if isinstance(by, str) else by
+    best = stable_sorted(df, col).dropna(subset=keys)
+    expected = best.groupby(keys, observed=True, sort=False).head(3)
+    # Groups in sorted key order, rows within a group best first
+    group = expected.groupby(keys, observed=True, sort=True).ngroup().to_numpy()
+    expected = expected.iloc[np.argsort(group, kind='stable')]
+    pd.testing.assert_frame_equal(top_k(df, col, 3, by=by), expected)
+
+
+def test_ties_break_by_row_order():
+    df = pd.DataFrame({'x': [1.0, 5.0, 5.0, np.nan, 5.0, 2.0]})
+    assert top_k(df, 'x', 2).index.tolist() == [1, 2]
+    assert bottom_k(df, 'x', 2).index.tolist() == [0, 5]
+    assert select_k(df['x'], 10).tolist() == [1, 2, 4, 5, 0]
+
+
+@pytest.mark.parametrize('col', ['Revenue_generated', 'Defect_rates'])
+def test_extremes_match_sort_head_and_tail(raw, col):
+    ordered = raw.sort_values(col, ascending=False)
+    expected = pd.concat([ordered.head(3), ordered.tail(3)])
+    pd.testing.assert_frame_equal(extremes(raw, col, 3), expected)
@@ -0,0 +1,86 @@
+import os
+import shutil
+import time
+
+import pandas as pd
+import pytest
+from conftest import DATA
+
+from sca.analysis import Analysis
+from sca.results import ResultCache, file_fingerprint, frame_fingerprint
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResultCache(str(tmp_path / 'results'))
+
+
+def test_key_changes_with_data_name_and_params(cache):
+    key = cache.key('data', 'table', 'supplier_summary')
+    assert key == cache.key('data', 'table', 'supplier_summary', {})
+    assert key != cache.key('other data', 'table', 'supplier_summary')
+    assert key != cache.key('data', 'figure', 'supplier_summary')
+    assert key != cache.key('data', 'table', 'shipping_summary')
+    assert key != cache.key('data', 'table', 'supplier_summary', {'budget': 100})
+
+
+def test_get_or_compute_only_computes_on_a_miss(cache):
+    calls = []
+    key = cache.key('data', 'table', 'x')
+    assert cache.get_or_compute(key, lambda: calls.append(1) or 'value') == 'value'
+    assert cache.get_or_compute(key, lambda: calls.append(1) or 'other') == 'value'
+    assert calls == [1]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_corrupt_entries_are_misses(cache):
+    key = cache.key('data', 'table', 'x')
+    cache.put(key, 1)
+    with open(cache.entries()[0][0], 'wb') as f:
+        f.write(b'not a pickle')
+    assert cache.get(key, 'missing') == 'missing'
+
+
+def test_eviction_drops_least_recently_used(cache):
+    keys = [cache.key('data', 'table', str(i)) for i in range(3)]
+    for key in keys:
+        cache.put(key, 'x' * 1000)
+        time.sleep(0.01)
+    cache.get(keys[0])
+    size = cache.entries()[0][1]
+    assert cache.evict(2 * size) == 1
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None and cache.get(keys[2]) is not None
+    cache.clear()
+    assert cache.size() == 0
+
+
+def test_fingerprints_follow_the_data(raw, tmp_path):
+    changed = raw.copy()
+    changed.loc[0, 'Price'] += 1
+    assert frame_fingerprint(raw) == frame_fingerprint(raw.copy())
+    assert frame_fingerprint(raw) != frame_fingerprint(changed)
+    assert frame_fingerprint(raw) != frame_fingerprint(raw.astype({'Price': 'float32'}))
+    path = str(tmp_path / 'SCA.csv')
+    shutil.copy(DATA, path)
+    before = file_fingerprint(path)
+    changed.to_csv(path, index=False)
+    assert file_fingerprint(path) != before
+
+
+def test_analysis_tables_come_from_the_cache(tmp_path):
+    path = str(tmp_path / 'SCA.csv')
+    shutil.copy(DATA, path)
+    first = Analysis.from_csv(path, cache=True)
+    summary = first.supplier_summary
+    assert first.cache.misses > 0 and os.path.isdir(str(tmp_path / 'SCA.results'))
+    second = Analysis.from_csv(path, cache=True)
+    pd.testing.assert_frame_equal(second.supplier_summary, summary)
+    assert second.cache.hits > 0
+    # Rewriting the CSV invalidates every entry
+    df = pd.read_csv(path)
+    df['Lead_time'] = df['Lead_time'] + 1
+    df.to_csv(path, index=False)
+    third = Analysis.from_csv(path, cache=True)
+    assert third.cache.hits == 0
+    assert (third.supplier_summary['Lead_time'] - summary['Lead_time']).round(9).eq(1).all()
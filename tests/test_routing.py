@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from sca.routing import OPTION_KEYS, option_stats, optimize_routes, route_savings, savings_total
+
+BEST = ['best_carrier', 'best_mode', 'best_route']
+
+
+def single_option(n=200):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'SKU': [f'SKU{i}' for i in range(n)],
+        'Shipping_carriers': 'Carrier A', 'Transportation_modes': 'Road', 'Routes': 'Route A',
+        'Shipping_costs': rng.random(n) * 10, 'Costs': rng.random(n) * 1000,
+        'Shipping_times': rng.integers(1, 10, n).astype(float),
+    })
+
+
+def reference_cost(df, max_delay=0.0, min_count=2):
+    """Cheapest cost per SKU from a cross join of SKUs and options other than their own."""
+    stats = option_stats(df, min_count=1).astype({key: str for key in OPTION_KEYS})
+    rows = df.astype({key: str for key in OPTION_KEYS}).merge(
+        stats.rename(columns={'Shipping_costs': 'ship_now', 'Costs': 'cost_now', 'SKUs': 'n_now',
+                              'Shipping_times': 'days_now'}), on=OPTION_KEYS, how='left')
+    options = stats[stats['SKUs'] >= min_count]
+    pairs = rows.merge(options.rename(columns={key: 'to_' + key for key in OPTION_KEYS}), how='cross')
+    pairs = pairs[(pairs[['to_' + key for key in OPTION_KEYS]].to_numpy() != pairs[OPTION_KEYS].to_numpy()).any(axis=1)]
+    if max_delay is not None:
+        pairs = pairs[pairs['Shipping_times_y'] <= pairs['Shipping_times_x'] + max_delay]
+    pairs = pairs.assign(cost=pairs['Shipping_costs_x'] * pairs['Shipping_costs_y'] / pairs['ship_now']
+                         + pairs['Costs_x'] * pairs['Costs_y'] / pairs['cost_now'])
+    cheapest = pairs.groupby('SKU')['cost'].min()
+    now = df.set_index('SKU')['Shipping_costs'] + df.set_index('SKU')['Costs']
+    return np.minimum(now, cheapest.reindex(now.index).fillna(np.inf)).to_numpy()
+
+
+def test_single_option_never_moves():
+    # Rescaling a SKU onto its own option can round a ulp below its current cost
+    plan = optimize_routes(single_option(), max_delay=None)
+    assert (plan['savings'] == 0).all()
+    assert (plan['best_cost'] == plan['current_cost']).all()
+    for current, best in zip(OPTION_KEYS, BEST):
+        assert (plan[best].astype(str) == plan[current].astype(str)).all()
+    assert savings_total(plan)['moved'] == 0
+    assert len(route_savings(plan)) == 0
+
+
+@pytest.mark.parametrize('max_delay', [0.0, 2.0, None])
+def test_best_cost_matches_cross_join(raw, max_delay):
+    plan = optimize_routes(raw, max_delay=max_delay)
+    np.testing.assert_allclose(plan['best_cost'], reference_cost(raw, max_delay), rtol=1e-12)
+    moved = plan['savings'] > 0
+    assert (plan['savings'] >= 0).all()
+    assert (plan.loc[moved, BEST].astype(str).to_numpy() != plan.loc[moved, OPTION_KEYS].astype(str).to_numpy()).any(
+        axis=1).all()
+    unmoved = plan[~moved]
+    assert (unmoved['best_cost'] == unmoved['current_cost']).all()
+    if max_delay is not None:
+        assert (plan.loc[moved, 'best_days'] <= plan.loc[moved, 'current_days'] + max_delay).all()
+
+
+def test_constraints_limit_the_recommendations(raw):
+    plan = optimize_routes(raw, carriers=['Carrier A'], modes=['Road', 'Rail'], max_days=5, max_delay=None)
+    moved = plan[plan['savings'] > 0]
+    assert len(moved)
+    assert (moved['best_carrier'] == 'Carrier A').all()
+    assert moved['best_mode'].isin(['Road', 'Rail']).all()
+    assert (moved['best_days'] <= 5).all()
+
+
+def test_current_option_is_kept_as_an_infeasible_fallback(raw):
+    plan = optimize_routes(raw, carriers=['Carrier A'], max_days=5)
+    stats = option_stats(raw, min_count=1).set_index(OPTION_KEYS)['Shipping_times']
+    days = stats.reindex(pd.MultiIndex.from_frame(raw[OPTION_KEYS])).to_numpy()
+    expected = (raw['Shipping_carriers'] == 'Carrier A').to_numpy() & (days <= 5)
+    np.testing.assert_array_equal(plan['current_feasible'], expected)
+    stuck = plan[~plan['current_feasible'] & (plan['savings'] == 0)]
+    assert len(stuck) and (stuck['best_carrier'].astype(str) == stuck['Shipping_carriers'].astype(str)).all()
+    assert savings_total(plan)['infeasible'] == len(stuck)
+    assert optimize_routes(raw)['current_feasible'].all()
+
+
+def test_savings_totals_add_up(raw):
+    plan = optimize_routes(raw, max_delay=1.0)
+    total = savings_total(plan)
+    moves = route_savings(plan)
+    assert total['moved'] == moves['SKUs'].sum() == (plan['savings'] > 0).sum()
+    assert total['savings'] == pytest.approx(moves['savings'].sum())
+    assert total['savings'] == pytest.approx(total['current_cost'] - total['best_cost'])
+    assert total['savings_pct'] == pytest.approx(100 * total['savings'] / plan['current_cost'].sum())
+    assert moves['savings'].is_monotonic_decreasing
+
+
+def test_chunks_do_not_change_the_plan(raw):
+    pd.testing.assert_frame_equal(optimize_routes(raw, chunk_rows=7), optimize_routes(raw))
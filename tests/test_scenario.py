@@ -0,0 +1,100 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sca.scenario import OUTPUTS, ScenarioEngine, _normal_sf, scenario_grid
+
+
+@pytest.fixture(scope='module')
+def engine(raw):
+    return ScenarioEngine(raw)
+
+
+def reference(df, price=1.0, demand=1.0, elasticity=1.0, order_qty=1.0, lead_time=1.0, lead_time_shift=0.0,
+              manufacturing=1.0, carrier=None, mode=None, period_days=30):
+    """One scenario's per-SKU outputs, spelled out with pandas."""
+    carrier_means = df.groupby('Shipping_carriers')[['Shipping_costs', 'Shipping_times']].mean()
+    mode_means = df.groupby('Transportation_modes')['Costs'].mean()
+    out = pd.DataFrame(index=df.index)
+    out['units'] = df['Number_of_products_sold'] * demand * price ** -elasticity
+    out['revenue'] = np.where(df['Number_of_products_sold'] > 0,
+                              df['Revenue_generated'] * price * out['units'] / df['Number_of_products_sold'], 0.0)
+    shipping_days = df['Shipping_carriers'].map(carrier_means['Shipping_times'])
+    out['shipping_cost'] = df['Shipping_costs']
+    if carrier is not None:
+        current = df['Shipping_carriers'].map(carrier_means['Shipping_costs'])
+        out['shipping_cost'] = df['Shipping_costs'] / current * carrier_means.loc[carrier, 'Shipping_costs']
+        shipping_days = pd.Series(carrier_means.loc[carrier, 'Shipping_times'], index=df.index)
+    out['transport_cost'] = df['Costs']
+    if mode is not None:
+        out['transport_cost'] = df['Costs'] / df['Transportation_modes'].map(mode_means) * mode_means[mode]
+    out['manufacturing_cost'] = df['Manufacturing_costs'] * manufacturing
+    out['total_cost'] = out['shipping_cost'] + out['transport_cost'] + out['manufacturing_cost']
+    out['stock'] = df['Stock_levels'] + df['Order_quantities'] * (order_qty - 1)
+    out['turnover'] = out['units'] / out['stock']
+    out['stock_availability_diff'] = out['stock'] - df['Availability']
+    mu = ((df['Lead_times'] * lead_time + lead_time_shift).clip(lower=0) + shipping_days) * out['units'] / period_days
+    z = (out['stock'] - mu) / np.sqrt(mu)
+    out['stockout_risk'] = [0.5 * math.erfc(value / math.sqrt(2)) if np.isfinite(value) else 0.0 for value in z]
+    return out
+
+
+def test_grid_is_every_combination():
+    grid = scenario_grid(price=[0.9, 1.1], mode=[None, 'Rail', 'Air'])
+    assert len(grid) == 6 and list(grid.columns) == ['price', 'mode']
+    with pytest.raises(ValueError):
+        scenario_grid(colour=['red'])
+
+
+def test_neutral_scenario_is_the_snapshot(engine, raw):
+    out = engine.per_sku({})
+    np.testing.assert_allclose(out['units'], raw['Number_of_products_sold'])
+    np.testing.assert_allclose(out['revenue'], raw['Revenue_generated'].where(raw['Number_of_products_sold'] > 0, 0))
+    np.testing.assert_allclose(out['shipping_cost'], raw['Shipping_costs'])
+    np.testing.assert_allclose(out['transport_cost'], raw['Costs'])
+    np.testing.assert_allclose(out['stock'], raw['Stock_levels'])
+
+
+@pytest.mark.parametrize('scenario', [
+    {},
+    {'price': 1.1, 'elasticity': 1.5},
+    {'demand': 2.0, 'order_qty': 1.5, 'lead_time': 0.5, 'lead_time_shift': 3.0},
+    {'carrier': 'Carrier A', 'mode': 'Rail', 'manufacturing': 0.9},
+    {'price': 0.8, 'carrier': 'Carrier C', 'lead_time_shift': -50.0},
+])
+def test_per_sku_matches_reference(engine, raw, scenario):
+    out = engine.per_sku(scenario)
+    expected = reference(raw, **scenario)
+    for name in OUTPUTS:
+        # stockout_risk comes from a 1.5e-7 accurate erfc fit
+        np.testing.assert_allclose(out[name], expected[name], rtol=1e-9, atol=2e-7, err_msg=name)
+
+
+def test_chunks_do_not_change_totals(engine):
+    grid = scenario_grid(price=[0.9, 1.0, 1.2], carrier=[None, 'Carrier B'], mode=[None, 'Sea'])
+    whole = engine.run(grid)
+    chunked = engine.run(grid, chunk_size=5)
+    pd.testing.assert_frame_equal(whole, chunked)
+    assert whole.loc[(whole['price'] == 1.0) & whole['carrier'].isna() & whole['mode'].isna(), 'units'].iloc[0] == \
+        pytest.approx(engine.units.sum())
+
+
+def test_unknown_levels_are_rejected(engine):
+    with pytest.raises(ValueError):
+        engine.run(scenario_grid(carrier=['Carrier Z']))
+
+
+@pytest.mark.parametrize('name', ['price', 'demand', 'order_qty', 'lead_time'])
+@pytest.mark.parametrize('value', [0.0, -1.0, np.inf, np.nan])
+def test_factors_must_be_positive_and_finite(engine, name, value):
+    with pytest.raises(ValueError, match=name):
+        engine.run(scenario_grid(**{name: [1.0, value]}))
+
+
+def test_normal_tail_matches_erfc():
+    z = np.array([-40.0, -3.0, -0.5, 0.0, 0.5, 3.0, 40.0, np.inf])
+    x, t, poly = (np.empty_like(z) for _ in range(3))
+    expected = [0.5 * math.erfc(value / math.sqrt(2)) for value in z]
+    np.testing.assert_allclose(_normal_sf(z.copy(), x, t, poly), expected, atol=2e-7)
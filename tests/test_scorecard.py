@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+from conftest import assert_same_table
+
+from sca.scorecard import KEY, METRICS, SupplierScorecard, composite_score
+
+COLUMNS = [KEY, 'Records'] + list(METRICS)
+
+
+def expected_card(rows):
+    grouped = rows.groupby(KEY, observed=True, sort=True)
+    expected = grouped.agg(METRICS).reset_index()
+    expected.insert(1, 'Records', grouped.size().to_numpy())
+    return expected
+
+
+@pytest.mark.parametrize('frame', ['raw', 'messy'])
+@pytest.mark.parametrize('window', [1, 5, 40, 10_000])
+def test_count_window_matches_groupby_tail(request, frame, window):
+    df = request.getfixturevalue(frame).dropna(subset=[KEY])
+    card = SupplierScorecard(window=window)
+    card.update_frame(df)
+    expected = expected_card(df.groupby(KEY, observed=True).tail(window))
+    assert_same_table(card.scorecard()[COLUMNS], expected)
+
+
+def test_count_window_tracks_every_prefix(messy):
+    df = messy.dropna(subset=[KEY]).iloc[:300]
+    card = SupplierScorecard(window=7)
+    for end, (_, row) in enumerate(df.iterrows(), 1):
+        card.update(row[KEY], row)
+        if end % 37 == 0:
+            expected = expected_card(df.iloc[:end].groupby(KEY, observed=True).tail(7))
+            assert_same_table(card.scorecard()[COLUMNS], expected)
+
+
+def test_unbounded_scorecard_matches_supplier_summary(raw):
+    from sca.aggregate import Aggregator
+
+    card = SupplierScorecard()
+    card.update_frame(raw)
+    assert_same_table(card.scorecard()[[KEY] + list(METRICS)], Aggregator(raw).supplier_summary())
+
+
+def test_time_window_matches_time_filter(messy):
+    df = messy.dropna(subset=[KEY]).copy()
+    df['at'] = np.arange(len(df)) * 60.0
+    card = SupplierScorecard(period='2h')
+    card.update_frame(df, time_column='at')
+    now = df['at'].iloc[-1]
+    assert_same_table(card.scorecard()[COLUMNS], expected_card(df[df['at'] > now - 7200]))
+    # Reading later ages out suppliers that sent nothing since
+    later = now + 3600
+    assert_same_table(card.scorecard(at=later)[COLUMNS], expected_card(df[df['at'] > later - 7200]))
+
+
+def test_time_window_accepts_timestamps(raw):
+    df = raw.copy()
+    df['at'] = pd.Timestamp('2024-01-01') + pd.to_timedelta(np.arange(len(df)), unit='D')
+    card = SupplierScorecard(period='30D')
+    card.update_frame(df, time_column='at')
+    assert_same_table(card.scorecard()[COLUMNS], expected_card(df[df['at'] > df['at'].iloc[-1] - pd.Timedelta('30D')]))
+    with pytest.raises(ValueError):
+        card.update('Supplier 1', raw.iloc[0], at=pd.Timestamp('2023-01-01'))
+
+
+@pytest.mark.parametrize('options', [{}, {'window': 3}, {'period': 60}])
+def test_empty_scorecard(options):
+    card = SupplierScorecard(**options)
+    result = card.scorecard()
+    assert len(result) == 0
+    assert list(result.columns) == COLUMNS + ['Score']
+
+
+def test_time_window_that_ages_everyone_out_is_empty(raw):
+    card = SupplierScorecard(period=60)
+    card.update(raw[KEY].iloc[0], raw.iloc[0], at=0)
+    assert len(card.scorecard()) == 1
+    assert len(card.scorecard(at=1000)) == 0
+
+
+def test_composite_score_orders_suppliers():
+    card = pd.DataFrame({KEY: ['a', 'b'], 'Defect_rates': [1.0, 2.0], 'Lead_time': [5.0, 5.0]})
+    score = composite_score(card, {'Defect_rates': -1, 'Lead_time': -1})
+    np.testing.assert_allclose(score, [75.0, 25.0])
@@ -0,0 +1,148 @@
+import asyncio
+import json
+import time
+
+import pandas as pd
+import pytest
+from conftest import assert_same_table, expected_summary
+
+from sca.analysis import TABLES, Analysis, inventory_turnover
+from sca.rank import top_k
+from sca.service import QueryService
+
+
+@pytest.fixture(scope='module')
+def service(compact):
+    service = QueryService(Analysis(compact), workers=2)
+    yield service
+    service.close()
+
+
+def rows(body):
+    return pd.DataFrame(json.loads(body)['rows'])
+
+
+def test_tables_endpoints(service):
+    assert service.query('/tables') == (200, json.dumps(TABLES))
+    status, body = service.query('/tables/supplier_summary?limit=3')
+    assert status == 200
+    assert_same_table(rows(body), service.analysis.supplier_summary.head(3))
+
+
+def test_filtered_summary_matches_groupby(service, compact):
+    status, body = service.query('/summary/supplier_summary?Transportation_modes=Air,Rail&Location=Mumbai')
+    assert status == 200
+    subset = compact[compact['Transportation_modes'].isin(['Air', 'Rail']) & (compact['Location'] == 'Mumbai')]
+    assert_same_table(rows(body), expected_summary(subset, 'supplier_summary'))
+    # Values that never occur select nothing
+    assert json.loads(service.query('/summary/shipping_summary?Location=Nowhere')[1])['count'] == 0
+
+
+def test_rank_and_turnover(service, compact):
+    status, body = service.query('/rank?metric=Price&k=2&by=Supplier_name')
+    assert status == 200
+    expected = top_k(compact, 'Price', 2, by=['Supplier_name'], columns=['SKU', 'Supplier_name', 'Price'])
+    assert_same_table(rows(body), expected)
+    status, body = service.query('/turnover?Product_type=haircare&limit=3')
+    table = rows(body)
+    assert status == 200 and len(table) == 3
+    expected = inventory_turnover(compact[compact['Product_type'] == 'haircare']).head(3)
+    assert table['SKU'].tolist() == expected['SKU'].astype(str).tolist()
+
+
+@pytest.mark.parametrize('target, status', [
+    ('/nope', 404),
+    ('/tables/nope', 404),
+    ('/summary/product_summary', 404),
+    ('/tables/product_summary?Routes=x', 400),
+    ('/rank?metric=Bogus', 400),
+    ('/rank?k=x', 400),
+    ('/rank?order=extremes&by=Location', 400),
+    ('/turnover?Colour=red', 400),
+])
+def test_bad_requests(service, target, status):
+    code, body = service.query(target)
+    assert code == status
+    assert 'error' in json.loads(body)
+
+
+def test_cache_key_normalizes_the_query():
+    key = QueryService.cache_key('/summary/supplier_summary/?Location=Mumbai&Routes=Route+A')
+    assert key == QueryService.cache_key('/summary/supplier_summary?Routes=Route%20A&Location=Mumbai')
+    # Percent-encoded paths dispatch to the same endpoint, so they share its entry
+    assert QueryService.cache_key('/tables/supplier%5Fsummary') == QueryService.cache_key('/tables/supplier_summary/')
+    assert QueryService.cache_key('/%68ealth')[0] == '/health'
+
+
+def test_concurrent_first_queries_compute_each_table_once(compact, monkeypatch):
+    calls = []
+    summary = Analysis._summary
+
+    def slow(self, name):
+        calls.append(name)
+        time.sleep(0.05)
+        return summary(self, name)
+
+    monkeypatch.setattr(Analysis, '_summary', slow)
+    service = QueryService(Analysis(compact), workers=4)
+    targets = ['/tables/supplier_summary', '/tables/supplier_summary?limit=2', '/tables/supplier%5Fsummary?limit=3',
+               '/tables/inventory_summary']
+
+    async def run():
+        return await asyncio.gather(*[service.respond(target) for target in targets])
+
+    try:
+        responses = asyncio.run(run())
+    finally:
+        service.close()
+    assert [status for status, _ in responses] == [200] * 4
+    assert sorted(calls) == ['supplier_summary']
+
+
+def test_responses_are_cached_and_shared(service):
+    async def run():
+        hits = service.hits
+        first = await asyncio.gather(*[service.respond('/summary/carrier_costs?Routes=Route+B') for _ in range(3)])
+        again = await service.respond('/summary/carrier_costs?Routes=Route%20B')
+        return first, again, service.hits - hits
+
+    first, again, hits = asyncio.run(run())
+    assert all(response == again for response in first)
+    assert hits == 3
+
+
+def test_http_keep_alive(service):
+    async def run():
+        server = await service.start(port=0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        statuses = []
+        for target in ['/tables', '/nope', '/health']:
+            writer.write(f'GET {target} HTTP/1.1\r\nHost: localhost\r\n\r\n'.encode('latin-1'))
+            await writer.drain()
+            head = (await reader.readuntil(b'\r\n\r\n')).decode('latin-1').split('\r\n')
+            length = int(next(line for line in head if line.lower().startswith('content-length')).split(':')[1])
+            json.loads(await reader.readexactly(length))
+            statuses.append(head[0])
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return statuses
+
+    assert asyncio.run(run()) == ['HTTP/1.1 200 OK', 'HTTP/1.1 404 Not Found', 'HTTP/1.1 200 OK']
+
+
+def test_summary_without_a_cube_groups_the_rows(compact, monkeypatch):
+    from sca.cube import Cube
+
+    monkeypatch.setattr(Cube, 'fits', classmethod(lambda cls, *args, **kwargs: False))
+    service = QueryService(Analysis(compact), workers=1)
+    try:
+        assert service.analysis.cube is None
+        status, body = service.query('/summary/supplier_summary?Transportation_modes=Air,Rail')
+        assert status == 200
+        subset = compact[compact['Transportation_modes'].isin(['Air', 'Rail'])]
+        assert_same_table(rows(body), expected_summary(subset, 'supplier_summary'))
+        assert service.query('/summary/product_summary')[0] == 404
+    finally:
+        service.close()
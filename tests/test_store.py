@@ -0,0 +1,102 @@
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+from conftest import DATA, assert_same_table, tile
+
+from sca.analysis import Analysis
+from sca.store import (dataset_memory_report, is_fresh, load_dataset, memory_report, narrow_numeric,
+                       optimize_memory, read_cache, write_cache)
+
+
+def assert_same_values(actual, expected):
+    assert list(actual.columns) == list(expected.columns)
+    for col in expected.columns:
+        if pd.api.types.is_numeric_dtype(expected[col].dtype):
+            np.testing.assert_array_equal(actual[col].to_numpy(dtype=np.float64),
+                                          expected[col].to_numpy(dtype=np.float64), err_msg=col)
+        else:
+            assert actual[col].astype(str).tolist() == expected[col].astype(str).tolist(), col
+
+
+def test_cache_round_trips_every_value(raw, tmp_path):
+    cache_dir = str(tmp_path / 'SCA.cache')
+    write_cache(raw, cache_dir)
+    assert_same_values(read_cache(cache_dir), raw)
+    assert_same_values(read_cache(cache_dir, mmap=False), raw)
+
+
+def test_cache_stores_typed_columns(raw, tmp_path):
+    cache_dir = str(tmp_path / 'SCA.cache')
+    df = read_cache(write_cache(raw, cache_dir))
+    assert isinstance(df['Product_type'].dtype, pd.CategoricalDtype)
+    assert pd.api.types.is_integer_dtype(df['Number_of_products_sold'].dtype)
+    assert list(read_cache(cache_dir, columns=['Price', 'SKU']).columns) == ['Price', 'SKU']
+
+
+def test_narrow_numeric_keeps_values():
+    values = np.array([0.5, np.nan, 0.1])
+    assert narrow_numeric(values).dtype == np.float64
+    np.testing.assert_array_equal(narrow_numeric(values), values)
+    assert narrow_numeric(np.array([1.0, 2.0, 300.0])).dtype == np.int16
+    assert narrow_numeric(np.array([0.5, 0.25])).dtype == np.float32
+
+
+def test_changed_source_makes_the_cache_stale(tmp_path):
+    path = str(tmp_path / 'SCA.csv')
+    shutil.copy(DATA, path)
+    cache_dir = str(tmp_path / 'SCA.cache')
+    load_dataset(path)
+    assert is_fresh(cache_dir, path)
+    df = pd.read_csv(path)
+    df.loc[0, 'Price'] = 1234.5
+    df.to_csv(path, index=False)
+    assert not is_fresh(cache_dir, path)
+    assert load_dataset(path)['Price'][0] == 1234.5
+    assert is_fresh(cache_dir, path)
+
+
+def test_load_without_refresh_reads_the_csv(raw, tmp_path):
+    path = str(tmp_path / 'SCA.csv')
+    shutil.copy(DATA, path)
+    df = load_dataset(path, columns=['SKU', 'Price'], refresh=False)
+    assert not os.path.exists(str(tmp_path / 'SCA.cache'))
+    assert_same_values(df, raw[['SKU', 'Price']])
+    # Compacted in memory like the cache would have stored it
+    assert isinstance(df['SKU'].dtype, pd.CategoricalDtype)
+
+
+def test_optimize_memory_keeps_values_and_shrinks(raw):
+    compact = optimize_memory(raw)
+    assert_same_values(compact, raw)
+    assert isinstance(compact['SKU'].dtype, pd.CategoricalDtype)
+    assert compact['Number_of_products_sold'].dtype == np.int16
+    report = memory_report(raw, compact)
+    assert report.loc['total', 'bytes_after'] < report.loc['total', 'bytes_before'] / 2
+    assert report.loc['Product_type', 'dtype_after'] == 'category'
+
+
+def test_optimize_memory_keeps_gaps_and_other_dtypes(messy):
+    df = messy.assign(When=pd.Timestamp('2024-01-01'), Flag=True)
+    compact = optimize_memory(df)
+    assert_same_values(compact.drop(columns=['When', 'Flag']), messy)
+    assert compact['Supplier_name'].isna().sum() == messy['Supplier_name'].isna().sum()
+    assert compact['When'].dtype == df['When'].dtype and compact['Flag'].dtype == bool
+
+
+def test_tables_unchanged_by_compaction(raw):
+    # The cleaned dataset has no gaps, so its counts narrow to integers rather than float32
+    df = tile(raw, 1000)
+    loose, tight = Analysis(df), Analysis(optimize_memory(df))
+    for name in ['supplier_summary', 'shipping_summary', 'product_summary', 'inventory_turnover_summary']:
+        assert_same_table(tight.table(name), loose.table(name))
+
+
+def test_cache_records_the_parsed_footprint(raw, tmp_path):
+    path = str(tmp_path / 'SCA.csv')
+    shutil.copy(DATA, path)
+    assert dataset_memory_report(path) is None
+    load_dataset(path)
+    report = dataset_memory_report(path)
+    assert report.loc['total', 'bytes_before'] == raw.memory_usage(deep=True, index=False).sum()
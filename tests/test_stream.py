@@ -0,0 +1,46 @@
+import pandas as pd
+import pytest
+from conftest import assert_same_table, expected_summary
+
+from sca.aggregate import SUMMARIES, Aggregator
+from sca.partition import finish_summary
+from sca.stream import partial_aggregates, required_columns, stream_summaries
+
+
+@pytest.fixture(scope='module')
+def messy_csv(tmp_path_factory, messy):
+    path = tmp_path_factory.mktemp('stream') / 'messy.csv'
+    messy.to_csv(path, index=False)
+    return path
+
+
+@pytest.mark.parametrize('chunksize', [13, 250, 5000])
+def test_stream_summaries_match_whole_file(messy_csv, chunksize):
+    whole = pd.read_csv(messy_csv)
+    streamed = stream_summaries(messy_csv, chunksize=chunksize)
+    assert list(streamed) == SUMMARIES
+    for name, table in streamed.items():
+        assert_same_table(table, expected_summary(whole, name))
+
+
+@pytest.mark.parametrize('name', SUMMARIES)
+def test_stream_order_matches_aggregator(messy_csv, name):
+    streamed = stream_summaries(messy_csv, [name], chunksize=250)[name]
+    assert_same_table(streamed, getattr(Aggregator(pd.read_csv(messy_csv)), name)())
+
+
+def test_merged_partials_match_one_pass(messy):
+    halves = [partial_aggregates(), partial_aggregates()]
+    for partials, rows in zip(halves, [messy.iloc[:400], messy.iloc[400:]]):
+        agg = Aggregator(rows)
+        for partial in partials.values():
+            partial.update(agg)
+    for name, partial in halves[0].items():
+        assert_same_table(finish_summary(name, partial.merge(halves[1][name]).result()), expected_summary(messy, name))
+
+
+def test_required_columns_cover_the_specs():
+    columns = required_columns(['supplier_summary', 'supplier_by_demo'])
+    assert columns == ['Supplier_name', 'Lead_time', 'Production_volumes', 'Manufacturing_costs', 'Defect_rates',
+                       'Customer_demographics']
+    assert required_columns(['product_type_dist']) == ['Product_type']
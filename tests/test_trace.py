@@ -0,0 +1,73 @@
+import os
+import subprocess
+import sys
+
+import pandas as pd
+import pytest
+from conftest import ROOT
+
+from sca import trace
+
+
+@pytest.fixture
+def trace_file(tmp_path):
+    path = str(tmp_path / 'trace.jsonl')
+    trace.enable(path)
+    yield path
+    trace.disable()
+
+
+@trace.traced('test.head')
+def head(df, n):
+    return df.head(n)
+
+
+def test_disabled_spans_are_no_ops():
+    assert not trace.enabled
+    with trace.span('anything', rows_in=3) as s:
+        s.rows_out = 2
+        s.set(extra=1)
+    assert s is trace.span('other')
+
+
+def test_spans_nest_and_record_rows(trace_file, raw):
+    with trace.span('test.outer', rows_in=len(raw), label='x') as outer:
+        result = head(raw, 10)
+        outer.rows_out = len(result)
+    with pytest.raises(ValueError):
+        with trace.span('test.failing'):
+            raise ValueError
+    trace.disable()
+    records = {record['name']: record for record in trace.read_trace(trace_file)}
+    assert set(records) == {'test.outer', 'test.head', 'test.failing'}
+    inner, outer = records['test.head'], records['test.outer']
+    assert (inner['depth'], inner['parent'], inner['rows_in'], inner['rows_out']) == (1, 'test.outer', 100, 10)
+    assert (outer['depth'], outer['parent'], outer['rows_out']) == (0, None, 10)
+    assert outer['attrs'] == {'label': 'x'}
+    assert outer['wall_s'] >= inner['wall_s'] >= 0
+    assert records['test.failing']['error'] == 'ValueError'
+
+
+def test_chrome_trace_and_summary(trace_file):
+    for _ in range(3):
+        head(pd.DataFrame({'a': range(5)}), 2)
+    trace.disable()
+    records = trace.read_trace(trace_file)
+    events = trace.chrome_trace(records)['traceEvents']
+    assert [event['ph'] for event in events] == ['X'] * 3
+    assert events[0]['cat'] == 'test' and events[0]['args']['rows_out'] == 2
+    assert events[0]['ts'] == records[0]['start'] * 1e6
+    (name, calls, wall, cpu, _), = trace.summarize(records)
+    assert (name, calls) == ('test.head', 3)
+    assert wall == pytest.approx(sum(record['wall_s'] for record in records))
+
+
+@pytest.mark.parametrize('value, enabled', [('', False), ('0', False), ('False', False), ('no', False),
+                                            (' OFF ', False), ('1', True), ('yes', True)])
+def test_environment_switch(tmp_path, value, enabled):
+    # '0', 'false', ... switch tracing off rather than naming a trace file
+    env = dict(os.environ, SCA_TRACE=value, PYTHONPATH=ROOT)
+    env.pop('SCA_TRACE_CHROME', None)
+    out = subprocess.run([sys.executable, '-c', 'from sca import trace; print(trace.enabled, trace._path)'],
+                         cwd=str(tmp_path), env=env, capture_output=True, text=True, check=True)
+    assert out.stdout.split() == [str(enabled), trace.DEFAULT_PATH if enabled else 'None']